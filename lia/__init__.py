@@ -1,4 +1,14 @@
-from .core.align import AlignLeaf
-from .core.extract import ExtractFvFm, ExtractLeaf
-from .core.graph import Graph
-from .core.pickcell import Pickcell
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".core.align": ("AlignLeaf",),
+        ".core.extract": (
+            "ExtractFvFm",
+            "ExtractLeaf",
+        ),
+        ".core.graph": ("Graph",),
+        ".core.pickcell": ("Pickcell",),
+    },
+)
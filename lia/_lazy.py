@@ -0,0 +1,37 @@
+import importlib
+import sys
+
+
+def lazy_import(package, exports):
+    """Make attributes of package imported from its modules on first access.
+
+    Parameters
+    ----------
+    package : str
+        Name of package, __name__.
+    exports : dict
+        Names exported from each module, {".module": ("name", ...)}.
+
+    Returns
+    -------
+    __getattr__ : function
+        Function of module to import attribute.
+    __dir__ : function
+        Function of module to list attributes.
+    __all__ : [str, ...]
+        Exported names.
+    """
+    modules = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name):
+        if name not in modules:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(modules[name], package), name)
+        # Attribute is found directly from next time.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(modules))
+
+    return __getattr__, __dir__, sorted(modules)
@@ -1,2 +1,32 @@
-from .get_func import get_align_hori_func
-from .overlap import adjust_shape_horizontal
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".get_func": (
+            "get_align_hori_func",
+            "get_align_hori_param",
+            "transhape_horizontal",
+        ),
+        ".overlap": (
+            "adjust_shape_horizontal",
+            "get_align_transform",
+            "iter_adjust_shape_horizontal",
+            "iter_align_transform",
+            "prepare_align_std",
+            "search_align_transform",
+        ),
+        ".register": (
+            "get_register_matrix",
+            "get_register_param",
+        ),
+        ".score": ("get_slide_scores",),
+        ".standard": ("AlignStandard",),
+        ".transform": (
+            "AlignTransform",
+            "fit_height",
+            "load_align_transform",
+            "save_align_transform",
+        ),
+    },
+)
@@ -1,11 +1,37 @@
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
 import cv2
 import numpy as np
 
+from lia.align.moment import get_hori_moment_param
+from lia.align.score import ENGINE, get_slide_scores
+from lia.align.standard import AlignStandard
 from lia.basic.transform.crop import crop_left
+from lia.basic.transform.pack import PackedMask
 from lia.basic.transform.slide import slide_horizontal
 
+PYRAMID_LEVEL = 0
+REFINE_RANGE = 2
+NUM_CPU = 1
+POOL = "thread"
+MODE = "search"
+IOU_THRESH = 0.9
+
 
-def get_align_hori_func(std_img, var_img, width_range, slide_ratio):
+def get_align_hori_func(
+    std_img,
+    var_img,
+    width_range,
+    slide_ratio,
+    pyramid_level=PYRAMID_LEVEL,
+    refine_range=REFINE_RANGE,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    mode=MODE,
+    iou_thresh=IOU_THRESH,
+):
     """Scale and move horizontally to align images.
 
     Parameters
@@ -18,6 +44,26 @@ def get_align_hori_func(std_img, var_img, width_range, slide_ratio):
         Scaling factor.
     slide_ratio : int
         Percentage to move.
+    pyramid_level : int, optional
+        If 0, search all scale and slide. Otherwise search on images downsampled
+        by 2 ** pyramid_level first, then refine around the result in full size.
+    refine_range : int, optional
+        Range searched in full size around the downsampled result, in percent of
+        scale and in pixels of downsampled slide.
+    engine : str, optional
+        Engine to score slides, "loop", "fft" or "packed". "fft" is faster for
+        large image with wide slide range. "packed" binarizes images.
+    num_cpu : int, optional
+        Number of workers searching scales in parallel. If 1, search in order.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread" or "process" to make pool for each search, or pool to be used.
+    mode : str, optional
+        "search" searches all candidates. "moment" estimates scale and slide
+        from moments of images, and searches only if IoU is below iou_thresh.
+        "register" registers images by phase correlation, with vertical
+        translation and small rotation and scaling.
+    iou_thresh : float, optional
+        Least IoU accepted for estimation by moments.
 
     Returns
     -------
@@ -33,67 +79,605 @@ def get_align_hori_func(std_img, var_img, width_range, slide_ratio):
     ValueError
         If contours don't overlap.
     """
+    best = get_align_hori_param(
+        std_img,
+        var_img,
+        width_range,
+        slide_ratio,
+        pyramid_level,
+        refine_range,
+        engine,
+        num_cpu,
+        pool,
+        mode,
+        iou_thresh,
+    )
+    std_height, std_width = std_img.shape[:2]
+
+    def transhape(input_img):
+        align_img = transhape_horizontal(
+            input_img, best["size"], best["slide"], best["diff_width"], std_width
+        )
+        if "refine" in best:
+            refine = np.array(best["refine"], dtype=np.float64)
+            align_img = cv2.warpAffine(align_img, refine, (std_width, std_height))
+        return align_img
+
+    return transhape
+
+
+def transhape_horizontal(
+    img, size, slide, diff_width, width, interpolation=cv2.INTER_LINEAR
+):
+    """Scale and move image horizontally with result of get_align_hori_param.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image, the same size as image used for search.
+    size : (int, int)
+        Size of scaled image, (height, width).
+    slide : int
+        Slide distance.
+    diff_width : int
+        Width of scaled image minus width of standard image.
+    width : int
+        Width of standard image.
+    interpolation : int, optional
+        Interpolation method of OpenCV.
+
+    Returns
+    -------
+    transhaped_img : numpy.ndarray
+        Scaled and moved image, the same width as standard image.
+    """
+    trans_height, trans_width = size
+    re_img = cv2.resize(
+        img, dsize=(trans_width, trans_height), interpolation=interpolation
+    )
+    if diff_width > 0:
+        re_slided_img = slide_horizontal(re_img, slide)
+        transhaped_img = crop_left(re_slided_img, width)
+    else:
+        re_fill_img = cv2.copyMakeBorder(
+            re_img, 0, 0, 0, abs(diff_width), cv2.BORDER_CONSTANT
+        )
+        transhaped_img = slide_horizontal(re_fill_img, slide)
+    return transhaped_img
+
+
+def get_align_hori_param(
+    std_img,
+    var_img,
+    width_range,
+    slide_ratio,
+    pyramid_level=PYRAMID_LEVEL,
+    refine_range=REFINE_RANGE,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    mode=MODE,
+    iou_thresh=IOU_THRESH,
+):
+    """Search scale and slide to align images horizontally.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray or AlignStandard
+        Standard image, or standard leaf whose binary image is used. Packed
+        mask and FFT of standard leaf are kept on it for later search.
+    var_img : numpy.ndarray
+        Input image to be scaled.
+    width_range : int
+        Scaling factor.
+    slide_ratio : int
+        Percentage to move.
+    pyramid_level : int, optional
+        If 0, search all scale and slide. Otherwise search on images downsampled
+        by 2 ** pyramid_level first, then refine around the result in full size.
+    refine_range : int, optional
+        Range searched in full size around the downsampled result, in percent of
+        scale and in pixels of downsampled slide.
+    engine : str, optional
+        Engine to score slides, "loop", "fft" or "packed". "fft" is faster for
+        large image with wide slide range. "packed" binarizes images.
+    num_cpu : int, optional
+        Number of workers searching scales in parallel. If 1, search in order.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread" or "process" to make pool for each search, or pool to be used.
+    mode : str, optional
+        "search" searches all candidates. "moment" estimates scale and slide
+        from moments of images, and searches only if IoU is below iou_thresh.
+        "register" registers images by phase correlation, with vertical
+        translation and small rotation and scaling.
+    iou_thresh : float, optional
+        Least IoU accepted for estimation by moments.
+
+    Returns
+    -------
+    best : dict
+        Not overlapping area, "size" of scaled image (height, width), "slide",
+        and "diff_width" which is width of scaled image minus width of std_img.
+        Also percentage of scaling "fx_scale", "iou" of binarized images, and
+        "mode" which gave the result. "register" adds "refine", affine matrix
+        applied after them.
+
+    Raises
+    ------
+    ValueError
+        If input image is not binary image.
+    ValueError
+        If height of images are different.
+    ValueError
+        If contours don't overlap.
+    ValueError
+        Invalid mode.
+    """
+    if isinstance(std_img, AlignStandard):
+        std = std_img
+        std_img = std.bin_crop_img
+    else:
+        std = None
     if (not len(std_img.shape) == 2) or (not len(var_img.shape) == 2):
         raise ValueError("Input images should be binary image.")
     std_height, std_width = std_img.shape[:2]
     var_height, var_width = var_img.shape[:2]
-    size = (std_width, std_height)
     if not std_height == var_height:
         raise ValueError("Height of image is different.")
-    overlay_list = []
-    for fx_scale in range(-width_range, width_range, 1):
-        fx = (100 + fx_scale) / 100
-        resized_img = cv2.resize(var_img, dsize=None, fx=fx, fy=1)
-        resized_width = resized_img.shape[1]
-        diff_width = resized_width - std_width
-        if diff_width > 0:
-            base_img = cv2.copyMakeBorder(
-                std_img, 0, 0, 0, diff_width, cv2.BORDER_CONSTANT
-            )
-            over_img = resized_img.copy()
-        else:
-            base_img = std_img.copy()
-            over_img = cv2.copyMakeBorder(
-                resized_img, 0, 0, 0, abs(diff_width), cv2.BORDER_CONSTANT
-            )
-        slide_range = int(slide_ratio / 100 * resized_width)
-        for slide_distance in range(-slide_range, slide_range, 1):
-            slided_img = slide_horizontal(over_img, slide_distance)
-            xor_img = cv2.bitwise_xor(base_img, slided_img)
-            white = np.sum(xor_img)
-            result = {
-                "not_overlay": white,
-                "size": resized_img.shape[:2],
-                "slide": slide_distance,
-                "diff_width": diff_width,
-            }
-            overlay_list.append(result)
-    if len(overlay_list) > 0:
-        best = min(overlay_list, key=lambda x: x["not_overlay"])
+    if mode == "moment":
+        best = _get_moment_best(std_img, var_img, width_range, slide_ratio, engine, std)
+        if (best is not None) and (best["iou"] >= iou_thresh):
+            return best
+    elif mode == "register":
+        # register imports this module.
+        from lia.align.register import get_register_param
+
+        return get_register_param(std_img, var_img)
+    elif mode != "search":
+        raise ValueError(
+            f'Invalid mode: {mode}\nPlease select "search", "moment" or "register".'
+        )
+    fx_scales = range(-width_range, width_range, 1)
+    if pyramid_level > 0:
+        best = _search_pyramid(
+            std_img,
+            var_img,
+            fx_scales,
+            slide_ratio,
+            pyramid_level,
+            refine_range,
+            engine,
+            num_cpu,
+            pool,
+            std,
+        )
     else:
+        best = _search(
+            std_img,
+            var_img,
+            fx_scales,
+            slide_ratio,
+            engine=engine,
+            num_cpu=num_cpu,
+            pool=pool,
+            std=std,
+        )
+    if best is None:
         raise ValueError("Cannot overlay.")
-    re_height, re_width = resized_img.shape[:2]
-    if best["diff_width"] > 0:
-
-        def transhape(input_img):
-            trans_height, trans_width = best["size"]
-            re_img = cv2.resize(input_img, dsize=(trans_width, trans_height))
-            slide = best["slide"]
-            re_slided_img = slide_horizontal(re_img, slide)
-            re_cropped_img = crop_left(re_slided_img, std_width)
-            return re_cropped_img
-
-        return transhape
+    base_img, over_img, _, _ = _get_scaled_pair(std_img, var_img, best["fx_scale"])
+    best["iou"] = _get_iou(base_img, over_img, best["slide"], std)
+    best["mode"] = "search"
+    return best
+
+
+def _get_moment_best(
+    std_img, var_img, width_range, slide_ratio, engine=ENGINE, std=None
+):
+    """Estimate scale and slide from moments and score it.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard binary image.
+    var_img : numpy.ndarray
+        Binary image to be scaled.
+    width_range : int
+        Scaling factor.
+    slide_ratio : int
+        Percentage to move.
+    engine : str, optional
+        Engine to score slide.
+    std : AlignStandard, optional
+        Standard leaf of std_img, which keeps its packed mask and FFT.
+
+    Returns
+    -------
+    best : dict or None
+        The same as get_align_hori_param. None if it cannot be estimated.
+    """
+    fx_scale, slide = get_hori_moment_param(std_img, var_img)
+    if fx_scale is None:
+        return None
+    fx_scale = min(max(fx_scale, -width_range), width_range)
+    base_img, over_img, resized_size, diff_width = _get_scaled_pair(
+        std_img, var_img, fx_scale
+    )
+    slide_range = int(slide_ratio / 100 * resized_size[1])
+    if slide_range <= 0:
+        return None
+    slide = min(max(slide, -slide_range), slide_range - 1)
+    not_overlay = get_slide_scores(base_img, over_img, slide, slide + 1, engine, std)[0]
+    best = {
+        "not_overlay": not_overlay,
+        "size": resized_size,
+        "slide": slide,
+        "diff_width": diff_width,
+        "fx_scale": fx_scale,
+        "iou": _get_iou(base_img, over_img, slide, std),
+        "mode": "moment",
+    }
+    return best
+
+
+def _get_iou(base_img, over_img, slide, std=None):
+    """Get IoU of binarized images.
+
+    Parameters
+    ----------
+    base_img : numpy.ndarray
+        Standard binary image.
+    over_img : numpy.ndarray
+        Binary image to be slid.
+    slide : int
+        Slide distance.
+    std : AlignStandard, optional
+        Standard leaf whose binary image padded on the right is base_img.
+
+    Returns
+    -------
+    iou : float
+        Intersection over union.
+    """
+    if std is None:
+        base_mask = PackedMask(base_img)
+    else:
+        base_mask = std.get_packed_mask(base_img.shape[1])
+    return base_mask.iou(PackedMask(over_img), slide)
+
+
+def _search(
+    std_img,
+    var_img,
+    fx_scales,
+    slide_ratio,
+    slide_windows=None,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    std=None,
+):
+    """Search scale and slide with least not overlapping area.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard binary image.
+    var_img : numpy.ndarray
+        Binary image to be scaled.
+    fx_scales : [int, ...]
+        Percentage of scaling to search.
+    slide_ratio : int
+        Percentage to move.
+    slide_windows : {int: (int, int)}, optional
+        Range of slide to search for each scale. If None, search all.
+    engine : str, optional
+        Engine to score slides.
+    num_cpu : int, optional
+        Number of workers.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread", "process", or pool to be used.
+    std : AlignStandard, optional
+        Standard leaf of std_img, which keeps its packed mask and FFT.
+
+    Returns
+    -------
+    best : dict or None
+        Not overlapping area, resized size, slide, and difference of width.
+        The first one is kept if there is a tie.
+    """
+    fx_scales = list(fx_scales)
+    num_chunk = max(min(num_cpu, len(fx_scales)), 1)
+    # Each worker searches consecutive scales, so results are merged in order.
+    tasks = []
+    for chunk in np.array_split(np.array(fx_scales, dtype=int), num_chunk):
+        chunk = chunk.tolist()
+        if slide_windows is None:
+            chunk_windows = None
+        else:
+            chunk_windows = {fx_scale: slide_windows[fx_scale] for fx_scale in chunk}
+        tasks.append((std_img, var_img, chunk, slide_ratio, chunk_windows, engine, std))
+    if num_chunk == 1:
+        results = [_search_chunk(tasks[0])]
+    elif isinstance(pool, str):
+        with make_pool(pool, num_chunk) as own_pool:
+            results = own_pool.map(_search_chunk, tasks)
     else:
+        results = list(pool.map(_search_chunk, tasks))
+    best = None
+    for result in results:
+        if (result is not None) and (
+            (best is None) or (result["not_overlay"] < best["not_overlay"])
+        ):
+            best = result
+    return best
+
+
+def _search_chunk(args):
+    """Search scales in order, keeping only the best.
+
+    Parameters
+    ----------
+    args : tuple
+        Standard image, image to be scaled, scales, slide ratio, slide windows,
+        engine, and standard leaf or None.
+
+    Returns
+    -------
+    best : dict or None
+        Not overlapping area, resized size, slide, and difference of width.
+    """
+    std_img, var_img, fx_scales, slide_ratio, slide_windows, engine, std = args
+    best = None
+    for fx_scale in fx_scales:
+        if slide_windows is None:
+            slide_window = None
+        else:
+            slide_window = slide_windows[fx_scale]
+        result = _search_scale(
+            std_img, var_img, fx_scale, slide_ratio, slide_window, engine, std
+        )
+        if (result is not None) and (
+            (best is None) or (result["not_overlay"] < best["not_overlay"])
+        ):
+            best = result
+    return best
+
+
+def make_pool(pool, num_cpu):
+    """Make worker pool.
+
+    Parameters
+    ----------
+    pool : str
+        "thread" or "process".
+    num_cpu : int
+        Number of workers.
 
-        def transhape(input_img):
-            trans_height, trans_width = best["size"]
-            re_img = cv2.resize(input_img, dsize=(trans_width, trans_height))
-            re_fill_img = cv2.copyMakeBorder(
-                re_img, 0, 0, 0, abs(best["diff_width"]), cv2.BORDER_CONSTANT
-            )
-            slide = best["slide"]
-            re_slided_img = slide_horizontal(re_fill_img, slide)
-            return re_slided_img
-
-        return transhape
+    Returns
+    -------
+    pool : multiprocessing.pool.Pool
+        Worker pool.
+
+    Raises
+    ------
+    ValueError
+        Invalid pool.
+    """
+    if pool == "thread":
+        return ThreadPool(num_cpu)
+    elif pool == "process":
+        return Pool(num_cpu)
+    else:
+        raise ValueError(f'Invalid pool: {pool}\nPlease select "thread" or "process".')
+
+
+def _search_scale(
+    std_img, var_img, fx_scale, slide_ratio, slide_window=None, engine=ENGINE, std=None
+):
+    """Search slide with least not overlapping area for one scale.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard binary image.
+    var_img : numpy.ndarray
+        Binary image to be scaled.
+    fx_scale : int
+        Percentage of scaling.
+    slide_ratio : int
+        Percentage to move.
+    slide_window : (int, int), optional
+        Range of slide to search, [start, stop).
+    engine : str, optional
+        Engine to score slides.
+    std : AlignStandard, optional
+        Standard leaf of std_img, which keeps its packed mask and FFT.
+
+    Returns
+    -------
+    best : dict or None
+        Not overlapping area, resized size, slide, and difference of width.
+    """
+    base_img, over_img, resized_size, diff_width = _get_scaled_pair(
+        std_img, var_img, fx_scale
+    )
+    slide_range = int(slide_ratio / 100 * resized_size[1])
+    start, stop = -slide_range, slide_range
+    if slide_window is not None:
+        start = max(start, slide_window[0])
+        stop = min(stop, slide_window[1])
+    if stop <= start:
+        return None
+    scores = get_slide_scores(base_img, over_img, start, stop, engine, std)
+    # argmin returns the first one if there is a tie.
+    i = int(np.argmin(scores))
+    best = {
+        "not_overlay": scores[i],
+        "size": resized_size,
+        "slide": start + i,
+        "diff_width": diff_width,
+        "fx_scale": fx_scale,
+    }
+    return best
+
+
+def _get_scaled_pair(std_img, var_img, fx_scale):
+    """Scale image horizontally and pad images to the same width.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard image.
+    var_img : numpy.ndarray
+        Image to be scaled.
+    fx_scale : int or float
+        Percentage of scaling.
+
+    Returns
+    -------
+    base_img : numpy.ndarray
+        Padded standard image.
+    over_img : numpy.ndarray
+        Scaled and padded image.
+    resized_size : (int, int)
+        Size of scaled image, (height, width).
+    diff_width : int
+        Width of scaled image minus width of standard image.
+    """
+    std_width = std_img.shape[1]
+    fx = (100 + fx_scale) / 100
+    resized_img = cv2.resize(var_img, dsize=None, fx=fx, fy=1)
+    resized_width = resized_img.shape[1]
+    diff_width = resized_width - std_width
+    if diff_width > 0:
+        base_img = cv2.copyMakeBorder(std_img, 0, 0, 0, diff_width, cv2.BORDER_CONSTANT)
+        over_img = resized_img
+    else:
+        base_img = std_img
+        over_img = cv2.copyMakeBorder(
+            resized_img, 0, 0, 0, abs(diff_width), cv2.BORDER_CONSTANT
+        )
+    return base_img, over_img, resized_img.shape[:2], diff_width
+
+
+def _get_overlap_window(base_img, over_img):
+    """Get range of slide where objects can overlap, from their horizontal extent.
+
+    Parameters
+    ----------
+    base_img : numpy.ndarray
+        Standard binary image.
+    over_img : numpy.ndarray
+        Binary image to be slid, the same width as base_img.
+
+    Returns
+    -------
+    slide_window : (int, int)
+        Range of slide, [start, stop).
+    """
+    base_cols = np.flatnonzero(base_img.any(axis=0))
+    over_cols = np.flatnonzero(over_img.any(axis=0))
+    if (len(base_cols) == 0) or (len(over_cols) == 0):
+        return (0, 0)
+    start = base_cols[0] - over_cols[-1]
+    stop = base_cols[-1] - over_cols[0] + 1
+    return (int(start), int(stop))
+
+
+def _search_pyramid(
+    std_img,
+    var_img,
+    fx_scales,
+    slide_ratio,
+    pyramid_level,
+    refine_range,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    std=None,
+):
+    """Search scale and slide on downsampled images, then refine in full size.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard binary image.
+    var_img : numpy.ndarray
+        Binary image to be scaled.
+    fx_scales : [int, ...]
+        Percentage of scaling to search.
+    slide_ratio : int
+        Percentage to move.
+    pyramid_level : int
+        Downsampling factor is 2 ** pyramid_level.
+    refine_range : int
+        Range searched in full size, in percent of scale and in pixels of
+        downsampled slide.
+    engine : str, optional
+        Engine to score slides.
+    num_cpu : int, optional
+        Number of workers for search in full size.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread", "process", or pool to be used.
+    std : AlignStandard, optional
+        Standard leaf of std_img, used for search in full size.
+
+    Returns
+    -------
+    best : dict or None
+        Not overlapping area, resized size, slide, and difference of width.
+    """
+    factor = 2**pyramid_level
+    height, std_width = std_img.shape[:2]
+    coarse_height = max(height // factor, 1)
+    coarse_std_img = cv2.resize(
+        std_img,
+        (max(std_width // factor, 1), coarse_height),
+        interpolation=cv2.INTER_AREA,
+    )
+    coarse_var_img = cv2.resize(
+        var_img,
+        (max(var_img.shape[1] // factor, 1), coarse_height),
+        interpolation=cv2.INTER_AREA,
+    )
+    coarse_results = {}
+    for fx_scale in fx_scales:
+        base_img, over_img, _, _ = _get_scaled_pair(
+            coarse_std_img, coarse_var_img, fx_scale
+        )
+        slide_window = _get_overlap_window(base_img, over_img)
+        coarse_results[fx_scale] = _search_scale(
+            coarse_std_img, coarse_var_img, fx_scale, slide_ratio, slide_window, engine
+        )
+    center_scale = None
+    for fx_scale in fx_scales:
+        result = coarse_results[fx_scale]
+        if (result is not None) and (
+            (center_scale is None)
+            or (result["not_overlay"] < coarse_results[center_scale]["not_overlay"])
+        ):
+            center_scale = fx_scale
+    if center_scale is None:
+        return None
+    fine_scales = [s for s in fx_scales if abs(s - center_scale) <= refine_range]
+    slide_windows = {}
+    margin = (refine_range + 1) * factor
+    for fx_scale in fine_scales:
+        coarse = coarse_results[fx_scale]
+        if coarse is None:
+            center = 0
+        else:
+            center = coarse["slide"] * factor
+        slide_windows[fx_scale] = (center - margin, center + margin + 1)
+    best = _search(
+        std_img,
+        var_img,
+        fine_scales,
+        slide_ratio,
+        slide_windows,
+        engine,
+        num_cpu,
+        pool,
+        std,
+    )
+    return best
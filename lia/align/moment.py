@@ -0,0 +1,46 @@
+import cv2
+import numpy as np
+
+
+def get_hori_moment_param(std_img, var_img):
+    """Estimate horizontal scale and slide to align images from their moments.
+
+    Scale is ratio of horizontal standard deviation of objects, and slide
+    matches their centroids after scaling.
+
+    Moments are taken from binary images already rotated horizontally and
+    cropped, not from contours, and axes of fitted ellipse are not used.
+    Pixel values weight the moments, so they follow the same images as the
+    search scores, and the horizontal spread is measured along the axis of
+    scaling.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard binary image.
+    var_img : numpy.ndarray
+        Binary image to be scaled.
+
+    Returns
+    -------
+    fx_scale : float or None
+        Percentage of scaling. None if any object is empty or has no width.
+    slide : int or None
+        Slide distance after scaling.
+    """
+    std_moments = cv2.moments(std_img)
+    var_moments = cv2.moments(var_img)
+    if (std_moments["m00"] == 0) or (var_moments["m00"] == 0):
+        return None, None
+    std_cx = std_moments["m10"] / std_moments["m00"]
+    var_cx = var_moments["m10"] / var_moments["m00"]
+    std_sx = np.sqrt(std_moments["mu20"] / std_moments["m00"])
+    var_sx = np.sqrt(var_moments["mu20"] / var_moments["m00"])
+    if (std_sx == 0) or (var_sx == 0):
+        return None, None
+    fx = std_sx / var_sx
+    fx_scale = float((fx - 1) * 100)
+    # Centroid after scaling, the same pixel mapping as cv2.resize.
+    scaled_cx = fx * (var_cx + 0.5) - 0.5
+    slide = int(round(std_cx - scaled_cx))
+    return fx_scale, slide
@@ -1,100 +1,705 @@
-import cv2
-import numpy as np
-
-from lia.align.get_func import get_align_hori_func
-from lia.basic.get.size import get_max_size
-from lia.basic.transform.crop import crop_center
-from lia.basic.transform.rotation import rotate_horizontal
-
-SIZE_ERROR = 1.2
-SCALING_FACTOR = 20
-SLIDE_RANGE = 10
-
-
-def adjust_shape_horizontal(
-    std_img,
-    var_img,
-    std_cnt,
-    var_cnt,
-    size_error=SIZE_ERROR,
-    scaling_factor=SCALING_FACTOR,
-    slide_range=SLIDE_RANGE,
-):
-    """Scale and move the leaves horizontally so that they just overlap.
-
-    Parameters
-    ----------
-    std_img : numpy.ndarray
-        Input standard image.
-    var_img : numpy.ndarray
-        Input image to be scaled.
-    std_cnt : [[[int, int]], ...]
-        Contours of standard image.
-    var_cnt : [[[int, int], ...]]
-        Contours of image to be scaled.
-    size_error : float, optional
-        Error in approximate contour of leaf.
-    scaling_factor : int, optional
-        Pecentage to be scaled.
-    slide_range : int, optional
-        Percentage to move.
-
-    Returns
-    -------
-    std_crop_img : numpy.ndarray
-        Standard image cropped around leaf.
-    var_align_img : numpy.ndarray
-        Output adjusted image.
-    """
-    std_bin_img = np.zeros(std_img.shape[:2], dtype=np.uint8)
-    var_bin_img = np.zeros(var_img.shape[:2], dtype=np.uint8)
-    cv2.drawContours(std_bin_img, [std_cnt], 0, 255, -1)
-    cv2.drawContours(var_bin_img, [var_cnt], 0, 255, -1)
-    std_bin_hori_img = rotate_horizontal(std_bin_img, std_cnt)
-    std_hori_img = rotate_horizontal(std_img, std_cnt)
-    var_bin_hori_img = rotate_horizontal(var_bin_img, var_cnt)
-    var_hori_img = rotate_horizontal(var_img, var_cnt)
-    std_max_height, std_max_width = get_max_size(std_bin_hori_img)
-    var_max_height, var_max_width = get_max_size(var_bin_hori_img)
-    std_crop_size = (int(std_max_width) * size_error, int(std_max_height) * size_error)
-    var_crop_size = (int(var_max_width) * size_error, int(var_max_height) * size_error)
-    std_bin_crop_img = crop_center(std_bin_hori_img, std_crop_size)
-    std_crop_img = crop_center(std_hori_img, std_crop_size)
-    var_bin_crop_img = crop_center(var_bin_hori_img, var_crop_size)
-    var_crop_img = crop_center(var_hori_img, var_crop_size)
-    y_scale = std_max_height / var_max_height
-    std_width = std_bin_crop_img.shape[1]
-    var_width = var_bin_crop_img.shape[1]
-    x_scale = std_width / var_width
-    var_bin_resized_img = cv2.resize(
-        var_bin_crop_img, dsize=None, fx=x_scale, fy=y_scale
-    )
-    var_resized_img = cv2.resize(var_crop_img, dsize=None, fx=x_scale, fy=y_scale)
-    std_crop_height = std_bin_crop_img.shape[0]
-    var_crop_height = var_bin_resized_img.shape[0]
-    if var_crop_height > std_crop_height:
-        var_resized_width = var_bin_resized_img.shape[1]
-        input_var_img = crop_center(
-            var_bin_resized_img, (var_resized_width, std_crop_height)
-        )
-        var_color_img = crop_center(
-            var_resized_img, (var_resized_width, std_crop_height)
-        )
-    elif var_crop_height < std_crop_height:
-        diff_height = std_crop_height - var_crop_height
-        top = diff_height // 2
-        bottom = diff_height - top
-        input_var_img = cv2.copyMakeBorder(
-            var_bin_resized_img, top, bottom, 0, 0, cv2.BORDER_CONSTANT
-        )
-        var_color_img = cv2.copyMakeBorder(
-            var_resized_img, top, bottom, 0, 0, cv2.BORDER_CONSTANT
-        )
-    else:
-        input_var_img = var_bin_resized_img
-        var_color_img = var_resized_img
-    transhape = get_align_hori_func(
-        std_bin_crop_img, input_var_img, scaling_factor, slide_range
-    )
-    var_align_img = transhape(var_color_img)
-    return std_crop_img, var_align_img
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from itertools import islice
+from multiprocessing.pool import AsyncResult
+
+import cv2
+import numpy as np
+
+from lia.align.get_func import (
+    IOU_THRESH,
+    MODE,
+    NUM_CPU,
+    POOL,
+    PYRAMID_LEVEL,
+    REFINE_RANGE,
+    get_align_hori_param,
+    make_pool,
+)
+from lia.align.score import ENGINE
+from lia.align.standard import AlignStandard
+from lia.align.transform import WARP, AlignTransform, fit_height
+from lia.basic.get.size import get_cnt_max_size, get_max_size
+from lia.basic.transform.crop import crop_center, get_crop_center_range
+from lia.basic.transform.rotation import (
+    get_horizontal_angle,
+    get_rotated_roi,
+    get_rotation_matrix,
+    rotate,
+    rotate_cnt_mask,
+)
+
+SIZE_ERROR = 1.2
+SCALING_FACTOR = 20
+SLIDE_RANGE = 10
+ROTATION = "frame"
+SIZING = "mask"
+PENDING_RATIO = 2
+
+
+def adjust_shape_horizontal(
+    std_img,
+    var_img,
+    std_cnt,
+    var_cnt,
+    size_error=SIZE_ERROR,
+    scaling_factor=SCALING_FACTOR,
+    slide_range=SLIDE_RANGE,
+    pyramid_level=PYRAMID_LEVEL,
+    refine_range=REFINE_RANGE,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    warp=WARP,
+    rotation=ROTATION,
+    sizing=SIZING,
+    mode=MODE,
+    iou_thresh=IOU_THRESH,
+):
+    """Scale and move the leaves horizontally so that they just overlap.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Input standard image.
+    var_img : numpy.ndarray
+        Input image to be scaled.
+    std_cnt : [[[int, int]], ...]
+        Contours of standard image.
+    var_cnt : [[[int, int], ...]]
+        Contours of image to be scaled.
+    size_error : float, optional
+        Error in approximate contour of leaf.
+    scaling_factor : int, optional
+        Pecentage to be scaled.
+    slide_range : int, optional
+        Percentage to move.
+    pyramid_level : int, optional
+        Level of downsampling for coarse-to-fine search. 0 searches all.
+    refine_range : int, optional
+        Range searched in full size around the coarse result.
+    engine : str, optional
+        Engine to score slides, "loop", "fft" or "packed".
+    num_cpu : int, optional
+        Number of workers searching scales in parallel.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread", "process", or pool to be used.
+    warp : str, optional
+        "chain" rotates, crops, resizes and slides step by step. "fused"
+        resamples each image once by composed affine matrix, which is faster
+        but differs from chain by interpolation.
+    rotation : str, optional
+        "frame" rotates whole image into square frame. "roi" draws and rotates
+        binary image only around leaf to measure and crop it.
+    sizing : str, optional
+        "mask" counts pixels of rotated binary image. "contour" measures leaf
+        from rotated contour without drawing it, which can differ by a pixel
+        from "mask" for tilted leaves.
+    mode : str, optional
+        "search" searches all candidates. "moment" estimates scale and slide
+        from moments of leaves, and searches only if IoU is below iou_thresh.
+        "register" registers leaves by phase correlation, with vertical
+        translation and small rotation and scaling.
+    iou_thresh : float, optional
+        Least IoU accepted for estimation by moments.
+
+    Returns
+    -------
+    std_crop_img : numpy.ndarray
+        Standard image cropped around leaf.
+    var_align_img : numpy.ndarray
+        Output adjusted image.
+    """
+    transform = get_align_transform(
+        std_img,
+        var_img,
+        std_cnt,
+        var_cnt,
+        size_error,
+        scaling_factor,
+        slide_range,
+        pyramid_level,
+        refine_range,
+        engine,
+        num_cpu,
+        pool,
+        rotation,
+        sizing,
+        mode,
+        iou_thresh,
+    )
+    std_crop_img = transform.apply_std(std_img, warp=warp)
+    var_align_img = transform(var_img, warp=warp)
+    return std_crop_img, var_align_img
+
+
+def get_align_transform(
+    std_img,
+    var_img,
+    std_cnt,
+    var_cnt,
+    size_error=SIZE_ERROR,
+    scaling_factor=SCALING_FACTOR,
+    slide_range=SLIDE_RANGE,
+    pyramid_level=PYRAMID_LEVEL,
+    refine_range=REFINE_RANGE,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    rotation=ROTATION,
+    sizing=SIZING,
+    mode=MODE,
+    iou_thresh=IOU_THRESH,
+):
+    """Search transform to scale and move the leaves so that they just overlap.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Input standard image. Only its size is used.
+    var_img : numpy.ndarray
+        Input image to be scaled. Only its size is used.
+    std_cnt : [[[int, int]], ...]
+        Contours of standard image.
+    var_cnt : [[[int, int], ...]]
+        Contours of image to be scaled.
+    size_error : float, optional
+        Error in approximate contour of leaf.
+    scaling_factor : int, optional
+        Pecentage to be scaled.
+    slide_range : int, optional
+        Percentage to move.
+    pyramid_level : int, optional
+        Level of downsampling for coarse-to-fine search. 0 searches all.
+    refine_range : int, optional
+        Range searched in full size around the coarse result.
+    engine : str, optional
+        Engine to score slides, "loop", "fft" or "packed".
+    num_cpu : int, optional
+        Number of workers searching scales in parallel.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread", "process", or pool to be used.
+    rotation : str, optional
+        "frame" rotates whole image into square frame. "roi" draws and rotates
+        binary image only around leaf to measure and crop it.
+    sizing : str, optional
+        "mask" counts pixels of rotated binary image. "contour" measures leaf
+        from rotated contour without drawing it, which can differ by a pixel
+        from "mask" for tilted leaves.
+    mode : str, optional
+        "search" searches all candidates. "moment" estimates scale and slide
+        from moments of leaves, and searches only if IoU is below iou_thresh.
+        "register" registers leaves by phase correlation, with vertical
+        translation and small rotation and scaling.
+    iou_thresh : float, optional
+        Least IoU accepted for estimation by moments.
+
+    Returns
+    -------
+    transform : AlignTransform
+        Transform of images. It can be applied to other images of the same size.
+    """
+    std = prepare_align_std(std_img, std_cnt, size_error, rotation, sizing)
+    transform = search_align_transform(
+        std,
+        var_img.shape,
+        var_cnt,
+        scaling_factor,
+        slide_range,
+        pyramid_level,
+        refine_range,
+        engine,
+        num_cpu,
+        pool,
+        mode,
+        iou_thresh,
+    )
+    return transform
+
+
+def prepare_align_std(
+    std_img, std_cnt, size_error=SIZE_ERROR, rotation=ROTATION, sizing=SIZING
+):
+    """Prepare standard leaf once for aligning many images.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Input standard image. Only its size is used.
+    std_cnt : [[[int, int]], ...]
+        Contours of standard image.
+    size_error : float, optional
+        Error in approximate contour of leaf.
+    rotation : str, optional
+        "frame" rotates whole image into square frame. "roi" draws and rotates
+        binary image only around leaf to measure and crop it.
+    sizing : str, optional
+        "mask" counts pixels of rotated binary image. "contour" measures leaf
+        from rotated contour without drawing it, which can differ by a pixel
+        from "mask" for tilted leaves.
+
+    Returns
+    -------
+    std : AlignStandard
+        Prepared standard leaf.
+    """
+    angle, center = get_horizontal_angle(std_cnt)
+    bin_crop_img, crop_size, max_size = _get_hori_mask(
+        std_img.shape, std_cnt, angle, center, size_error, rotation, sizing
+    )
+    std = AlignStandard(
+        std_img.shape,
+        angle,
+        center,
+        crop_size,
+        max_size,
+        bin_crop_img,
+        size_error,
+        rotation,
+        sizing,
+    )
+    return std
+
+
+def search_align_transform(
+    std,
+    var_shape,
+    var_cnt,
+    scaling_factor=SCALING_FACTOR,
+    slide_range=SLIDE_RANGE,
+    pyramid_level=PYRAMID_LEVEL,
+    refine_range=REFINE_RANGE,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    mode=MODE,
+    iou_thresh=IOU_THRESH,
+):
+    """Search transform of an image against prepared standard leaf.
+
+    Parameters
+    ----------
+    std : AlignStandard
+        Standard leaf made by prepare_align_std.
+    var_shape : (int, int)
+        Shape of image to be scaled.
+    var_cnt : [[[int, int], ...]]
+        Contours of image to be scaled.
+    scaling_factor : int, optional
+        Pecentage to be scaled.
+    slide_range : int, optional
+        Percentage to move.
+    pyramid_level : int, optional
+        Level of downsampling for coarse-to-fine search. 0 searches all.
+    refine_range : int, optional
+        Range searched in full size around the coarse result.
+    engine : str, optional
+        Engine to score slides, "loop", "fft" or "packed".
+    num_cpu : int, optional
+        Number of workers searching scales in parallel.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread", "process", or pool to be used.
+    mode : str, optional
+        "search" searches all candidates. "moment" estimates scale and slide
+        from moments of leaves, and searches only if IoU is below iou_thresh.
+        "register" registers leaves by phase correlation, with vertical
+        translation and small rotation and scaling.
+    iou_thresh : float, optional
+        Least IoU accepted for estimation by moments.
+
+    Returns
+    -------
+    transform : AlignTransform
+        Transform of images.
+    """
+    var_angle, var_center = get_horizontal_angle(var_cnt)
+    var_bin_crop_img, var_crop_size, var_max_size = _get_hori_mask(
+        var_shape,
+        var_cnt,
+        var_angle,
+        var_center,
+        std.size_error,
+        std.rotation,
+        std.sizing,
+    )
+    std_max_height, std_max_width = std.max_size
+    var_max_height, var_max_width = var_max_size
+    y_scale = std_max_height / var_max_height
+    std_height, std_width = std.bin_crop_img.shape[:2]
+    var_width = var_bin_crop_img.shape[1]
+    x_scale = std_width / var_width
+    var_bin_resized_img = cv2.resize(
+        var_bin_crop_img, dsize=None, fx=x_scale, fy=y_scale
+    )
+    input_var_img = fit_height(var_bin_resized_img, std_height)
+    best = get_align_hori_param(
+        std,
+        input_var_img,
+        scaling_factor,
+        slide_range,
+        pyramid_level,
+        refine_range,
+        engine,
+        num_cpu,
+        pool,
+        mode,
+        iou_thresh,
+    )
+    transform = AlignTransform(
+        std.angle,
+        std.center,
+        std.crop_size,
+        var_angle,
+        var_center,
+        var_crop_size,
+        (x_scale, y_scale),
+        std_height,
+        std_width,
+        best["size"],
+        best["slide"],
+        best["diff_width"],
+        best["iou"],
+        best.get("refine"),
+    )
+    return transform
+
+
+def iter_align_transform(
+    std,
+    var_shapes,
+    var_cnts,
+    scaling_factor=SCALING_FACTOR,
+    slide_range=SLIDE_RANGE,
+    pyramid_level=PYRAMID_LEVEL,
+    refine_range=REFINE_RANGE,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    mode=MODE,
+    iou_thresh=IOU_THRESH,
+):
+    """Search transforms of many images against prepared standard leaf.
+
+    Parameters
+    ----------
+    std : AlignStandard
+        Standard leaf made by prepare_align_std.
+    var_shapes : iterable of (int, int)
+        Shape of each image to be scaled. They are read as workers become
+        free, at most PENDING_RATIO * num_cpu ahead of results.
+    var_cnts : iterable of [[[int, int], ...]]
+        Contours of each image.
+    scaling_factor : int, optional
+        Pecentage to be scaled.
+    slide_range : int, optional
+        Percentage to move.
+    pyramid_level : int, optional
+        Level of downsampling for coarse-to-fine search. 0 searches all.
+    refine_range : int, optional
+        Range searched in full size around the coarse result.
+    engine : str, optional
+        Engine to score slides, "loop", "fft" or "packed".
+    num_cpu : int, optional
+        Number of workers. Each worker searches one image.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread", "process", or pool to be used.
+    mode : str, optional
+        "search" searches all candidates. "moment" estimates scale and slide
+        from moments of leaves, and searches only if IoU is below iou_thresh.
+        "register" registers leaves by phase correlation, with vertical
+        translation and small rotation and scaling.
+    iou_thresh : float, optional
+        Least IoU accepted for estimation by moments.
+
+    Yields
+    ------
+    transform : AlignTransform
+        Transform of each image, in order of input.
+
+    Raises
+    ------
+    ValueError
+        If number of shapes and contours are different.
+    """
+    tasks = (
+        (
+            std,
+            var_shape,
+            var_cnt,
+            scaling_factor,
+            slide_range,
+            pyramid_level,
+            refine_range,
+            engine,
+            1,
+            POOL,
+            mode,
+            iou_thresh,
+        )
+        for var_shape, var_cnt in zip(var_shapes, var_cnts, strict=True)
+    )
+    if num_cpu <= 1:
+        for task in tasks:
+            yield _search_align_transform_task(task)
+    elif isinstance(pool, str):
+        with make_pool(pool, num_cpu) as own_pool:
+            yield from _imap_window(
+                own_pool, _search_align_transform_task, tasks, num_cpu * PENDING_RATIO
+            )
+    else:
+        yield from _imap_window(
+            pool, _search_align_transform_task, tasks, num_cpu * PENDING_RATIO
+        )
+
+
+def iter_adjust_shape_horizontal(
+    std_img,
+    var_imgs,
+    std_cnt,
+    var_cnts,
+    size_error=SIZE_ERROR,
+    scaling_factor=SCALING_FACTOR,
+    slide_range=SLIDE_RANGE,
+    pyramid_level=PYRAMID_LEVEL,
+    refine_range=REFINE_RANGE,
+    engine=ENGINE,
+    num_cpu=NUM_CPU,
+    pool=POOL,
+    warp=WARP,
+    rotation=ROTATION,
+    sizing=SIZING,
+    mode=MODE,
+    iou_thresh=IOU_THRESH,
+):
+    """Align many images to one standard leaf.
+
+    Standard leaf is prepared only once, and images are searched in parallel.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Input standard image.
+    var_imgs : iterable of numpy.ndarray
+        Input images to be scaled. They are read one by one, and at most
+        PENDING_RATIO * num_cpu images are kept until their results.
+    std_cnt : [[[int, int]], ...]
+        Contours of standard image.
+    var_cnts : iterable of [[[int, int], ...]]
+        Contours of each image.
+    size_error : float, optional
+        Error in approximate contour of leaf.
+    scaling_factor : int, optional
+        Pecentage to be scaled.
+    slide_range : int, optional
+        Percentage to move.
+    pyramid_level : int, optional
+        Level of downsampling for coarse-to-fine search. 0 searches all.
+    refine_range : int, optional
+        Range searched in full size around the coarse result.
+    engine : str, optional
+        Engine to score slides, "loop", "fft" or "packed".
+    num_cpu : int, optional
+        Number of workers. Each worker searches one image.
+    pool : str or multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        "thread", "process", or pool to be used.
+    warp : str, optional
+        "chain" rotates, crops, resizes and slides step by step. "fused"
+        resamples each image once by composed affine matrix, which is faster
+        but differs from chain by interpolation.
+    rotation : str, optional
+        "frame" rotates whole image into square frame. "roi" draws and rotates
+        binary image only around leaf to measure and crop it.
+    sizing : str, optional
+        "mask" counts pixels of rotated binary image. "contour" measures leaf
+        from rotated contour without drawing it, which can differ by a pixel
+        from "mask" for tilted leaves.
+    mode : str, optional
+        "search" searches all candidates. "moment" estimates scale and slide
+        from moments of leaves, and searches only if IoU is below iou_thresh.
+        "register" registers leaves by phase correlation, with vertical
+        translation and small rotation and scaling.
+    iou_thresh : float, optional
+        Least IoU accepted for estimation by moments.
+
+    Yields
+    ------
+    std_crop_img : numpy.ndarray
+        Standard image cropped around leaf. The same array for all images.
+    var_align_img : numpy.ndarray
+        Output adjusted image, in order of input.
+
+    Raises
+    ------
+    ValueError
+        If number of images and contours are different.
+    """
+    std = prepare_align_std(std_img, std_cnt, size_error, rotation, sizing)
+    pending = deque()
+    var_shapes = (var_img.shape for var_img in _keep_pending(var_imgs, pending))
+    transforms = iter_align_transform(
+        std,
+        var_shapes,
+        var_cnts,
+        scaling_factor,
+        slide_range,
+        pyramid_level,
+        refine_range,
+        engine,
+        num_cpu,
+        pool,
+        mode,
+        iou_thresh,
+    )
+    std_crop_img = None
+    for transform in transforms:
+        var_img = pending.popleft()
+        if std_crop_img is None:
+            std_crop_img = transform.apply_std(std_img, warp=warp)
+        var_align_img = transform(var_img, warp=warp)
+        yield std_crop_img, var_align_img
+
+
+def _search_align_transform_task(args):
+    """Search transform of an image in worker.
+
+    Parameters
+    ----------
+    args : tuple
+        Standard leaf, shape and contours of image, and parameters of search.
+
+    Returns
+    -------
+    transform : AlignTransform
+        Transform of image.
+    """
+    return search_align_transform(*args)
+
+
+def _imap_window(pool, func, tasks, window):
+    """Map function over tasks in pool, submitting only a window of tasks.
+
+    Pool.imap and Executor.map read all tasks at first, so next task is read
+    only after a result is yielded.
+
+    Parameters
+    ----------
+    pool : multiprocessing.pool.Pool or concurrent.futures.Executor
+        Worker pool.
+    func : function
+        Function applied to each task.
+    tasks : iterable
+        Arguments of function.
+    window : int
+        Max number of submitted tasks waiting for results.
+
+    Yields
+    ------
+    result : object
+        Result of each task, in order of tasks.
+    """
+    if hasattr(pool, "submit"):
+        # concurrent.futures.Executor
+        submit = partial(pool.submit, func)
+        get = Future.result
+    else:
+        # multiprocessing.pool.Pool
+
+        def submit(task):
+            return pool.apply_async(func, (task,))
+
+        get = AsyncResult.get
+    tasks = iter(tasks)
+    futures = deque(submit(task) for task in islice(tasks, window))
+    while len(futures) > 0:
+        result = get(futures.popleft())
+        futures.extend(submit(task) for task in islice(tasks, 1))
+        yield result
+
+
+def _keep_pending(var_imgs, pending):
+    """Yield images keeping them until their transform is searched.
+
+    Parameters
+    ----------
+    var_imgs : iterable of numpy.ndarray
+        Input images.
+    pending : collections.deque
+        Images waiting for transform.
+
+    Yields
+    ------
+    var_img : numpy.ndarray
+        Input image.
+    """
+    for var_img in var_imgs:
+        pending.append(var_img)
+        yield var_img
+
+
+def _get_hori_mask(shape, cnt, angle, center, size_error, rotation, sizing):
+    """Make binary image of leaf rotated horizontally and cropped around it.
+
+    Parameters
+    ----------
+    shape : (int, int)
+        Shape of input image.
+    cnt : [[[int, int]], ...]
+        Contour of leaf.
+    angle : float
+        Angle of rotation.
+    center : (float, float)
+        Center of rotation.
+    size_error : float
+        Error in approximate contour of leaf.
+    rotation : str
+        "frame" rotates whole image. "roi" draws and rotates only region
+        around leaf and crop.
+    sizing : str
+        "mask" measures leaf from binary image, "contour" from contour.
+
+    Returns
+    -------
+    bin_crop_img : numpy.ndarray
+        Binary image cropped around leaf.
+    crop_size : (float, float)
+        Crop size, (width, height).
+    max_size : (int, int)
+        Max height and width of leaf.
+
+    Raises
+    ------
+    ValueError
+        Invalid rotation.
+    ValueError
+        Invalid sizing.
+    """
+    if sizing not in ("contour", "mask"):
+        raise ValueError(
+            f'Invalid sizing: {sizing}\nPlease select "contour" or "mask".'
+        )
+    if sizing == "contour":
+        max_height, max_width = get_cnt_max_size(cnt, angle)
+    if rotation == "frame":
+        bin_img = np.zeros(shape[:2], dtype=np.uint8)
+        cv2.drawContours(bin_img, [cnt], 0, 255, -1)
+        bin_hori_img = rotate(bin_img, angle, center)
+        if sizing == "mask":
+            max_height, max_width = get_max_size(bin_hori_img)
+        crop_size = (int(max_width) * size_error, int(max_height) * size_error)
+        bin_crop_img = crop_center(bin_hori_img, crop_size)
+    elif rotation == "roi":
+        if sizing == "mask":
+            roi = get_rotated_roi(shape, angle, center, cnt)
+            bin_hori_img = rotate_cnt_mask(shape, angle, center, cnt, roi)
+            max_height, max_width = get_max_size(bin_hori_img)
+        crop_size = (int(max_width) * size_error, int(max_height) * size_error)
+        _, frame = get_rotation_matrix(shape, angle, center)
+        rows, cols = get_crop_center_range((frame, frame), crop_size)
+        crop_roi = (cols.start, rows.start, len(cols), len(rows))
+        bin_crop_img = rotate_cnt_mask(shape, angle, center, cnt, crop_roi)
+    else:
+        raise ValueError(
+            f'Invalid rotation: {rotation}\nPlease select "frame" or "roi".'
+        )
+    return bin_crop_img, crop_size, (max_height, max_width)
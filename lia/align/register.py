@@ -0,0 +1,172 @@
+import cv2
+import numpy as np
+
+from lia.align.get_func import transhape_horizontal
+from lia.basic.transform.pack import PackedMask
+
+MAX_ANGLE = 10
+MAX_SCALE = 1.2
+
+
+def get_register_param(std_img, var_img, max_angle=MAX_ANGLE, max_scale=MAX_SCALE):
+    """Register image to standard in constant time instead of search.
+
+    Image is cropped or padded at the center to the width of standard image,
+    then registered by get_register_matrix.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard binary image.
+    var_img : numpy.ndarray
+        Binary image to be registered, the same height as std_img.
+    max_angle : float, optional
+        Max angle of rotation (degree).
+    max_scale : float, optional
+        Max ratio of scaling.
+
+    Returns
+    -------
+    best : dict
+        The same as get_align_hori_param with no scale and slide, and "refine"
+        which is affine matrix after them as list, (2, 3).
+
+    Raises
+    ------
+    ValueError
+        If height of images are different.
+    """
+    std_height, std_width = std_img.shape[:2]
+    var_height, var_width = var_img.shape[:2]
+    if not std_height == var_height:
+        raise ValueError("Height of image is different.")
+    diff_width = var_width - std_width
+    fit_img = transhape_horizontal(
+        var_img, (var_height, var_width), 0, diff_width, std_width
+    )
+    trans = get_register_matrix(std_img, fit_img, max_angle, max_scale)
+    register_img = cv2.warpAffine(fit_img, trans, (std_width, std_height))
+    std_mask = PackedMask(std_img)
+    register_mask = PackedMask(register_img)
+    best = {
+        "not_overlay": std_mask.xor_count(register_mask),
+        "size": (var_height, var_width),
+        "slide": 0,
+        "diff_width": diff_width,
+        "fx_scale": 0,
+        "iou": std_mask.iou(register_mask),
+        "mode": "register",
+        "refine": trans.tolist(),
+    }
+    return best
+
+
+def get_register_matrix(std_img, var_img, max_angle=MAX_ANGLE, max_scale=MAX_SCALE):
+    """Register image to standard by translation, rotation and scaling.
+
+    Rotation and scaling are found by phase correlation of log-polar
+    magnitude spectra, then translation by phase correlation of images.
+    Time does not depend on range of search.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard binary image.
+    var_img : numpy.ndarray
+        Binary image to be registered, the same size as std_img.
+    max_angle : float, optional
+        Max angle of rotation (degree). Larger estimation is ignored.
+    max_scale : float, optional
+        Max ratio of scaling. Estimation out of [1 / max_scale, max_scale] is
+        ignored.
+
+    Returns
+    -------
+    trans : numpy.ndarray
+        Affine matrix from var_img to std_img, (2, 3).
+
+    Raises
+    ------
+    ValueError
+        If size of images are different.
+    """
+    if not std_img.shape[:2] == var_img.shape[:2]:
+        raise ValueError("Image size are different.")
+    height, width = std_img.shape[:2]
+    std_float = std_img.astype(np.float32)
+    var_float = var_img.astype(np.float32)
+    angle, scale = _get_rotation_scale(std_float, var_float)
+    if (abs(angle) > max_angle) or not (1 / max_scale <= scale <= max_scale):
+        angle, scale = 0.0, 1.0
+    center = (width / 2, height / 2)
+    trans = cv2.getRotationMatrix2D(center, angle, scale)
+    rotated_img = cv2.warpAffine(var_float, trans, (width, height))
+    (shift_x, shift_y), _ = cv2.phaseCorrelate(rotated_img, std_float)
+    trans[0][2] += shift_x
+    trans[1][2] += shift_y
+    return trans
+
+
+def _get_rotation_scale(std_img, var_img):
+    """Estimate rotation and scaling from log-polar magnitude spectra.
+
+    Parameters
+    ----------
+    std_img : numpy.ndarray
+        Standard image (float32).
+    var_img : numpy.ndarray
+        Image to be registered (float32).
+
+    Returns
+    -------
+    angle : float
+        Angle of rotation to apply to var_img (degree), [-90, 90).
+    scale : float
+        Ratio of scaling to apply to var_img.
+    """
+    height, width = std_img.shape[:2]
+    window = cv2.createHanningWindow((width, height), cv2.CV_32F)
+    std_spectrum = _get_log_polar_spectrum(std_img * window)
+    var_spectrum = _get_log_polar_spectrum(var_img * window)
+    (shift_r, shift_theta), _ = cv2.phaseCorrelate(var_spectrum, std_spectrum)
+    size = std_spectrum.shape[0]
+    angle = -shift_theta * 360 / size
+    # Spectrum is symmetric, so angle is known modulo 180 degree.
+    angle = (angle + 90) % 180 - 90
+    log_base = np.log(size / 2) / size
+    # Magnified image has spectrum shrunk.
+    scale = float(np.exp(-shift_r * log_base))
+    return float(angle), scale
+
+
+def _get_log_polar_spectrum(img):
+    """Get magnitude spectrum in log-polar coordinates.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image (float32).
+
+    Returns
+    -------
+    spectrum : numpy.ndarray
+        Log-polar magnitude spectrum, square. Rows are angles and columns are
+        log of radius.
+    """
+    height, width = img.shape[:2]
+    size = cv2.getOptimalDFTSize(max(height, width))
+    padded_img = cv2.copyMakeBorder(
+        img, 0, size - height, 0, size - width, cv2.BORDER_CONSTANT
+    )
+    magnitude = np.abs(np.fft.fftshift(np.fft.fft2(padded_img)))
+    # Log of magnitude keeps high frequencies of edges.
+    magnitude = np.log1p(magnitude).astype(np.float32)
+    center = (size / 2, size / 2)
+    spectrum = cv2.warpPolar(
+        magnitude,
+        (size, size),
+        center,
+        size / 2,
+        cv2.INTER_LINEAR + cv2.WARP_POLAR_LOG,
+    )
+    return spectrum
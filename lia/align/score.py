@@ -0,0 +1,242 @@
+import cv2
+import numpy as np
+
+from lia.basic.transform.pack import PackedMask
+from lia.basic.transform.slide import slide_horizontal
+
+ENGINE = "loop"
+EDGE_CHUNK_SIZE = 4096
+FFT_CHUNK_ROWS = 256
+
+
+def get_slide_scores(base_img, over_img, start, stop, engine=ENGINE, std=None):
+    """Get not overlapping area of images for each horizontal slide.
+
+    Parameters
+    ----------
+    base_img : numpy.ndarray
+        Standard image.
+    over_img : numpy.ndarray
+        Image to be slid, the same size as base_img.
+    start : int
+        First slide distance.
+    stop : int
+        Last slide distance (not included).
+    engine : str, optional
+        "loop" slides and compares image for each distance.
+        "fft" scores all distances at once by cross-correlation.
+        Both give the same result.
+        "packed" compares images packed into bits. Pixels are binarized and
+        the score is number of pixels, not sum of pixel values.
+    std : AlignStandard, optional
+        Standard leaf whose binary image padded on the right is base_img.
+        Packed mask and FFT of base_img are taken from it instead of being
+        made for each call.
+
+    Returns
+    -------
+    scores : numpy.ndarray
+        Sum of XOR of images for each slide distance, (stop - start,).
+
+    Raises
+    ------
+    ValueError
+        Invalid engine.
+    """
+    if engine == "loop":
+        return _get_slide_scores_loop(base_img, over_img, start, stop)
+    elif engine == "fft":
+        return _get_slide_scores_fft(base_img, over_img, start, stop, std)
+    elif engine == "packed":
+        if std is not None:
+            base_img = std.get_packed_mask(base_img.shape[1])
+        return _get_slide_scores_packed(base_img, over_img, start, stop)
+    else:
+        raise ValueError(
+            f'Invalid engine: {engine}\nPlease select "loop", "fft" or "packed".'
+        )
+
+
+def _get_slide_scores_loop(base_img, over_img, start, stop):
+    """Get not overlapping area by sliding image for each distance.
+
+    Parameters
+    ----------
+    base_img : numpy.ndarray
+        Standard image.
+    over_img : numpy.ndarray
+        Image to be slid.
+    start : int
+        First slide distance.
+    stop : int
+        Last slide distance (not included).
+
+    Returns
+    -------
+    scores : numpy.ndarray
+        Sum of XOR of images for each slide distance.
+    """
+    scores = np.zeros(max(stop - start, 0), dtype=np.uint64)
+    for i, slide_distance in enumerate(range(start, stop, 1)):
+        slided_img = slide_horizontal(over_img, slide_distance)
+        xor_img = cv2.bitwise_xor(base_img, slided_img)
+        scores[i] = np.sum(xor_img)
+    return scores
+
+
+def _get_slide_scores_packed(base_img, over_img, start, stop):
+    """Get number of not overlapping pixels with images packed into bits.
+
+    Parameters
+    ----------
+    base_img : numpy.ndarray
+        Standard image or PackedMask.
+    over_img : numpy.ndarray
+        Image to be slid or PackedMask.
+    start : int
+        First slide distance.
+    stop : int
+        Last slide distance (not included).
+
+    Returns
+    -------
+    scores : numpy.ndarray
+        Number of pixels where only one image is object for each slide distance.
+    """
+    base_mask = base_img if isinstance(base_img, PackedMask) else PackedMask(base_img)
+    over_mask = over_img if isinstance(over_img, PackedMask) else PackedMask(over_img)
+    scores = np.zeros(max(stop - start, 0), dtype=np.uint64)
+    for i, slide_distance in enumerate(range(start, stop, 1)):
+        scores[i] = base_mask.xor_count(over_mask, slide_distance)
+    return scores
+
+
+def _get_slide_scores_fft(base_img, over_img, start, stop, std=None):
+    """Get not overlapping area of all slide distances by cross-correlation.
+
+    Pixels of 0 and 255 are scored by one FFT cross-correlation of binary
+    images, since XOR of them is 255 where they differ. Pairs with other values,
+    which are only around contours, are corrected exactly one by one.
+
+    Parameters
+    ----------
+    base_img : numpy.ndarray
+        Standard image (uint8).
+    over_img : numpy.ndarray
+        Image to be slid (uint8).
+    start : int
+        First slide distance.
+    stop : int
+        Last slide distance (not included).
+    std : AlignStandard, optional
+        Standard leaf whose binary image padded on the right is base_img.
+
+    Returns
+    -------
+    scores : numpy.ndarray
+        Sum of XOR of images for each slide distance, the same as loop.
+    """
+    num_slide = max(stop - start, 0)
+    if num_slide == 0:
+        return np.zeros(0, dtype=np.uint64)
+    height, width = base_img.shape[:2]
+    slides = np.arange(start, stop, dtype=np.int64)
+    base_bin = base_img == 255
+    over_bin = over_img == 255
+    # Area of binary images. Columns of over_img slid out of frame are dropped.
+    over_cumsum = np.concatenate([[0], np.cumsum(over_bin.sum(axis=0))])
+    first = np.clip(-slides, 0, width)
+    last = np.clip(width - slides, 0, width)
+    over_area = over_cumsum[last] - over_cumsum[first]
+    # Zero padding to twice width prevents circular overlap.
+    length = cv2.getOptimalDFTSize(2 * width)
+    if std is None:
+        base_spectrum = None
+    else:
+        length, base_spectrum = std.get_spectrum(length)
+    overlap = _cross_correlate_rows(base_bin, over_bin, slides, length, base_spectrum)
+    scores = 255 * (int(base_bin.sum()) + over_area - 2 * overlap)
+    # Correction of pairs including pixels other than 0 and 255.
+    base_edge = (base_img != 0) & ~base_bin
+    over_edge = (over_img != 0) & ~over_bin
+    pad = int(np.abs(slides).max()) + 1
+    over_pad = cv2.copyMakeBorder(over_img, 0, 0, pad, pad, cv2.BORDER_CONSTANT)
+    rows, cols = np.nonzero(base_edge)
+    for i in range(0, len(rows), EDGE_CHUNK_SIZE):
+        row = rows[i : i + EDGE_CHUNK_SIZE, np.newaxis]
+        col = cols[i : i + EDGE_CHUNK_SIZE, np.newaxis]
+        over_value = over_pad[row, col + pad - slides]
+        correction = _XOR_CORRECTION[base_img[row, col], over_value]
+        scores += correction.sum(axis=0, dtype=np.int64)
+    # Pixels slid out of frame, and pairs with edge of base_img which are
+    # already corrected, point to the row of no correction.
+    base_key = base_img.astype(np.int16)
+    base_key[base_edge] = 256
+    base_key = cv2.copyMakeBorder(
+        base_key, 0, 0, pad, pad, cv2.BORDER_CONSTANT, value=256
+    )
+    rows, cols = np.nonzero(over_edge)
+    for i in range(0, len(rows), EDGE_CHUNK_SIZE):
+        row = rows[i : i + EDGE_CHUNK_SIZE, np.newaxis]
+        col = cols[i : i + EDGE_CHUNK_SIZE, np.newaxis]
+        base_value = base_key[row, col + pad + slides]
+        correction = _XOR_CORRECTION[base_value, over_img[row, col]]
+        scores += correction.sum(axis=0, dtype=np.int64)
+    return scores.astype(np.uint64)
+
+
+def _get_xor_correction():
+    """Make table of difference between XOR of values and XOR of binary values.
+
+    Returns
+    -------
+    correction : numpy.ndarray
+        Correction for each pair of values, (257, 256). Row 256 is zero.
+    """
+    value = np.arange(256, dtype=np.int16)
+    binary_xor = 255 * ((value[:, np.newaxis] == 255) != (value[np.newaxis, :] == 255))
+    correction = np.zeros((257, 256), dtype=np.int16)
+    correction[:256] = (value[:, np.newaxis] ^ value[np.newaxis, :]) - binary_xor
+    return correction
+
+
+_XOR_CORRECTION = _get_xor_correction()
+
+
+def _cross_correlate_rows(base_bin, over_bin, slides, length, base_spectrum=None):
+    """Count overlapping pixels of binary images for each horizontal slide.
+
+    Parameters
+    ----------
+    base_bin : numpy.ndarray
+        Standard binary image.
+    over_bin : numpy.ndarray
+        Binary image to be slid.
+    slides : numpy.ndarray
+        Slide distances.
+    length : int
+        Length of FFT, at least twice width.
+    base_spectrum : numpy.ndarray, optional
+        FFT of rows of base_bin of the length. If None, it is computed.
+
+    Returns
+    -------
+    overlap : numpy.ndarray
+        Number of overlapping pixels for each slide distance.
+    """
+    height = base_bin.shape[0]
+    spectrum = np.zeros(length // 2 + 1, dtype=np.complex128)
+    for top in range(0, height, FFT_CHUNK_ROWS):
+        base_rows = base_bin[top : top + FFT_CHUNK_ROWS]
+        over_rows = over_bin[top : top + FFT_CHUNK_ROWS]
+        if not (base_rows.any() and over_rows.any()):
+            continue
+        if base_spectrum is None:
+            base_fft = np.fft.rfft(base_rows, n=length, axis=1)
+        else:
+            base_fft = base_spectrum[top : top + FFT_CHUNK_ROWS]
+        over_fft = np.fft.rfft(over_rows, n=length, axis=1)
+        spectrum += (base_fft * np.conj(over_fft)).sum(axis=0)
+    correlation = np.fft.irfft(spectrum, n=length)
+    overlap = np.rint(correlation[slides % length]).astype(np.int64)
+    return overlap
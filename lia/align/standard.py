@@ -0,0 +1,113 @@
+import cv2
+import numpy as np
+
+from lia.basic.transform.pack import PackedMask
+
+
+class AlignStandard:
+    """Standard leaf prepared once to align many images.
+
+    It is made by prepare_align_std. Parameters and attributes are the same.
+
+    Parameters
+    ----------
+    shape : (int, int)
+        Shape of standard image.
+    angle : float
+        Angle of rotation of standard image.
+    center : (float, float)
+        Center of rotation of standard image.
+    crop_size : (float, float)
+        Size of crop around leaf, (width, height).
+    max_size : (float, float)
+        Max height and width of leaf.
+    bin_crop_img : numpy.ndarray
+        Binary image of leaf rotated horizontally and cropped around it.
+    size_error : float
+        Error in approximate contour of leaf.
+    rotation : str
+        Rotation used for binary image, "roi" or "frame".
+    sizing : str
+        Measurement of leaf, "contour" or "mask".
+
+    Notes
+    -----
+    Packed mask and FFT of binary image are made at first use and kept for
+    search of all scales and images. They are not pickled.
+    """
+
+    def __init__(
+        self,
+        shape,
+        angle,
+        center,
+        crop_size,
+        max_size,
+        bin_crop_img,
+        size_error,
+        rotation,
+        sizing,
+    ):
+        self.shape = tuple(shape[:2])
+        self.angle = angle
+        self.center = center
+        self.crop_size = crop_size
+        self.max_size = max_size
+        self.bin_crop_img = bin_crop_img
+        self.size_error = size_error
+        self.rotation = rotation
+        self.sizing = sizing
+        self.__packed_masks = {}
+        self.__spectrum = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_AlignStandard__packed_masks"] = {}
+        state["_AlignStandard__spectrum"] = None
+        return state
+
+    def get_packed_mask(self, width):
+        """Get packed binary image padded on the right.
+
+        Parameters
+        ----------
+        width : int
+            Width of padded image, not less than width of binary image.
+
+        Returns
+        -------
+        mask : PackedMask
+            Packed binary image.
+        """
+        mask = self.__packed_masks.get(width)
+        if mask is None:
+            pad = width - self.bin_crop_img.shape[1]
+            img = cv2.copyMakeBorder(
+                self.bin_crop_img, 0, 0, 0, pad, cv2.BORDER_CONSTANT
+            )
+            mask = PackedMask(img)
+            self.__packed_masks[width] = mask
+        return mask
+
+    def get_spectrum(self, length):
+        """Get FFT of each row of binary image zero padded to length.
+
+        Padded image has the same FFT whatever its width is, so FFT of
+        larger length is reused.
+
+        Parameters
+        ----------
+        length : int
+            Least length of FFT.
+
+        Returns
+        -------
+        length : int
+            Length of FFT, not less than the given one.
+        spectrum : numpy.ndarray
+            FFT of rows of pixels of 255, (height, length // 2 + 1).
+        """
+        if (self.__spectrum is None) or (self.__spectrum[0] < length):
+            spectrum = np.fft.rfft(self.bin_crop_img == 255, n=length, axis=1)
+            self.__spectrum = (length, spectrum)
+        return self.__spectrum
@@ -0,0 +1,416 @@
+import json
+
+import cv2
+import numpy as np
+
+from lia.align.get_func import transhape_horizontal
+from lia.basic.transform.crop import crop_center, get_crop_center_range
+from lia.basic.transform.rotation import get_rotation_matrix, rotate
+
+WARP = "chain"
+
+
+class AlignTransform:
+    """Transform to align leaf images, made by get_align_transform.
+
+    Parameters and attributes are the same. It can be applied to other images
+    and masks taken in the same geometry without searching again.
+
+    Parameters
+    ----------
+    std_angle : float
+        Angle of rotation of standard image.
+    std_center : (float, float)
+        Center of rotation of standard image.
+    std_crop_size : (float, float)
+        Size of crop around leaf of standard image, (width, height).
+    var_angle : float
+        Angle of rotation of image to be aligned.
+    var_center : (float, float)
+        Center of rotation of image to be aligned.
+    var_crop_size : (float, float)
+        Size of crop around leaf of image to be aligned, (width, height).
+    var_scale : (float, float)
+        Scaling factor to the size of standard leaf, (fx, fy).
+    height : int
+        Height of output image.
+    width : int
+        Width of output image.
+    size : (int, int)
+        Size of image scaled by search, (height, width).
+    slide : int
+        Slide distance.
+    diff_width : int
+        Width of image scaled by search minus width of output image.
+    iou : float, optional
+        IoU of binary leaves aligned by search.
+    refine : [[float, float, float], [float, float, float]], optional
+        Affine matrix applied after slide, found by registration.
+    """
+
+    def __init__(
+        self,
+        std_angle,
+        std_center,
+        std_crop_size,
+        var_angle,
+        var_center,
+        var_crop_size,
+        var_scale,
+        height,
+        width,
+        size,
+        slide,
+        diff_width,
+        iou=None,
+        refine=None,
+    ):
+        self.std_angle = float(std_angle)
+        self.std_center = tuple(float(v) for v in std_center)
+        self.std_crop_size = tuple(float(v) for v in std_crop_size)
+        self.var_angle = float(var_angle)
+        self.var_center = tuple(float(v) for v in var_center)
+        self.var_crop_size = tuple(float(v) for v in var_crop_size)
+        self.var_scale = tuple(float(v) for v in var_scale)
+        self.height = int(height)
+        self.width = int(width)
+        self.size = tuple(int(v) for v in size)
+        self.slide = int(slide)
+        self.diff_width = int(diff_width)
+        self.iou = None if iou is None else float(iou)
+        self.refine = None
+        if refine is not None:
+            self.refine = [[float(v) for v in row] for row in refine]
+
+    def __call__(self, img, interpolation=cv2.INTER_LINEAR, warp=WARP):
+        return self.apply(img, interpolation, warp)
+
+    def __eq__(self, other):
+        if not isinstance(other, AlignTransform):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        params = ", ".join(f"{key}={value}" for key, value in self.to_dict().items())
+        return f"AlignTransform({params})"
+
+    def apply(self, img, interpolation=cv2.INTER_LINEAR, warp=WARP):
+        """Align image in the same way as the image to be aligned.
+
+        Parameters
+        ----------
+        img : numpy.ndarray
+            Input image, the same size as the image to be aligned.
+        interpolation : int, optional
+            Interpolation method of OpenCV. cv2.INTER_NEAREST keeps values of
+            mask.
+        warp : str, optional
+            "chain" rotates, crops, resizes and slides image step by step.
+            "fused" resamples image once by composed affine matrix, which is
+            faster but differs from chain by interpolation.
+
+        Returns
+        -------
+        align_img : numpy.ndarray
+            Aligned image, (height, width).
+
+        Raises
+        ------
+        ValueError
+            Invalid warp.
+        """
+        if warp == "fused":
+            trans, dsize, valid = self.get_matrix(img.shape)
+            align_img = cv2.warpAffine(img, trans, dsize, flags=interpolation)
+            # Outside of crop around leaf is filled with black as chain.
+            left, top, right, bottom = valid
+            align_img[:top] = 0
+            align_img[bottom:] = 0
+            align_img[:, :left] = 0
+            align_img[:, right:] = 0
+            if self.refine is not None:
+                # Crop area is also moved by registration.
+                valid_mask = np.zeros(dsize[::-1], dtype=np.uint8)
+                valid_mask[top:bottom, left:right] = 255
+                valid_mask = cv2.warpAffine(
+                    valid_mask,
+                    np.array(self.refine),
+                    dsize,
+                    flags=cv2.INTER_NEAREST,
+                )
+                align_img[valid_mask == 0] = 0
+            return align_img
+        elif warp != "chain":
+            raise ValueError(f'Invalid warp: {warp}\nPlease select "fused" or "chain".')
+        rotated_img = rotate(img, self.var_angle, self.var_center, interpolation)
+        cropped_img = crop_center(rotated_img, self.var_crop_size)
+        fx, fy = self.var_scale
+        resized_img = cv2.resize(
+            cropped_img, dsize=None, fx=fx, fy=fy, interpolation=interpolation
+        )
+        fit_img = fit_height(resized_img, self.height)
+        align_img = transhape_horizontal(
+            fit_img, self.size, self.slide, self.diff_width, self.width, interpolation
+        )
+        if self.refine is not None:
+            align_img = cv2.warpAffine(
+                align_img,
+                np.array(self.refine),
+                (self.width, self.height),
+                flags=interpolation,
+            )
+        return align_img
+
+    def apply_std(self, img, interpolation=cv2.INTER_LINEAR, warp=WARP):
+        """Crop image in the same way as the standard image.
+
+        Parameters
+        ----------
+        img : numpy.ndarray
+            Input image, the same size as the standard image.
+        interpolation : int, optional
+            Interpolation method of OpenCV.
+        warp : str, optional
+            "chain" rotates whole image, then crops. "fused" rotates image
+            directly into the crop. Both give the same result except for rounding.
+
+        Returns
+        -------
+        crop_img : numpy.ndarray
+            Image rotated and cropped around leaf.
+
+        Raises
+        ------
+        ValueError
+            Invalid warp.
+        """
+        if warp == "fused":
+            trans, frame = get_rotation_matrix(
+                img.shape, self.std_angle, self.std_center
+            )
+            rows, cols = get_crop_center_range((frame, frame), self.std_crop_size)
+            trans[0][2] -= cols.start
+            trans[1][2] -= rows.start
+            dsize = (len(cols), len(rows))
+            return cv2.warpAffine(img, trans, dsize, flags=interpolation)
+        elif warp != "chain":
+            raise ValueError(f'Invalid warp: {warp}\nPlease select "fused" or "chain".')
+        rotated_img = rotate(img, self.std_angle, self.std_center, interpolation)
+        crop_img = crop_center(rotated_img, self.std_crop_size)
+        return crop_img
+
+    def get_matrix(self, shape):
+        """Compose rotation, crop, scaling and slide into one affine matrix.
+
+        Parameters
+        ----------
+        shape : (int, int)
+            Shape of image to be aligned, (height, width).
+
+        Returns
+        -------
+        trans : numpy.ndarray
+            Affine matrix from input image to aligned image, (2, 3).
+        dsize : (int, int)
+            Size of aligned image, (width, height).
+        valid : (int, int, int, int)
+            Area of aligned image coming from crop around leaf,
+            (left, top, right, bottom). Outside of it is black. If refine is
+            set, it is the area before refine.
+        """
+        rot, frame = get_rotation_matrix(shape, self.var_angle, self.var_center)
+        trans = np.vstack([rot, [0, 0, 1]])
+        # Crop around leaf.
+        rows, cols = get_crop_center_range((frame, frame), self.var_crop_size)
+        trans = _translate(-cols.start, -rows.start) @ trans
+        crop_height, crop_width = len(rows), len(cols)
+        # Scaling to the size of standard leaf, the same size as cv2.resize.
+        fx, fy = self.var_scale
+        resized_width = round(crop_width * fx)
+        resized_height = round(crop_height * fy)
+        scale = _scale(fx, fy)
+        # Crop or pad to the height of standard image.
+        if resized_height > self.height:
+            fit_rows, _ = get_crop_center_range(
+                (resized_height, resized_width), (resized_width, self.height)
+            )
+            shift = _translate(0, -fit_rows.start)
+            fit_height = len(fit_rows)
+        else:
+            shift = _translate(0, (self.height - resized_height) // 2)
+            fit_height = self.height
+        # Scaling and slide by search.
+        trans_height, trans_width = self.size
+        scale = (
+            _translate(self.slide, 0)
+            @ _scale(trans_width / resized_width, trans_height / fit_height)
+            @ shift
+            @ scale
+        )
+        trans = scale @ trans
+        # Edges of pixels of crop around leaf.
+        left, top = scale[:2] @ [-0.5, -0.5, 1]
+        right, bottom = scale[:2] @ [crop_width - 0.5, crop_height - 0.5, 1]
+        valid = (
+            max(int(np.ceil(left)), 0),
+            max(int(np.ceil(top)), 0),
+            max(int(np.floor(right)) + 1, 0),
+            max(int(np.floor(bottom)) + 1, 0),
+        )
+        dsize = (self.width, trans_height)
+        if self.refine is not None:
+            trans = np.vstack([self.refine, [0, 0, 1]]) @ trans
+        return trans[:2], dsize, valid
+
+    def to_dict(self):
+        """Convert to dictionary of built-in types.
+
+        Returns
+        -------
+        params : dict
+            Parameters of transform.
+        """
+        params = {
+            "std_angle": self.std_angle,
+            "std_center": list(self.std_center),
+            "std_crop_size": list(self.std_crop_size),
+            "var_angle": self.var_angle,
+            "var_center": list(self.var_center),
+            "var_crop_size": list(self.var_crop_size),
+            "var_scale": list(self.var_scale),
+            "height": self.height,
+            "width": self.width,
+            "size": list(self.size),
+            "slide": self.slide,
+            "diff_width": self.diff_width,
+            "iou": self.iou,
+            "refine": self.refine,
+        }
+        return params
+
+
+def fit_height(img, height):
+    """Crop or pad image vertically at the center to the height.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image.
+    height : int
+        Height of output image.
+
+    Returns
+    -------
+    fit_img : numpy.ndarray
+        Image of the height.
+    """
+    img_height, img_width = img.shape[:2]
+    if img_height > height:
+        fit_img = crop_center(img, (img_width, height))
+    elif img_height < height:
+        diff_height = height - img_height
+        top = diff_height // 2
+        bottom = diff_height - top
+        fit_img = cv2.copyMakeBorder(img, top, bottom, 0, 0, cv2.BORDER_CONSTANT)
+    else:
+        fit_img = img
+    return fit_img
+
+
+def save_align_transform(path, transform):
+    """Save transform.
+
+    Parameters
+    ----------
+    path : str
+        Output path (.json or .npz).
+    transform : AlignTransform
+        Transform to be saved.
+
+    Raises
+    ------
+    ValueError
+        If extension is not supported.
+    """
+    params = transform.to_dict()
+    ext = path.lower().rsplit(".", 1)[-1]
+    if ext == "json":
+        with open(path, "w") as f:
+            json.dump(params, f, indent=4)
+    elif ext == "npz":
+        arrays = {key: value for key, value in params.items() if value is not None}
+        # File object keeps path as it is, np.savez appends ".npz" otherwise.
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+    else:
+        raise ValueError(f"Invalid extension: {path}\nPlease select '.json' or '.npz'.")
+
+
+def load_align_transform(path):
+    """Load transform.
+
+    Parameters
+    ----------
+    path : str
+        Path of transform saved by save_align_transform.
+
+    Returns
+    -------
+    transform : AlignTransform
+        Loaded transform.
+
+    Raises
+    ------
+    ValueError
+        If extension is not supported.
+    """
+    ext = path.lower().rsplit(".", 1)[-1]
+    if ext == "json":
+        with open(path) as f:
+            params = json.load(f)
+    elif ext == "npz":
+        with np.load(path) as data:
+            params = {key: data[key].tolist() for key in data.files}
+    else:
+        raise ValueError(f"Invalid extension: {path}\nPlease select '.json' or '.npz'.")
+    return AlignTransform(**params)
+
+
+def _translate(x, y):
+    """Affine matrix of translation.
+
+    Parameters
+    ----------
+    x : float
+        Translation of x axis.
+    y : float
+        Translation of y axis.
+
+    Returns
+    -------
+    trans : numpy.ndarray
+        Affine matrix, (3, 3).
+    """
+    return np.array([[1, 0, x], [0, 1, y], [0, 0, 1]], dtype=np.float64)
+
+
+def _scale(fx, fy):
+    """Affine matrix of scaling of image as cv2.resize.
+
+    Centers of pixels are scaled, so edges of image are fixed.
+
+    Parameters
+    ----------
+    fx : float
+        Scaling factor of x axis.
+    fy : float
+        Scaling factor of y axis.
+
+    Returns
+    -------
+    trans : numpy.ndarray
+        Affine matrix, (3, 3).
+    """
+    return np.array(
+        [[fx, 0, (fx - 1) / 2], [0, fy, (fy - 1) / 2], [0, 0, 1]], dtype=np.float64
+    )
@@ -1,21 +1,43 @@
-from .evaluate import get_noise, is_background_black
-from .get import (
-    get_center_object,
-    get_cnts,
-    get_cnts_from_hsv,
-    get_cnts_white_background,
-    get_diff_ellipse,
-    get_in_color_range,
-    get_max_size,
-    get_mottle_area,
-    get_overlap_area,
-    get_white_bg_binary_img,
-)
-from .transform import (
-    crop_center,
-    crop_left,
-    rotate,
-    rotate_horizontal,
-    slide_horizontal,
-    to_color_array,
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".evaluate": (
+            "get_noise",
+            "is_background_black",
+        ),
+        ".get": (
+            "get_bounding_mask",
+            "get_center_object",
+            "get_cnt_max_size",
+            "get_cnts",
+            "get_cnts_from_hsv",
+            "get_cnts_white_background",
+            "get_diff_ellipse",
+            "get_in_color_range",
+            "get_max_size",
+            "get_mottle_area",
+            "get_overlap_area",
+            "get_white_bg_binary_img",
+        ),
+        ".transform": (
+            "PackedMask",
+            "crop_center",
+            "crop_left",
+            "get_crop_center_range",
+            "get_horizontal_angle",
+            "get_rotated_roi",
+            "get_rotation_matrix",
+            "pack_mask",
+            "reduce_img",
+            "refine_cnt",
+            "rotate",
+            "rotate_cnt_mask",
+            "rotate_horizontal",
+            "scale_cnt",
+            "slide_horizontal",
+            "to_color_array",
+        ),
+    },
 )
@@ -1,2 +1,9 @@
-from .background import is_background_black
-from .noise import get_noise
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".background": ("is_background_black",),
+        ".noise": ("get_noise",),
+    },
+)
@@ -1,6 +1,27 @@
-from .area import get_mottle_area, get_overlap_area
-from .cnts import get_cnts, get_cnts_from_hsv, get_cnts_white_background
-from .difference import get_diff_ellipse
-from .image import get_in_color_range, get_white_bg_binary_img
-from .object import get_center_object
-from .size import get_max_size
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".area": (
+            "get_mottle_area",
+            "get_overlap_area",
+        ),
+        ".cnts": (
+            "get_cnts",
+            "get_cnts_from_hsv",
+            "get_cnts_white_background",
+        ),
+        ".difference": ("get_diff_ellipse",),
+        ".image": (
+            "get_bounding_mask",
+            "get_in_color_range",
+            "get_white_bg_binary_img",
+        ),
+        ".object": ("get_center_object",),
+        ".size": (
+            "get_cnt_max_size",
+            "get_max_size",
+        ),
+    },
+)
@@ -6,6 +6,7 @@ LEAF_COLOR_LOWER = (30, 50, 50)
 LEAF_COLOR_UPPER = (90, 255, 200)
 MIN_CNTS_RATIO = 100
 NOISE_RATIO_THRESH = 50
+REDUCTION = 1
 THRESH = 60
 WHITE_BG_THRESH = 30
 WHITE_INV_THRESH = 230
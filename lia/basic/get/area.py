@@ -1,22 +1,27 @@
 import cv2
 import numpy as np
 
+from lia.basic.transform.pack import PackedMask
+
 
 def get_overlap_area(img1, img2):
     """Get overlap area.
 
     Parameters
     ----------
-    img1 : numpy.ndarray
+    img1 : numpy.ndarray or PackedMask
         Input image 1.
-    img2 : numpy.ndarray
+    img2 : numpy.ndarray or PackedMask
         Input image 2.
 
     Returns
     -------
     overlap_area
-        Area of overlapping of two images.
+        Area of overlapping of two images. Number of pixels if both images are
+        PackedMask, otherwise sum of pixel values.
     """
+    if isinstance(img1, PackedMask) and isinstance(img2, PackedMask):
+        return img1.and_count(img2)
     and_img = cv2.bitwise_and(img1, img2)
     overlap_area = np.sum(and_img)
     return overlap_area
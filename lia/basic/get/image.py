@@ -1,6 +1,7 @@
 import re
 
 import cv2
+import numpy as np
 
 from ._consts import (
     LEAF_COLOR_FORMAT,
@@ -66,3 +67,41 @@ def get_white_bg_binary_img(img, thresh=WHITE_INV_THRESH):
     img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     _, binary_img = cv2.threshold(img_gray, thresh, 255, cv2.THRESH_BINARY_INV)
     return binary_img
+
+
+def get_bounding_mask(mask, shape):
+    """Get bounding rectangle of object and mask inside it.
+
+    Parameters
+    ----------
+    mask : numpy.ndarray
+        Binary image of object, or its contour [[[int, int]], ...].
+    shape : (int, int)
+        Size of image, (height, width).
+
+    Returns
+    -------
+    rect : (int, int, int, int)
+        Bounding rectangle, (x, y, width, height).
+    bounding_mask : numpy.ndarray
+        Boolean mask inside bounding rectangle, (height, width).
+    """
+    mask = np.asarray(mask)
+    height, width = shape[:2]
+    if mask.shape == (height, width):
+        binary = mask.astype(np.uint8, copy=False)
+        x, y, rect_width, rect_height = cv2.boundingRect(binary)
+        bounding_mask = mask[y : y + rect_height, x : x + rect_width] > 0
+    else:
+        cnt = mask.reshape(-1, 1, 2).astype(np.int32, copy=False)
+        x, y, rect_width, rect_height = cv2.boundingRect(cnt)
+        x1 = min(max(x, 0), width)
+        y1 = min(max(y, 0), height)
+        x2 = min(max(x + rect_width, 0), width)
+        y2 = min(max(y + rect_height, 0), height)
+        x, y, rect_width, rect_height = x1, y1, x2 - x1, y2 - y1
+        canvas = np.zeros((rect_height, rect_width), dtype=np.uint8)
+        cv2.drawContours(canvas, [cnt], 0, 255, -1, offset=(-x, -y))
+        bounding_mask = canvas > 0
+    rect = (x, y, rect_width, rect_height)
+    return rect, bounding_mask
@@ -1,3 +1,7 @@
+import cv2
+import numpy as np
+
+
 def get_max_size(img):
     """Get max height and width of object.
 
@@ -19,3 +23,29 @@ def get_max_size(img):
     max_height = heights.max()
     max_width = widths.max()
     return max_height, max_width
+
+
+def get_cnt_max_size(cnts, angle=0):
+    """Get max height and width of object from its contour.
+
+    Parameters
+    ----------
+    cnts : [[int, int], ...]
+        Contours of object.
+    angle : float, optional
+        Angle of rotation of object before measuring, the same as rotate.
+
+    Returns
+    -------
+    max_height : int
+        Max height of object in pixels, from top to bottom pixel.
+    max_width : int
+        Max width of object in pixels, from left to right pixel.
+    """
+    points = np.asarray(cnts, dtype=np.float64).reshape(-1, 2)
+    trans = cv2.getRotationMatrix2D((0, 0), angle, 1)
+    rotated_points = points @ trans[:, :2].T
+    # Contour passes through centers of edge pixels.
+    extent = rotated_points.max(axis=0) - rotated_points.min(axis=0) + 1
+    max_width, max_height = np.round(extent).astype(int)
+    return int(max_height), int(max_width)
@@ -1,4 +1,31 @@
-from .crop import crop_center, crop_left
-from .rotation import rotate, rotate_horizontal
-from .slide import slide_horizontal
-from .to_array import to_color_array
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".crop": (
+            "crop_center",
+            "crop_left",
+            "get_crop_center_range",
+        ),
+        ".pack": (
+            "PackedMask",
+            "pack_mask",
+        ),
+        ".reduce": (
+            "reduce_img",
+            "refine_cnt",
+            "scale_cnt",
+        ),
+        ".rotation": (
+            "get_horizontal_angle",
+            "get_rotated_roi",
+            "get_rotation_matrix",
+            "rotate",
+            "rotate_cnt_mask",
+            "rotate_horizontal",
+        ),
+        ".slide": ("slide_horizontal",),
+        ".to_array": ("to_color_array",),
+    },
+)
@@ -27,6 +27,39 @@ def crop_center(img, size, pos_x=0, pos_y=0):
     return cropped_img
 
 
+def get_crop_center_range(shape, size, pos_x=0, pos_y=0):
+    """Get rows and columns cropped by crop_center.
+
+    Parameters
+    ----------
+    shape : (int, int)
+        Shape of input image, (height, width).
+    size : (int, int)
+        Crop size, (width, height).
+    pos_x : int, optional
+        Center of x axis.
+    pos_y : int, optional
+        Center of y axis.
+
+    Returns
+    -------
+    rows : range
+        Rows of input image in cropped image.
+    cols : range
+        Columns of input image in cropped image.
+    """
+    height, width = shape[:2]
+    size_x = int(size[0])
+    size_y = int(size[1])
+    rows = range(height)[
+        int(height / 2 - size_y / 2 - pos_y) : int(height / 2 + size_y / 2 - pos_y)
+    ]
+    cols = range(width)[
+        int(width / 2 - size_x / 2 - pos_x) : int(width / 2 + size_x / 2 - pos_x)
+    ]
+    return rows, cols
+
+
 def crop_left(img, width):
     """Crop left.
 
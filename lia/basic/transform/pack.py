@@ -0,0 +1,218 @@
+import numpy as np
+
+PACK_THRESH = 127
+# Number of set bits of each byte.
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class PackedMask:
+    """Binary image packed into bits.
+
+    Each column is packed into 64 bit words along the height, so horizontal
+    slide is only slicing of columns.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input binary image.
+    thresh : int, optional
+        Pixels larger than this are regarded as object.
+
+    Attributes
+    ----------
+    shape : (int, int)
+        Size of original image, (height, width).
+    words : numpy.ndarray
+        Packed bits of each column, (width, number of words).
+    """
+
+    def __init__(self, img, thresh=PACK_THRESH):
+        img = np.asarray(img)
+        if not img.ndim == 2:
+            raise ValueError("Input image should be binary image.")
+        height, width = img.shape
+        num_byte = -(-height // 64) * 8
+        packed = np.zeros((width, num_byte), dtype=np.uint8)
+        packed[:, : -(-height // 8)] = np.packbits(img > thresh, axis=0).T
+        self.shape = (height, width)
+        self.words = packed.view(np.uint64)
+        # Cumulative number of object pixels of columns for counting out of
+        # overlapping range.
+        self.__col_cumsum = np.concatenate([[0], np.cumsum(_popcount_rows(self.words))])
+
+    def count(self, start=0, stop=None):
+        """Count object pixels of columns.
+
+        Parameters
+        ----------
+        start : int, optional
+            First column.
+        stop : int, optional
+            Last column (not included). If None, up to the last column.
+
+        Returns
+        -------
+        count : int
+            Number of object pixels.
+        """
+        if stop is None:
+            stop = self.shape[1]
+        return int(self.__col_cumsum[stop] - self.__col_cumsum[start])
+
+    def unpack(self):
+        """Restore binary image.
+
+        Returns
+        -------
+        img : numpy.ndarray
+            Binary image of 0 and 255.
+        """
+        packed = self.words.view(np.uint8).T
+        bits = np.unpackbits(packed, axis=0, count=self.shape[0])
+        return bits * np.uint8(255)
+
+    def xor_count(self, other, slide=0):
+        """Count not overlapping pixels with other mask slid horizontally.
+
+        Parameters
+        ----------
+        other : PackedMask
+            Mask to be slid. Part slid out of this mask is dropped.
+        slide : int, optional
+            Slide distance of other. If plus value, slide right.
+
+        Returns
+        -------
+        xor_count : int
+            Number of pixels where only one mask is object.
+        """
+        start, stop = self.__get_overlap(other, slide)
+        if start >= stop:
+            return self.count()
+        xor_words = self.words[start:stop] ^ other.words[start - slide : stop - slide]
+        xor_count = self.count(0, start) + self.count(stop) + _popcount(xor_words)
+        return xor_count
+
+    def and_count(self, other, slide=0):
+        """Count overlapping pixels with other mask slid horizontally.
+
+        Parameters
+        ----------
+        other : PackedMask
+            Mask to be slid.
+        slide : int, optional
+            Slide distance of other. If plus value, slide right.
+
+        Returns
+        -------
+        and_count : int
+            Number of pixels where both masks are object.
+        """
+        start, stop = self.__get_overlap(other, slide)
+        if start >= stop:
+            return 0
+        and_words = self.words[start:stop] & other.words[start - slide : stop - slide]
+        return _popcount(and_words)
+
+    def iou(self, other, slide=0):
+        """Intersection over union with other mask slid horizontally.
+
+        Parameters
+        ----------
+        other : PackedMask
+            Mask to be slid. Part slid out of this mask is dropped.
+        slide : int, optional
+            Slide distance of other. If plus value, slide right.
+
+        Returns
+        -------
+        iou : float
+            Intersection over union. 0 if both masks are empty.
+        """
+        start, stop = self.__get_overlap(other, slide)
+        and_count = self.and_count(other, slide)
+        other_count = 0
+        if start < stop:
+            other_count = other.count(start - slide, stop - slide)
+        union = self.count() + other_count - and_count
+        if union == 0:
+            return 0.0
+        return and_count / union
+
+    def __get_overlap(self, other, slide):
+        """Get range of columns of this mask covered by slid other mask.
+
+        Parameters
+        ----------
+        other : PackedMask
+            Mask to be slid.
+        slide : int
+            Slide distance.
+
+        Returns
+        -------
+        start : int
+            First column.
+        stop : int
+            Last column (not included).
+
+        Raises
+        ------
+        ValueError
+            If height of masks are different.
+        """
+        if not self.shape[0] == other.shape[0]:
+            raise ValueError("Height of image is different.")
+        start = max(0, slide)
+        stop = min(self.shape[1], other.shape[1] + slide)
+        return start, stop
+
+
+def pack_mask(img, thresh=PACK_THRESH):
+    """Pack binary image into bits.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input binary image.
+    thresh : int, optional
+        Pixels larger than this are regarded as object.
+
+    Returns
+    -------
+    packed_mask : PackedMask
+        Packed mask.
+    """
+    return PackedMask(img, thresh)
+
+
+def _popcount(words):
+    """Count set bits of all words.
+
+    Parameters
+    ----------
+    words : numpy.ndarray
+        Contiguous array of uint64.
+
+    Returns
+    -------
+    count : int
+        Number of set bits.
+    """
+    return int(_POPCOUNT[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def _popcount_rows(words):
+    """Count set bits of each row.
+
+    Parameters
+    ----------
+    words : numpy.ndarray
+        Contiguous 2D array of uint64.
+
+    Returns
+    -------
+    count : numpy.ndarray
+        Number of set bits of each row.
+    """
+    return _POPCOUNT[words.view(np.uint8)].sum(axis=1, dtype=np.int64)
@@ -0,0 +1,107 @@
+import cv2
+import numpy as np
+
+
+def reduce_img(img, reduction):
+    """Reduce resolution of image by integer factor.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image.
+    reduction : int
+        Reduction factor, e.g. 2, 4 or 8. If 1, input image is returned.
+
+    Returns
+    -------
+    reduced_img : numpy.ndarray
+        Image of 1 / reduction size.
+    """
+    if reduction <= 1:
+        return img
+    height, width = img.shape[:2]
+    dsize = (max(width // reduction, 1), max(height // reduction, 1))
+    return cv2.resize(img, dsize, interpolation=cv2.INTER_AREA)
+
+
+def scale_cnt(cnt, reduction):
+    """Map contour of reduced image to full resolution.
+
+    Parameters
+    ----------
+    cnt : numpy.ndarray
+        Contour in reduced image.
+    reduction : int
+        Reduction factor.
+
+    Returns
+    -------
+    scaled_cnt : numpy.ndarray
+        Contour in full resolution image.
+    """
+    # Centers of pixels are mapped to centers of reduced blocks.
+    scaled_cnt = (cnt.astype(np.float64) + 0.5) * reduction - 0.5
+    return np.round(scaled_cnt).astype(np.int32)
+
+
+def refine_cnt(img, cnt, reduction, binarize):
+    """Map contour of reduced image to full resolution and refine its edge.
+
+    Only pixels in band around scaled contour are binarized in full
+    resolution.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Full resolution image.
+    cnt : numpy.ndarray
+        Contour in reduced image.
+    reduction : int
+        Reduction factor.
+    binarize : function
+        Function to get list of candidate binary images from image. It should
+        binarize each pixel independently, because it is given pixels of
+        band as image of (number of pixels, 1). Candidate most similar to
+        scaled contour is used.
+
+    Returns
+    -------
+    refined_cnt : numpy.ndarray
+        Contour in full resolution image. If cannot be refined, scaled contour.
+    """
+    scaled_cnt = scale_cnt(cnt, reduction)
+    height, width = img.shape[:2]
+    x, y, cnt_width, cnt_height = cv2.boundingRect(scaled_cnt)
+    margin = reduction * 2
+    left, top = max(x - margin, 0), max(y - margin, 0)
+    right = min(x + cnt_width + margin, width)
+    bottom = min(y + cnt_height + margin, height)
+    coarse_mask = np.zeros((bottom - top, right - left), np.uint8)
+    cv2.drawContours(coarse_mask, [scaled_cnt], -1, 255, -1, offset=(-left, -top))
+    # Band within reduction from edge of scaled contour.
+    band_mask = np.zeros_like(coarse_mask)
+    cv2.drawContours(
+        band_mask, [scaled_cnt], -1, 255, reduction * 2 + 1, offset=(-left, -top)
+    )
+    band_points = cv2.findNonZero(band_mask)
+    if band_points is None:
+        return scaled_cnt
+    band_cols, band_rows = band_points.reshape(-1, 2).T
+    band_pixels = img[band_rows + top, band_cols + left][:, np.newaxis]
+    coarse_values = coarse_mask[band_rows, band_cols]
+    best_values, min_diff = None, None
+    for band_values in binarize(band_pixels):
+        band_values = band_values.reshape(-1)
+        diff = np.count_nonzero(band_values != coarse_values)
+        if (min_diff is None) or (diff < min_diff):
+            best_values, min_diff = band_values, diff
+    if best_values is None:
+        return scaled_cnt
+    best_mask = coarse_mask
+    best_mask[band_rows, band_cols] = best_values
+    cnts, _ = cv2.findContours(
+        best_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(left, top)
+    )
+    if len(cnts) == 0:
+        return scaled_cnt
+    return max(cnts, key=cv2.contourArea)
@@ -1,8 +1,10 @@
 import cv2
 import numpy as np
 
+ROI_MARGIN = 2
 
-def rotate_horizontal(img, cnts):
+
+def rotate_horizontal(img, cnts, interpolation=cv2.INTER_LINEAR, margin=None):
     """Rotate image to be horizontal.
 
     Parameters
@@ -11,19 +13,47 @@ def rotate_horizontal(img, cnts):
         Input image.
     cnts : [[int, int], ...]
         Contours of object.
+    interpolation : int, optional
+        Interpolation method of OpenCV.
+    margin : int, optional
+        If None, whole image is rotated into square frame. Otherwise only
+        bounding region of object with this margin is rotated.
 
     Returns
     -------
     rotated_img : numpy.ndarray
         Rotated image.
     """
+    rotate_angle, center = get_horizontal_angle(cnts)
+    if margin is None:
+        roi = None
+    else:
+        roi = get_rotated_roi(img.shape, rotate_angle, center, cnts, margin)
+    rotated_img = rotate(img, rotate_angle, center, interpolation, roi)
+    return rotated_img
+
+
+def get_horizontal_angle(cnts):
+    """Get angle of rotation to make object horizontal.
+
+    Parameters
+    ----------
+    cnts : [[int, int], ...]
+        Contours of object.
+
+    Returns
+    -------
+    angle : float
+        Angle of rotation.
+    center : (float, float)
+        Center of rotation.
+    """
     center, _, angle = cv2.fitEllipse(cnts)
     rotate_angle = angle - 90
-    rotated_img = rotate(img, rotate_angle, center)
-    return rotated_img
+    return rotate_angle, center
 
 
-def rotate(img, angle, center):
+def rotate(img, angle, center, interpolation=cv2.INTER_LINEAR, roi=None):
     """Rotate image.
 
     Parameters
@@ -34,18 +64,121 @@ def rotate(img, angle, center):
         Angle of rotation.
     center : (int, int)
         Coordinate of center.
+    interpolation : int, optional
+        Interpolation method of OpenCV.
+    roi : (int, int, int, int), optional
+        Region of square frame to be output, (x, y, width, height).
+        If None, output whole frame.
 
     Returns
     -------
     rotated_img : numpy.ndarray
         Rotated image.
     """
-    height, width = img.shape[:2]
+    trans, frame = get_rotation_matrix(img.shape, angle, center)
+    if roi is None:
+        dsize = (frame, frame)
+    else:
+        x, y, width, height = roi
+        trans[0][2] -= x
+        trans[1][2] -= y
+        dsize = (width, height)
+    rotated_img = cv2.warpAffine(img, trans, dsize, flags=interpolation)
+    return rotated_img
+
+
+def rotate_cnt_mask(shape, angle, center, cnts, roi):
+    """Draw filled object rotated into region of square frame of rotate.
+
+    Only bounding region of object is drawn, so the result is the same as
+    rotate of whole binary image without making it.
+
+    Parameters
+    ----------
+    shape : (int, int)
+        Shape of input image, (height, width).
+    angle : float
+        Angle of rotation.
+    center : (int, int)
+        Coordinate of center.
+    cnts : [[int, int], ...]
+        Contours of object.
+    roi : (int, int, int, int)
+        Region of square frame to be output, (x, y, width, height).
+
+    Returns
+    -------
+    rotated_img : numpy.ndarray
+        Rotated binary image of region.
+    """
+    x, y, width, height = cv2.boundingRect(cnts)
+    bin_img = np.zeros((height, width), dtype=np.uint8)
+    cv2.drawContours(bin_img, [cnts], 0, 255, -1, offset=(-x, -y))
+    trans, _ = get_rotation_matrix(shape, angle, center)
+    trans[:, 2] += trans[:, :2] @ (x, y)
+    roi_x, roi_y, roi_width, roi_height = roi
+    trans[0][2] -= roi_x
+    trans[1][2] -= roi_y
+    rotated_img = cv2.warpAffine(bin_img, trans, (roi_width, roi_height))
+    return rotated_img
+
+
+def get_rotated_roi(shape, angle, center, cnts, margin=ROI_MARGIN):
+    """Get bounding region of rotated object in square frame of rotate.
+
+    Parameters
+    ----------
+    shape : (int, int)
+        Shape of input image, (height, width).
+    angle : float
+        Angle of rotation.
+    center : (int, int)
+        Coordinate of center.
+    cnts : [[int, int], ...]
+        Contours of object.
+    margin : int, optional
+        Margin around object.
+
+    Returns
+    -------
+    roi : (int, int, int, int)
+        Region of object, (x, y, width, height).
+    """
+    trans, frame = get_rotation_matrix(shape, angle, center)
+    points = np.asarray(cnts, dtype=np.float64).reshape(-1, 2)
+    rotated_points = points @ trans[:, :2].T + trans[:, 2]
+    left, top = np.floor(rotated_points.min(axis=0)).astype(int) - margin
+    right, bottom = np.ceil(rotated_points.max(axis=0)).astype(int) + margin + 1
+    left, top = max(left, 0), max(top, 0)
+    right, bottom = min(right, frame), min(bottom, frame)
+    roi = (int(left), int(top), int(max(right - left, 0)), int(max(bottom - top, 0)))
+    return roi
+
+
+def get_rotation_matrix(shape, angle, center):
+    """Get affine matrix of rotation into square frame containing whole image.
+
+    Parameters
+    ----------
+    shape : (int, int)
+        Shape of input image, (height, width).
+    angle : float
+        Angle of rotation.
+    center : (int, int)
+        Coordinate of center.
+
+    Returns
+    -------
+    trans : numpy.ndarray
+        Affine matrix, (2, 3).
+    frame : int
+        Width and height of rotated image.
+    """
+    height, width = shape[:2]
     corners = np.array([(0, 0), (width, 0), (width, height), (0, height)])
     radius = np.sqrt(max(np.sum((center - corners) ** 2, axis=1)))
     frame = int(radius * 2)
     trans = cv2.getRotationMatrix2D(center, angle, 1)
     trans[0][2] += radius - center[0]
     trans[1][2] += radius - center[1]
-    rotated_img = cv2.warpAffine(img, trans, (frame, frame))
-    return rotated_img
+    return trans, frame
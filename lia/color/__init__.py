@@ -1,4 +1,26 @@
-from .convert import rgb2hsv
-from .pickup import pickup_over_thresh
-from .replave_background import blackening_bg
-from .search import search_closest_color
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".convert": ("rgb2hsv",),
+        ".grid": (
+            "build_color_grid",
+            "query_color_grid",
+            "search_color_grid",
+        ),
+        ".pickup": (
+            "get_over_thresh_mask",
+            "pickup_over_thresh",
+        ),
+        ".replave_background": ("blackening_bg",),
+        ".search": ("search_closest_color",),
+        ".table": (
+            "build_color_table",
+            "get_color_table_index",
+            "load_color_table",
+            "save_color_table",
+            "search_color_table",
+        ),
+    },
+)
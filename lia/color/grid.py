@@ -0,0 +1,162 @@
+import numpy as np
+
+COLOR_GRID_BITS = 4
+QUERY_CHUNK_SIZE = 1 << 16
+# Larger than any L1 distance of 8 bit BGR colors.
+_FAR_COLOR = 1 << 12
+
+
+def build_color_grid(color_list, bits=COLOR_GRID_BITS):
+    """Bucket standard colors into grid of BGR space for nearest color search.
+
+    Each cell keeps only the standard colors which can be closest (L1 distance)
+    to some color in the cell, so search is exact.
+
+    Parameters
+    ----------
+    color_list : [[int, int, int], ...]
+        List of standard color.
+    bits : int, optional
+        Number of cells in each channel is 2 ** bits (1 - 8).
+
+    Returns
+    -------
+    grid : numpy.ndarray
+        Index of candidate standard colors of each cell in ascending order,
+        (2 ** bits, 2 ** bits, 2 ** bits, max number of candidates).
+        Empty slots are filled with number of standard colors.
+
+    Raises
+    ------
+    ValueError
+        If bit depth is out of range.
+    ValueError
+        If there is no standard color.
+    """
+    if not 1 <= bits <= 8:
+        raise ValueError(f"Invalid bit depth: {bits}\nPlease select from 1 to 8.")
+    palette = np.asarray(color_list, dtype=np.int32).reshape(-1, 3)
+    num_color = palette.shape[0]
+    if num_color == 0:
+        raise ValueError("There is no standard color.")
+    num_cell = 1 << bits
+    cell_size = 1 << (8 - bits)
+    lower = np.arange(num_cell, dtype=np.int32) * cell_size
+    upper = lower + cell_size - 1
+    # Per channel minimum and maximum distance between cell and standard color.
+    near = []
+    far = []
+    for i in range(3):
+        value = palette[np.newaxis, :, i]
+        below = lower[:, np.newaxis] - value
+        above = value - upper[:, np.newaxis]
+        near.append(np.maximum(np.maximum(below, above), 0))
+        far.append(np.maximum(np.abs(below), np.abs(above)))
+    near_dist = (
+        near[0][:, np.newaxis, np.newaxis, :]
+        + near[1][np.newaxis, :, np.newaxis, :]
+        + near[2][np.newaxis, np.newaxis, :, :]
+    )
+    far_dist = (
+        far[0][:, np.newaxis, np.newaxis, :]
+        + far[1][np.newaxis, :, np.newaxis, :]
+        + far[2][np.newaxis, np.newaxis, :, :]
+    )
+    bound = far_dist.min(axis=3, keepdims=True)
+    is_candidate = near_dist <= bound
+    num_candidate = is_candidate.sum(axis=3).max()
+    # Stable sort moves candidates to the front keeping ascending index.
+    order = np.argsort(~is_candidate, axis=3, kind="stable")[..., :num_candidate]
+    found = np.take_along_axis(is_candidate, order, axis=3)
+    grid = np.where(found, order, num_color).astype(np.int32)
+    return grid
+
+
+def query_color_grid(query_list, grid, color_list, max_distance=None):
+    """Search index of closest standard color for each query at once.
+
+    Parameters
+    ----------
+    query_list : numpy.ndarray
+        Array of BGR query, (N, 3).
+    grid : numpy.ndarray
+        Grid made by build_color_grid.
+    color_list : [[int, int, int], ...]
+        List of standard color used to build the grid.
+    max_distance : int, optional
+        Maximum L1 distance. Query farther than this from every standard color
+        is rejected.
+
+    Returns
+    -------
+    idx : numpy.ndarray
+        Index of closest standard color, (N,). -1 if rejected.
+    dist : numpy.ndarray
+        L1 distance to closest standard color, (N,).
+    """
+    query = np.asarray(query_list).reshape(-1, 3)
+    palette = np.asarray(color_list, dtype=np.int32).reshape(-1, 3)
+    palette = np.vstack([palette, np.full((1, 3), _FAR_COLOR, dtype=np.int32)])
+    shift = 8 - (grid.shape[0].bit_length() - 1)
+    num_color = palette.shape[0] - 1
+    grid_flat = grid.reshape(-1, grid.shape[3])
+    # Cells are grouped by number of candidates, so few cells with many
+    # candidates do not slow down the others.
+    num_candidate = (grid_flat < num_color).sum(axis=1)
+    width = 1 << np.ceil(np.log2(np.maximum(num_candidate, 1))).astype(np.int64)
+    length = query.shape[0]
+    idx = np.empty(length, dtype=np.int64)
+    dist = np.empty(length, dtype=np.int32)
+    for start in range(0, length, QUERY_CHUNK_SIZE):
+        chunk = query[start : start + QUERY_CHUNK_SIZE].astype(np.int32)
+        cell = chunk >> shift
+        cell = (cell[:, 0] * grid.shape[1] + cell[:, 1]) * grid.shape[2] + cell[:, 2]
+        chunk_width = width[cell]
+        for group_width in np.unique(chunk_width):
+            pos = np.flatnonzero(chunk_width == group_width)
+            candidate = grid_flat[cell[pos], :group_width]
+            candidate_dist = np.abs(palette[candidate] - chunk[pos, np.newaxis, :]).sum(
+                axis=2
+            )
+            best = candidate_dist.argmin(axis=1)
+            rows = np.arange(pos.shape[0])
+            idx[start + pos] = candidate[rows, best]
+            dist[start + pos] = candidate_dist[rows, best]
+    if max_distance is not None:
+        idx[dist > max_distance] = -1
+    return idx, dist
+
+
+def search_color_grid(query_list, grid, color_list, value_list=None, max_distance=None):
+    """Search closest color with grid, rejecting colors far from every standard.
+
+    Parameters
+    ----------
+    query_list : numpy.ndarray
+        Array of BGR query, (N, 3).
+    grid : numpy.ndarray
+        Grid made by build_color_grid.
+    color_list : [[int, int, int], ...]
+        List of standard color used to build the grid.
+    value_list : [int, ...], optional
+        List of value.
+    max_distance : int, optional
+        Maximum L1 distance to standard color.
+
+    Returns
+    -------
+    keep : numpy.ndarray
+        Boolean mask of query not rejected, (N,).
+    color : numpy.ndarray
+        Array of closest color of kept query.
+    value : numpy.ndarray, optional
+        Array of value of kept query.
+    """
+    idx, _ = query_color_grid(query_list, grid, color_list, max_distance)
+    keep = idx >= 0
+    color = np.asarray(color_list)[idx[keep]]
+    if value_list is None:
+        return keep, color
+    else:
+        value = np.asarray(value_list)[idx[keep]]
+        return keep, color, value
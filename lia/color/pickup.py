@@ -1,42 +1,102 @@
+import numpy as np
+
 COLOR_THRESH1 = 0
 COLOR_THRESH2 = 0
 
 
-def pickup_over_thresh(
-    color1, color2, color_thresh1=COLOR_THRESH1, color_thresh2=COLOR_THRESH2
+def get_over_thresh_mask(
+    color1, color2, color_thresh1=COLOR_THRESH1, color_thresh2=COLOR_THRESH2, mask=None
 ):
-    """Pick up from an array of colors that are both above the threshold.
+    """Get mask of pixels whose colors are both above the threshold.
 
     Parameters
     ----------
-    color1 : [[int, int, int], ...]
-        Array of color 1.
-    color2 : [[int, int, int], ...]
-        Array of color 2.
+    color1 : numpy.ndarray
+        Array of color 1, (N, 3) or (N,).
+    color2 : numpy.ndarray
+        Array of color 2, (N, 3) or (N,).
     color_thresh1 : int, optional
         Threshold for color 1.
     color_thresh2 : int, optional
         Threshold for color 2.
+    mask : numpy.ndarray, optional
+        Boolean mask of object in color 1, (N,). If given, it is used instead of
+        threshold for color 1.
 
     Returns
     -------
-    result1 : [[int, int, int], ...]
-        Picked color 1.
-    result2 : [[int, int, int], ...]
-        Picked color 2.
+    keep : numpy.ndarray
+        Boolean mask, (N,). True if both colors are above the threshold.
 
     Raises
     ------
     ValueError
         Size of array are different.
     """
+    color1 = np.asarray(color1)
+    color2 = np.asarray(color2)
     if color1.shape[0] != color2.shape[0]:
         raise ValueError("Image size are different.")
-    result1 = []
-    result2 = []
-    length = color1.shape[0]
-    for i in range(length):
-        if (color1[i].sum() > color_thresh1) and (color2[i].sum() > color_thresh2):
-            result1.append(color1[i])
-            result2.append(color2[i])
+    if mask is None:
+        keep = _color_sum(color1) > color_thresh1
+    else:
+        keep = np.array(mask, dtype=bool)
+    keep &= _color_sum(color2) > color_thresh2
+    return keep
+
+
+def pickup_over_thresh(
+    color1, color2, color_thresh1=COLOR_THRESH1, color_thresh2=COLOR_THRESH2, mask=None
+):
+    """Pick up from an array of colors that are both above the threshold.
+
+    Parameters
+    ----------
+    color1 : numpy.ndarray
+        Array of color 1, (N, 3) or (N,).
+    color2 : numpy.ndarray
+        Array of color 2, (N, 3) or (N,).
+    color_thresh1 : int, optional
+        Threshold for color 1.
+    color_thresh2 : int, optional
+        Threshold for color 2.
+    mask : numpy.ndarray, optional
+        Boolean mask of object in color 1, (N,). If given, it is used instead of
+        threshold for color 1.
+
+    Returns
+    -------
+    result1 : numpy.ndarray
+        Picked color 1, contiguous array of the same dtype as input.
+    result2 : numpy.ndarray
+        Picked color 2, contiguous array of the same dtype as input.
+
+    Raises
+    ------
+    ValueError
+        Size of array are different.
+    """
+    color1 = np.asarray(color1)
+    color2 = np.asarray(color2)
+    keep = get_over_thresh_mask(color1, color2, color_thresh1, color_thresh2, mask)
+    result1 = color1[keep]
+    result2 = color2[keep]
     return result1, result2
+
+
+def _color_sum(color):
+    """Sum of channels of each pixel without overflow.
+
+    Parameters
+    ----------
+    color : numpy.ndarray
+        Array of color, (N, C) or (N,).
+
+    Returns
+    -------
+    color_sum : numpy.ndarray
+        Sum of channels, (N,).
+    """
+    if color.ndim == 1:
+        return color.astype(np.int64, copy=False)
+    return color.sum(axis=1, dtype=np.int64)
@@ -0,0 +1,149 @@
+import numpy as np
+
+COLOR_TABLE_BITS = 6
+
+
+def build_color_table(color_list, bits=COLOR_TABLE_BITS):
+    """Compile list of standard color into dense lookup table of closest color.
+
+    Parameters
+    ----------
+    color_list : [[int, int, int], ...]
+        List of standard color.
+    bits : int, optional
+        Bit depth of each channel of the table (1 - 8). Each query is
+        matched at the center of its quantization step. With 8 bits the table
+        is exact, but it has 256 ** 3 entries and takes seconds to build for
+        a palette of a few hundred colors, e.g. about 7 s and 32 MB for 300
+        colors, while 6 bits takes about 0.1 s and 0.5 MB.
+
+    Returns
+    -------
+    table : numpy.ndarray
+        Index of closest standard color (L1 distance) for each quantized color,
+        (2 ** bits, 2 ** bits, 2 ** bits).
+
+    Raises
+    ------
+    ValueError
+        If bit depth is out of range.
+    ValueError
+        If there is no standard color.
+    """
+    if not 1 <= bits <= 8:
+        raise ValueError(f"Invalid bit depth: {bits}\nPlease select from 1 to 8.")
+    palette = np.asarray(color_list, dtype=np.int16).reshape(-1, 3)
+    if palette.shape[0] == 0:
+        raise ValueError("There is no standard color.")
+    shift = 8 - bits
+    num_level = 1 << bits
+    # Center of each quantization step.
+    levels = (np.arange(num_level, dtype=np.int16) << shift) + ((1 << shift) >> 1)
+    # L1 distance is separable, so distances are summed per channel.
+    dist_b, dist_g, dist_r = [
+        np.abs(levels[:, np.newaxis] - palette[np.newaxis, :, i]) for i in range(3)
+    ]
+    dist_gr = dist_g[:, np.newaxis, :] + dist_r[np.newaxis, :, :]
+    index_dtype = np.uint16 if palette.shape[0] <= 0xFFFF else np.uint32
+    table = np.empty((num_level, num_level, num_level), dtype=index_dtype)
+    for i in range(num_level):
+        dist = dist_gr + dist_b[i]
+        table[i] = dist.argmin(axis=2)
+    return table
+
+
+def get_color_table_index(query_list, table):
+    """Get index of closest standard color from lookup table.
+
+    Parameters
+    ----------
+    query_list : numpy.ndarray
+        Array of BGR query, (..., 3). Image is also acceptable.
+    table : numpy.ndarray
+        Lookup table made by build_color_table.
+
+    Returns
+    -------
+    idx : numpy.ndarray
+        Index of closest standard color, same shape as query without channel.
+    """
+    query = np.asarray(query_list)
+    shift = 8 - (table.shape[0].bit_length() - 1)
+    if shift > 0:
+        query = query >> shift
+    idx = table[query[..., 0], query[..., 1], query[..., 2]]
+    return idx
+
+
+def search_color_table(query_list, table, color_list, value_list=None):
+    """Search closest color with lookup table.
+
+    Parameters
+    ----------
+    query_list : numpy.ndarray
+        Array of BGR query, (..., 3).
+    table : numpy.ndarray
+        Lookup table made by build_color_table.
+    color_list : [[int, int, int], ...]
+        List of standard color used to build the table.
+    value_list : [int, ...], optional
+        List of value.
+
+    Returns
+    -------
+    color : numpy.ndarray
+        Array of color.
+    value : numpy.ndarray, optional
+        Array of value.
+    """
+    idx = get_color_table_index(query_list, table)
+    color = np.asarray(color_list)[idx]
+    if value_list is None:
+        return color
+    else:
+        value = np.asarray(value_list)[idx]
+        return color, value
+
+
+def save_color_table(path, table, color_list, value_list=None):
+    """Save lookup table with its standard color and value.
+
+    Parameters
+    ----------
+    path : str
+        Output path (.npz).
+    table : numpy.ndarray
+        Lookup table made by build_color_table.
+    color_list : [[int, int, int], ...]
+        List of standard color used to build the table.
+    value_list : [int, ...], optional
+        List of value.
+    """
+    arrays = {"table": table, "color": np.asarray(color_list)}
+    if value_list is not None:
+        arrays["value"] = np.asarray(value_list)
+    np.savez_compressed(path, **arrays)
+
+
+def load_color_table(path):
+    """Load lookup table.
+
+    Parameters
+    ----------
+    path : str
+        Path of table saved by save_color_table.
+
+    Returns
+    -------
+    table : numpy.ndarray
+        Lookup table.
+    color_list : [[int, int, int], ...]
+        List of standard color.
+    value_list : [int, ...] or None
+        List of value.
+    """
+    with np.load(path) as data:
+        table = data["table"]
+        color_list = data["color"].tolist()
+        value_list = data["value"].tolist() if "value" in data else None
+    return table, color_list, value_list
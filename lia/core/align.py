@@ -1,9 +1,23 @@
 from lia.align.overlap import (
+    IOU_THRESH,
+    MODE,
+    NUM_CPU,
+    POOL,
+    PYRAMID_LEVEL,
+    REFINE_RANGE,
+    ROTATION,
     SCALING_FACTOR,
     SIZE_ERROR,
+    SIZING,
     SLIDE_RANGE,
     adjust_shape_horizontal,
+    get_align_transform,
+    iter_adjust_shape_horizontal,
+    iter_align_transform,
+    prepare_align_std,
 )
+from lia.align.score import ENGINE
+from lia.align.transform import WARP
 from lia.core.base import ImageCore
 
 
@@ -18,6 +32,28 @@ class AlignLeaf(ImageCore):
         Pecentage to be scaled.
     slide_range : int
         Percentage to move.
+    pyramid_level : int
+        Level of downsampling for coarse-to-fine search. 0 searches all.
+    refine_range : int
+        Range searched in full size around the coarse result.
+    engine : str
+        Engine to score slides, "loop", "fft" or "packed".
+    num_cpu : int
+        Number of workers searching scales in parallel. 1 searches serially.
+    pool : str
+        "thread" or "process".
+    warp : str
+        "chain" resamples step by step, "fused" each image once.
+    rotation : str
+        "frame" rotates whole binary image, "roi" only around leaf.
+    sizing : str
+        "mask" measures leaf from binary image, "contour" from contour.
+    mode : str
+        "search" searches all candidates. "moment" estimates from moments of
+        leaves, and searches only if IoU is below iou_thresh. "register"
+        registers leaves by phase correlation with small rotation.
+    iou_thresh : float
+        Least IoU accepted for estimation by moments.
     """
 
     def __init__(self):
@@ -26,6 +62,16 @@ class AlignLeaf(ImageCore):
         self.size_error = SIZE_ERROR
         self.scaling_factor = SCALING_FACTOR
         self.slide_range = SLIDE_RANGE
+        self.pyramid_level = PYRAMID_LEVEL
+        self.refine_range = REFINE_RANGE
+        self.engine = ENGINE
+        self.num_cpu = NUM_CPU
+        self.pool = POOL
+        self.warp = WARP
+        self.rotation = ROTATION
+        self.sizing = SIZING
+        self.mode = MODE
+        self.iou_thresh = IOU_THRESH
 
     def set_param(self, **kwargs):
         """Set parameters.
@@ -38,6 +84,28 @@ class AlignLeaf(ImageCore):
             Pecentage to be scaled.
         slide_range : int
             Percentage to move.
+        pyramid_level : int
+            Level of downsampling for coarse-to-fine search. 0 searches all.
+        refine_range : int
+            Range searched in full size around the coarse result.
+        engine : str
+            Engine to score slides, "loop", "fft" or "packed".
+        num_cpu : int
+            Number of workers searching scales in parallel. 1 searches serially.
+        pool : str
+            "thread" or "process".
+        warp : str
+            "chain" resamples step by step, "fused" each image once.
+        rotation : str
+            "frame" rotates whole binary image, "roi" only around leaf.
+        sizing : str
+            "mask" measures leaf from binary image, "contour" from contour.
+        mode : str
+            "search" searches all candidates. "moment" estimates from moments of
+            leaves, and searches only if IoU is below iou_thresh. "register"
+            registers leaves by phase correlation with small rotation.
+        iou_thresh : float
+            Least IoU accepted for estimation by moments.
         """
         super().set_param(**kwargs)
 
@@ -77,5 +145,212 @@ class AlignLeaf(ImageCore):
             self.size_error,
             self.scaling_factor,
             self.slide_range,
+            self.pyramid_level,
+            self.refine_range,
+            self.engine,
+            self.num_cpu,
+            self.pool,
+            self.warp,
+            self.rotation,
+            self.sizing,
+            self.mode,
+            self.iou_thresh,
         )
         return std_crop_img, var_align_img
+
+    def get_transform(self, std_input, var_input, std_cnt, var_cnt):
+        """Search transform to scale and move the leaf horizontally.
+
+        The transform can be applied to other images taken in the same geometry
+        by apply_transform, or saved by lia.align.save_align_transform.
+
+        Parameters
+        ----------
+        std_input : str or numpy.ndarray
+            Input standard image or its path.
+        var_input : srt or numpy.ndarray
+            Input image to be scaled or its path.
+        std_cnt : [[[int, int]], ...]
+            Contours of std_input.
+        var_cnt : [[[int, int], ...]]
+            Contours of var_inupt.
+
+        Returns
+        -------
+        transform : AlignTransform
+            Transform of images.
+
+        Raises
+        ------
+        TypeError
+            If input is not image.
+        """
+        std_img = self.input_img(std_input)
+        var_img = self.input_img(var_input)
+        transform = get_align_transform(
+            std_img,
+            var_img,
+            std_cnt,
+            var_cnt,
+            self.size_error,
+            self.scaling_factor,
+            self.slide_range,
+            self.pyramid_level,
+            self.refine_range,
+            self.engine,
+            self.num_cpu,
+            self.pool,
+            self.rotation,
+            self.sizing,
+            self.mode,
+            self.iou_thresh,
+        )
+        return transform
+
+    def apply_transform(self, transform, std_input, var_input):
+        """Scale and move the leaf horizontally with transform searched before.
+
+        Parameters
+        ----------
+        transform : AlignTransform
+            Transform made by get_transform.
+        std_input : str or numpy.ndarray
+            Input standard image or its path.
+        var_input : srt or numpy.ndarray
+            Input image to be scaled or its path.
+
+        Returns
+        -------
+        std_crop_img : numpy.ndarray
+            Standard image cropped around leaf.
+        var_align_img : numpy.ndarray
+            Output adjusted image.
+
+        Raises
+        ------
+        TypeError
+            If input is not image.
+        """
+        std_img = self.input_img(std_input)
+        var_img = self.input_img(var_input)
+        std_crop_img = transform.apply_std(std_img, warp=self.warp)
+        var_align_img = transform(var_img, warp=self.warp)
+        return std_crop_img, var_align_img
+
+    def prepare(self, std_input, std_cnt):
+        """Prepare standard leaf once for aligning many images.
+
+        Parameters
+        ----------
+        std_input : str or numpy.ndarray
+            Input standard image or its path.
+        std_cnt : [[[int, int]], ...]
+            Contours of std_input.
+
+        Returns
+        -------
+        std : AlignStandard
+            Prepared standard leaf.
+
+        Raises
+        ------
+        TypeError
+            If input is not image.
+        """
+        std_img = self.input_img(std_input)
+        std = prepare_align_std(
+            std_img, std_cnt, self.size_error, self.rotation, self.sizing
+        )
+        return std
+
+    def get_transforms(self, std, var_inputs, var_cnts):
+        """Search transforms of many images against prepared standard leaf.
+
+        Images are searched in parallel by num_cpu workers. Only size of
+        images is needed, so PNG or JPEG files are not decoded.
+
+        Parameters
+        ----------
+        std : AlignStandard
+            Standard leaf made by prepare.
+        var_inputs : iterable of str or numpy.ndarray
+            Input images to be scaled or their paths.
+        var_cnts : iterable of [[[int, int], ...]]
+            Contours of each image.
+
+        Yields
+        ------
+        transform : AlignTransform
+            Transform of each image, in order of input.
+
+        Raises
+        ------
+        TypeError
+            If input is not image.
+        """
+        var_shapes = (self.input_shape(var_input) for var_input in var_inputs)
+        yield from iter_align_transform(
+            std,
+            var_shapes,
+            var_cnts,
+            self.scaling_factor,
+            self.slide_range,
+            self.pyramid_level,
+            self.refine_range,
+            self.engine,
+            self.num_cpu,
+            self.pool,
+            self.mode,
+            self.iou_thresh,
+        )
+
+    def horizontal_many(self, std_input, var_inputs, std_cnt, var_cnts):
+        """Scale and move many leaves horizontally to one standard leaf.
+
+        Standard leaf is prepared only once, and images are searched in parallel
+        by num_cpu workers. Results are yielded as soon as they are ready.
+
+        Parameters
+        ----------
+        std_input : str or numpy.ndarray
+            Input standard image or its path.
+        var_inputs : iterable of str or numpy.ndarray
+            Input images to be scaled or their paths.
+        std_cnt : [[[int, int]], ...]
+            Contours of std_input.
+        var_cnts : iterable of [[[int, int], ...]]
+            Contours of each image.
+
+        Yields
+        ------
+        std_crop_img : numpy.ndarray
+            Standard image cropped around leaf.
+        var_align_img : numpy.ndarray
+            Output adjusted image, in order of input.
+
+        Raises
+        ------
+        TypeError
+            If input is not image.
+        """
+        std_img = self.input_img(std_input)
+        var_imgs = (self.input_img(var_input) for var_input in var_inputs)
+        yield from iter_adjust_shape_horizontal(
+            std_img,
+            var_imgs,
+            std_cnt,
+            var_cnts,
+            self.size_error,
+            self.scaling_factor,
+            self.slide_range,
+            self.pyramid_level,
+            self.refine_range,
+            self.engine,
+            self.num_cpu,
+            self.pool,
+            self.warp,
+            self.rotation,
+            self.sizing,
+            self.mode,
+            self.iou_thresh,
+        )
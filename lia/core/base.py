@@ -1,11 +1,25 @@
+import io
+import mmap
 import os
 
 import cv2
 import numpy as np
 
+from lia.core.cache import ImageCache
+from lia.core.header import read_image_size
+
 
 class ImageCore:
-    """Basic class for input/output of images."""
+    """Basic class for input/output of images.
+
+    Attributes
+    ----------
+    image_cache : ImageCache
+        Cache of decoded images shared by all classes. It is disabled until
+        image_cache.max_bytes is set.
+    """
+
+    image_cache = ImageCache()
 
     def __init__(self):
         pass
@@ -13,10 +27,16 @@ class ImageCore:
     def input_img(self, input):
         """Input image by cv2 format.
 
+        Image read from path is shared through image_cache if it is enabled,
+        so it is read-only. Encoded image in memory, io.BytesIO or file opened
+        from disk is decoded without copying it. File object is read from
+        its current position to the end.
+
         Parameters
         ----------
-        input : numpy.ndarray or str
-            Input image or its path.
+        input : numpy.ndarray or str or os.PathLike or bytes-like or file object
+            Input image, its path, encoded image (bytes, bytearray,
+            memoryview, mmap) or binary file object.
 
         Returns
         -------
@@ -27,20 +47,127 @@ class ImageCore:
         ------
         TypeError
             If input path is not image file.
+        TypeError
+            If input cannot be decoded or its type is not supported.
         ValueError
             No such file.
         """
         if type(input) == np.ndarray:
             return input
-        elif type(input) == str:
+        elif isinstance(input, np.ndarray):
+            # Subclass is viewed as ndarray without copy.
+            return input.view(np.ndarray)
+        elif isinstance(input, (str, os.PathLike)):
+            input = os.fspath(input)
             if os.path.isfile(input):
-                img = cv2.imread(input)
+                img = self.image_cache.read(input)
                 if type(img) != np.ndarray:
                     raise TypeError(f"'{input}' is not an image file.")
                 else:
                     return img
             else:
                 raise ValueError(f"Cannot access '{input}': No such file.")
+        elif isinstance(input, (bytes, bytearray, memoryview, mmap.mmap)):
+            return self.__decode(input)
+        elif hasattr(input, "read"):
+            return self.__decode_file(input)
+        raise TypeError(f"Invalid input type: {type(input).__name__}")
+
+    def input_shape(self, input):
+        """Get height and width of input image.
+
+        Size of PNG or JPEG file is read from its header without decoding.
+        Other inputs are decoded by input_img.
+
+        Parameters
+        ----------
+        input : numpy.ndarray or str or os.PathLike or bytes-like or file object
+            Input image, as input_img.
+
+        Returns
+        -------
+        shape : (int, int)
+            Height and width of image.
+
+        Raises
+        ------
+        TypeError
+            If input is not image.
+        ValueError
+            No such file.
+        """
+        if isinstance(input, (str, os.PathLike)) and os.path.isfile(input):
+            size = read_image_size(os.fspath(input))
+            if size is not None:
+                return size
+        return self.input_img(input).shape[:2]
+
+    def __decode(self, buffer):
+        """Decode encoded image in memory.
+
+        Parameters
+        ----------
+        buffer : bytes-like
+            Encoded image.
+
+        Returns
+        -------
+        img : numpy.ndarray
+            cv2 format image.
+
+        Raises
+        ------
+        TypeError
+            If buffer is not image.
+        """
+        img = None
+        if len(buffer) > 0:
+            img = cv2.imdecode(np.frombuffer(buffer, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if type(img) != np.ndarray:
+            raise TypeError("Input is not an image.")
+        return img
+
+    def __decode_file(self, file):
+        """Decode image from current position of binary file object.
+
+        Buffer of io.BytesIO and file opened from disk are mapped without
+        reading. Other file objects, e.g. gzip.GzipFile whose fileno is of
+        compressed file, are read. Position is moved to the end in any case,
+        as read().
+
+        Parameters
+        ----------
+        file : file object
+            Binary file object.
+
+        Returns
+        -------
+        img : numpy.ndarray
+            cv2 format image.
+        """
+        if isinstance(file, io.BytesIO):
+            pos = file.tell()
+            with file.getbuffer() as buffer:
+                img = self.__decode(buffer[pos:])
+            file.seek(0, io.SEEK_END)
+            return img
+        raw = file.raw if isinstance(file, io.BufferedReader) else file
+        if not isinstance(raw, io.FileIO):
+            return self.__decode(file.read())
+        try:
+            pos = file.tell()
+            file_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty file or file not mappable such as pipe.
+            return self.__decode(file.read())
+        with file_map:
+            buffer = memoryview(file_map)[pos:]
+            try:
+                img = self.__decode(buffer)
+            finally:
+                buffer.release()
+        file.seek(0, io.SEEK_END)
+        return img
 
     def get_file_name(self, path):
         """Get file name.
@@ -78,4 +205,8 @@ class ImageCore:
                 exec_cmd = f"self.{key} = '{value}'"
             elif type(value) == int:
                 exec_cmd = f"self.{key} = {value}"
+            elif type(value) == bool:
+                exec_cmd = f"self.{key} = {value}"
+            elif type(value) == float:
+                exec_cmd = f"self.{key} = {value!r}"
             exec(exec_cmd)
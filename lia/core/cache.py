@@ -0,0 +1,125 @@
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+
+IMAGE_CACHE_SIZE = 0
+
+
+class ImageCache:
+    """Cache of decoded images with LRU eviction.
+
+    Image is identified by path, modification time and size of file, so
+    changed file is read again. Cached images are read-only to be shared.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Max total bytes of cached images. If 0, images are not cached.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Max total bytes of cached images.
+    nbytes : int
+        Total bytes of cached images.
+    hits : int
+        Number of images found in cache.
+    misses : int
+        Number of images read from file.
+    """
+
+    def __init__(self, max_bytes=IMAGE_CACHE_SIZE):
+        self.__max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.__images = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__images)
+
+    @property
+    def max_bytes(self):
+        return self.__max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        with self.__lock:
+            self.__max_bytes = max_bytes
+            self.__evict()
+
+    def read(self, path, flags=cv2.IMREAD_COLOR):
+        """Read image through cache.
+
+        Parameters
+        ----------
+        path : str
+            Path of image file.
+        flags : int, optional
+            Flags of cv2.imread.
+
+        Returns
+        -------
+        img : numpy.ndarray or None
+            Decoded image, read-only if cached. None if it cannot be read.
+        """
+        if self.__max_bytes <= 0:
+            return cv2.imread(path, flags)
+        stat = os.stat(path)
+        key = (os.path.abspath(path), flags)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self.__lock:
+            entry = self.__images.get(key)
+            if (entry is not None) and (entry[0] == stamp):
+                self.__images.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        img = cv2.imread(path, flags)
+        if img is None:
+            return None
+        img.flags.writeable = False
+        with self.__lock:
+            old_entry = self.__images.pop(key, None)
+            if old_entry is not None:
+                self.nbytes -= old_entry[1].nbytes
+            if img.nbytes <= self.__max_bytes:
+                self.__images[key] = (stamp, img)
+                self.nbytes += img.nbytes
+                self.__evict()
+        return img
+
+    def clear(self):
+        """Remove all images and reset counters."""
+        with self.__lock:
+            self.__images.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Get state of cache.
+
+        Returns
+        -------
+        info : dict
+            "hits", "misses", number of "images", "nbytes" and "max_bytes".
+        """
+        with self.__lock:
+            info = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "images": len(self.__images),
+                "nbytes": self.nbytes,
+                "max_bytes": self.__max_bytes,
+            }
+        return info
+
+    def __evict(self):
+        """Remove least recently used images over max bytes."""
+        while self.nbytes > self.__max_bytes:
+            _, (_, img) = self.__images.popitem(last=False)
+            self.nbytes -= img.nbytes
@@ -11,12 +11,31 @@ from lia.basic.get._consts import (
     LEAF_COLOR_UPPER,
     MIN_CNTS_RATIO,
     NOISE_RATIO_THRESH,
+    REDUCTION,
     THRESH,
     WHITE_BG_THRESH,
 )
 from lia.core.base import ImageCore
 from lia.detect import extract_leaf_by_color, extract_leaf_by_thresh
-from lia.detect.detect_fvfm import BAR_AREA_RATIO, WHITE_INV_THRESH, get_fvfm_list
+from lia.detect.calib_fvfm import FvFmCalibCache
+from lia.detect.detect_fvfm import (
+    BAR_AREA_RATIO,
+    BAR_MARGIN,
+    OCR_BACKEND,
+    OCR_GPU,
+    OCR_LANG,
+    OCR_MARGIN,
+    OCR_NUM_THREAD,
+    WHITE_INV_THRESH,
+    clear_ocr_reader,
+    get_bar_area,
+    get_fvfm_list,
+    get_ocr_area,
+    get_ocr_reader,
+    get_template_reader,
+    read_bar_value,
+)
+from lia.detect.template_ocr import TemplateReader
 
 
 class ExtractLeaf(ImageCore):
@@ -50,6 +69,9 @@ class ExtractLeaf(ImageCore):
         Upper of color range.
     white_bg_thresh : int
         Threshold of binarization for white background.
+    reduction : int
+        Factor to reduce image for detection, 1, 2, 4 or 8. Contour is refined
+        in full resolution.
     """
 
     def __init__(self):
@@ -68,6 +90,7 @@ class ExtractLeaf(ImageCore):
         self.leaf_color_lower = LEAF_COLOR_LOWER
         self.leaf_color_upper = LEAF_COLOR_UPPER
         self.white_bg_thresh = WHITE_BG_THRESH
+        self.reduction = REDUCTION
 
     def __draw_cnts_area(self, img, cnt):
         """Draw contours.
@@ -117,6 +140,7 @@ class ExtractLeaf(ImageCore):
             self.diff_ellipse_size,
             self.beyond_error_ellipse,
             self.white_bg_thresh,
+            self.reduction,
         )
         leaf_cnt_imgs = []
         for cnt in leaf_cnt_candidates:
@@ -147,6 +171,7 @@ class ExtractLeaf(ImageCore):
             self.leaf_color_upper,
             self.leaf_color_format,
             self.min_cnts_ratio,
+            self.reduction,
         )
         leaf_cnt_img = self.__draw_cnts_area(img, leaf_cnt)
         return leaf_cnt_img, leaf_cnt
@@ -182,6 +207,8 @@ class ExtractLeaf(ImageCore):
             Upper of color range.
         white_bg_thresh : int
             Threshold of binarization for white background.
+        reduction : int
+            Factor to reduce image for detection, 1, 2, 4 or 8.
         """
         super().set_param(**kwargs)
 
@@ -195,11 +222,37 @@ class ExtractFvFm(ImageCore):
         Threshold of whtie background.
     bar_area_ratio : int
         Ratio of minimum bar size.
+    bar_margin : int
+        Percentage of width searched for bar from right and left edges.
+    ocr_margin : float
+        Margin around bar read by OCR, in multiples of bar width.
+    ocr_lang : str
+        Languages of OCR, separated by comma.
+    ocr_gpu : bool
+        If False, OCR uses only CPU.
+    ocr_num_thread : int
+        Number of threads of OCR. If 0, torch default.
+    ocr_backend : str
+        "easyocr" or "template". "template" reads labels by templates made
+        by learn_template without easyocr and torch.
+    ocr_template_path : str
+        Path of templates for "template".
+    calib_cache : FvFmCalibCache
+        Cache of calibration of scale bar, reused for images of the same
+        layout.
     """
 
     def __init__(self) -> None:
         self.white_inv_thresh = WHITE_INV_THRESH
         self.bar_area_ratio = BAR_AREA_RATIO
+        self.bar_margin = BAR_MARGIN
+        self.ocr_margin = OCR_MARGIN
+        self.ocr_lang = OCR_LANG
+        self.ocr_gpu = OCR_GPU
+        self.ocr_num_thread = OCR_NUM_THREAD
+        self.ocr_backend = OCR_BACKEND
+        self.ocr_template_path = ""
+        self.calib_cache = FvFmCalibCache()
 
     def get_list(self, input_path):
         """Get list of Fv/Fm value and color.
@@ -217,11 +270,97 @@ class ExtractFvFm(ImageCore):
             List of Fv/Fm scale value.
         """
         img = self.input_img(input_path)
+        # OCR reader is loaded only if calibration is not cached.
         fvfm_color_list, fvfm_value_list = get_fvfm_list(
-            img, self.white_inv_thresh, self.bar_area_ratio
+            img,
+            self.white_inv_thresh,
+            self.bar_area_ratio,
+            self.bar_margin,
+            self.ocr_margin,
+            self.warm_up,
+            self.calib_cache,
         )
         return fvfm_color_list, fvfm_value_list
 
+    def load_calib(self, path):
+        """Use calibration cache saved in file.
+
+        Parameters
+        ----------
+        path : str
+            Path of json file. If it doesn't exist, it is made by save_calib.
+        """
+        self.calib_cache = FvFmCalibCache(path)
+
+    def save_calib(self, path=None):
+        """Save calibration cache.
+
+        Parameters
+        ----------
+        path : str, optional
+            Path of json file. If None, path given to load_calib.
+        """
+        self.calib_cache.save(path)
+
+    def warm_up(self):
+        """Load OCR reader shared in process before getting list.
+
+        For pool workers, lia.detect.init_ocr_reader can be initializer.
+
+        Returns
+        -------
+        reader : easyocr.Reader or TemplateReader
+            OCR reader.
+
+        Raises
+        ------
+        ValueError
+            Invalid ocr_backend.
+        """
+        if self.ocr_backend == "template":
+            return get_template_reader(self.ocr_template_path)
+        elif self.ocr_backend != "easyocr":
+            raise ValueError(
+                f"Invalid ocr_backend: {self.ocr_backend}\n"
+                'Please select "easyocr" or "template".'
+            )
+        return get_ocr_reader(self.ocr_lang, self.ocr_gpu, self.ocr_num_thread)
+
+    def learn_template(self, input_path, path, fvfm_value_list=None):
+        """Learn templates of labels from an image and use them for OCR.
+
+        Parameters
+        ----------
+        input_path : str or numpy.ndarray
+            Input image or its path.
+        path : str
+            Output path of templates. ".npz" is added if it does not end with
+            it.
+        fvfm_value_list : [[float, float], ...], optional
+            Position height and value of labels. If None, read by easyocr.
+        """
+        img = self.input_img(input_path)
+        bar_area = get_bar_area(
+            img, self.white_inv_thresh, self.bar_area_ratio, self.bar_margin
+        )
+        if fvfm_value_list is None:
+            reader = get_ocr_reader(self.ocr_lang, self.ocr_gpu, self.ocr_num_thread)
+            fvfm_value_list, ocr_area = read_bar_value(
+                img, bar_area, self.ocr_margin, reader
+            )
+        else:
+            ocr_area = get_ocr_area(img.shape, bar_area, self.ocr_margin)
+        left, top, right, bottom = ocr_area
+        label_img = img[top:bottom, left:right]
+        label_value_list = [[pos - top, value] for pos, value in fvfm_value_list]
+        template_reader = TemplateReader()
+        template_reader.fit(label_img, label_value_list)
+        path = template_reader.save(path)
+        # Reader of old templates in the same path is not used any more.
+        clear_ocr_reader(path)
+        self.ocr_backend = "template"
+        self.ocr_template_path = path
+
     def set_param(self, **kwargs):
         """Set parameter.
 
@@ -231,5 +370,19 @@ class ExtractFvFm(ImageCore):
             Threshold of whtie background.
         bar_area_ratio : int
             Ratio of minimum bar size.
+        bar_margin : int
+            Percentage of width searched for bar from right and left edges.
+        ocr_margin : float
+            Margin around bar read by OCR, in multiples of bar width.
+        ocr_lang : str
+            Languages of OCR, separated by comma.
+        ocr_gpu : bool
+            If False, OCR uses only CPU.
+        ocr_num_thread : int
+            Number of threads of OCR. If 0, torch default.
+        ocr_backend : str
+            "easyocr" or "template".
+        ocr_template_path : str
+            Path of templates for "template".
         """
         super().set_param(**kwargs)
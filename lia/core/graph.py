@@ -12,9 +12,9 @@ class Graph:
 
         Parameters
         ----------
-        px : [[int, int, int], ...]
-            List of BGR values per pixel.
-        fvfm_value : [float, ...]
+        px : numpy.ndarray or [[int, int, int], ...]
+            BGR values per pixel, (N, 3).
+        fvfm_value : numpy.ndarray or [float, ...]
             Fv/Fm value corresponding to each pixel.
         name : str, optional
             Sample name
@@ -0,0 +1,114 @@
+import struct
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+def read_image_size(path):
+    """Read size of image from header of file without decoding it.
+
+    PNG and JPEG are supported. Width and height of JPEG are swapped if its
+    EXIF orientation is rotated, as cv2.imread does.
+
+    Parameters
+    ----------
+    path : str
+        Path of image file.
+
+    Returns
+    -------
+    size : (int, int) or None
+        Height and width of image. None if format is not supported.
+    """
+    with open(path, "rb") as f:
+        head = f.read(len(PNG_SIGNATURE))
+        if head == PNG_SIGNATURE:
+            # IHDR is the first chunk.
+            ihdr = f.read(16)
+            if (len(ihdr) < 16) or (ihdr[4:8] != b"IHDR"):
+                return None
+            width, height = struct.unpack(">II", ihdr[8:16])
+            return height, width
+        if head[:2] == b"\xff\xd8":
+            f.seek(2)
+            return _read_jpeg_size(f)
+    return None
+
+
+def _read_jpeg_size(f):
+    """Read size of JPEG from its segments before image data.
+
+    Parameters
+    ----------
+    f : file object
+        JPEG file positioned after SOI marker.
+
+    Returns
+    -------
+    size : (int, int) or None
+        Height and width of image. None if frame header is not found.
+    """
+    orientation = 1
+    while True:
+        marker = f.read(2)
+        if (len(marker) < 2) or (marker[0] != 0xFF):
+            return None
+        # Fill bytes before marker.
+        while marker[1] == 0xFF:
+            marker = marker[1:] + f.read(1)
+            if len(marker) < 2:
+                return None
+        if marker[1] in (0xD8, 0x01) or (0xD0 <= marker[1] <= 0xD7):
+            continue
+        if marker[1] in (0xD9, 0xDA):
+            # End of image or start of scan before frame header.
+            return None
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        segment = f.read(length - 2)
+        if len(segment) < length - 2:
+            return None
+        if (marker[1] == 0xE1) and segment.startswith(b"Exif\x00\x00"):
+            orientation = _get_exif_orientation(segment[6:])
+        elif marker[1] in JPEG_SOF_MARKERS:
+            if len(segment) < 5:
+                return None
+            height, width = struct.unpack(">HH", segment[1:5])
+            if orientation >= 5:
+                height, width = width, height
+            return height, width
+
+
+def _get_exif_orientation(tiff):
+    """Get orientation tag of EXIF.
+
+    Parameters
+    ----------
+    tiff : bytes
+        TIFF structure of EXIF.
+
+    Returns
+    -------
+    orientation : int
+        Orientation, from 1 to 8. 1 if not found.
+    """
+    if tiff[:2] == b"II":
+        order = "<"
+    elif tiff[:2] == b"MM":
+        order = ">"
+    else:
+        return 1
+    try:
+        ifd_offset = struct.unpack(order + "I", tiff[4:8])[0]
+        num_entries = struct.unpack(order + "H", tiff[ifd_offset : ifd_offset + 2])[0]
+        for i in range(num_entries):
+            start = ifd_offset + 2 + i * 12
+            tag, _, _ = struct.unpack(order + "HHI", tiff[start : start + 8])
+            if tag == EXIF_ORIENTATION_TAG:
+                return struct.unpack(order + "H", tiff[start + 8 : start + 10])[0]
+    except struct.error:
+        return 1
+    return 1
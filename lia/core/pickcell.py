@@ -1,21 +1,43 @@
 import os
+import tempfile
 from multiprocessing import Pool
 
 import numpy as np
 
+from lia.basic.get.image import get_bounding_mask
 from lia.basic.transform.to_array import to_color_array
-from lia.color.pickup import COLOR_THRESH1, COLOR_THRESH2, pickup_over_thresh
-from lia.color.search import search_closest_color
+from lia.color.grid import build_color_grid, query_color_grid
+from lia.color.pickup import (
+    COLOR_THRESH1,
+    COLOR_THRESH2,
+    get_over_thresh_mask,
+    pickup_over_thresh,
+)
+from lia.color.table import (
+    COLOR_TABLE_BITS,
+    build_color_table,
+    get_color_table_index,
+    load_color_table,
+    save_color_table,
+)
 from lia.core.base import ImageCore
 
+SHARED_MEMORY_DIR = "/dev/shm"
+TRANSPORT = "pickle"
+
 
 class Pickcell(ImageCore):
     """Pick up pixels in overlapping areas in two images.
 
+    Parameters
+    ----------
+    executor : multiprocessing.pool.Pool or concurrent.futures.Executor, optional
+        Worker pool used instead of own pool. It is not closed by Pickcell.
+
     Attributes
     ----------
     num_cpu : int
-        Number of CPU.
+        Number of worker processes.
     thr1 : int
         Threshold for color 1.
     thr2 : int
@@ -24,20 +46,68 @@ class Pickcell(ImageCore):
         List of Fv/Fm scale color.
     fvfm_value_list : [int, ...]
         List of fv/Fm scale value.
+    color_table : numpy.ndarray or None
+        Lookup table of Fv/Fm scale color. If None, search with color_grid.
+    color_grid : numpy.ndarray or None
+        Grid of Fv/Fm scale color for exact closest color search.
+    max_color_distance : int or None
+        Maximum L1 distance from Fv/Fm scale color. Pixels farther than this
+        from every scale color (glare, edge of leaf) are rejected.
+    transport : str
+        How pixels are passed to worker processes. "pickle" sends chunks of
+        pixels. "mmap" puts images and results in memory-mapped files, and
+        workers receive only offsets and write results in place.
+
+    Notes
+    -----
+    Worker pool is started at first use and reused by following calls, with
+    Fv/Fm scale color already loaded in workers. Close it by close() or use
+    Pickcell as context manager.
     """
 
-    def __init__(self):
+    def __init__(self, executor=None):
         self.num_cpu = os.cpu_count()
         self.thr1 = COLOR_THRESH1
         self.thr2 = COLOR_THRESH2
         self.fvfm_color_list = None
         self.fvfm_value_list = None
+        self.color_table = None
+        self.color_grid = None
+        self.max_color_distance = None
+        self.transport = TRANSPORT
+        self.__executor = executor
+        self.__pool = None
+        self.__pool_size = None
+        self.__pool_grid = None
+        self.__lookup_palette = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_Pickcell__executor"] = None
+        state["_Pickcell__pool"] = None
+        return state
+
+    def close(self):
+        """Close own worker pool."""
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool.join()
+            self.__pool = None
+            self.__pool_grid = None
 
     def set_param(self, **kwargs):
         """Set parameters.
 
         Parameters
         ----------
+        num_cpu : int
+            Number of worker processes.
         thr1 : int
             Threshold for color 1.
         thr2 : int
@@ -46,10 +116,63 @@ class Pickcell(ImageCore):
             List of Fv/Fm scale color.
         fvfm_value_list : [int, ...]
             List of fv/Fm scale value.
+        max_color_distance : int
+            Maximum L1 distance from Fv/Fm scale color.
+        transport : str
+            "pickle" or "mmap".
         """
         super().set_param(**kwargs)
 
-    def get_color_array(self, input1, input2):
+    def compile_color_table(self, bits=COLOR_TABLE_BITS, path=None):
+        """Compile Fv/Fm scale color into lookup table used by pick_fvfm.
+
+        Parameters
+        ----------
+        bits : int, optional
+            Bit depth of each channel of the table. 8 is exact, but takes
+            seconds and tens of MB for hundreds of colors. color_grid made by
+            pick_fvfm without table is also exact.
+        path : str, optional
+            Path of table file (.npz). Load it if exists, otherwise save to it.
+            If Fv/Fm scale color is set and the table in the file is made from
+            other color or bit depth, it is rebuilt and saved again.
+
+        Returns
+        -------
+        color_table : numpy.ndarray
+            Lookup table of Fv/Fm scale color.
+
+        Raises
+        ------
+        ValueError
+            If Fv/Fm scale color is not set.
+        """
+        table = None
+        if (path is not None) and os.path.isfile(path):
+            table, color_list, value_list = load_color_table(path)
+            if self.fvfm_color_list is None:
+                self.fvfm_color_list = color_list
+                self.fvfm_value_list = value_list
+            elif (
+                (table.shape[0] != 1 << bits)
+                or not np.array_equal(color_list, self.fvfm_color_list)
+                or not np.array_equal(value_list, self.fvfm_value_list)
+            ):
+                # Table made from other scale bar is not used.
+                table = None
+        if table is None:
+            if self.fvfm_color_list is None:
+                raise ValueError("Fv/Fm scale color is not set.")
+            table = build_color_table(self.fvfm_color_list, bits)
+            if path is not None:
+                save_color_table(
+                    path, table, self.fvfm_color_list, self.fvfm_value_list
+                )
+        self.color_table = table
+        self.__lookup_palette = _get_palette(self.fvfm_color_list)
+        return table
+
+    def get_color_array(self, input1, input2, mask=None):
         """Reshape image to 2D array for multiprocess.
 
         Parameters
@@ -58,22 +181,68 @@ class Pickcell(ImageCore):
             Input image 1.
         input2 : numpy.ndarray
             Input image 2.
+        mask : numpy.ndarray, optional
+            Binary image or contour of object in image 1.
 
         Returns
         -------
         px_colors : [[[int, int, int], [int, int, int]], ...]
-            Array of color 1 and color 2.
+            Array of color 1 and color 2, and mask of object if mask is given.
+        """
+        color1, color2, region = self.__get_region_array(input1, input2, mask)
+        colors1 = np.array_split(color1, self.num_cpu, axis=0)
+        colors2 = np.array_split(color2, self.num_cpu, axis=0)
+        if region is None:
+            px_colors = [[colors1[i], colors2[i]] for i in range(self.num_cpu)]
+        else:
+            regions = np.array_split(region, self.num_cpu, axis=0)
+            px_colors = [
+                [colors1[i], colors2[i], regions[i]] for i in range(self.num_cpu)
+            ]
+        return px_colors
+
+    def __get_region_array(self, input1, input2, mask=None):
+        """Reshape image in bounding rectangle of mask to array of color.
+
+        Parameters
+        ----------
+        input1 : numpy.ndarray or str
+            Input image 1 or its path.
+        input2 : numpy.ndarray or str
+            Input image 2 or its path.
+        mask : numpy.ndarray, optional
+            Binary image or contour of object in image 1.
+
+        Returns
+        -------
+        color1 : numpy.ndarray
+            Array of color 1.
+        color2 : numpy.ndarray
+            Array of color 2.
+        region : numpy.ndarray or None
+            Boolean array of pixels in object.
+
+        Raises
+        ------
+        ValueError
+            Size of images are different.
         """
         img1 = self.input_img(input1)
         img2 = self.input_img(input2)
+        if img1.shape[:2] != img2.shape[:2]:
+            raise ValueError("Image size are different.")
+        if mask is None:
+            region = None
+        else:
+            (x, y, width, height), bounding_mask = get_bounding_mask(mask, img1.shape)
+            img1 = img1[y : y + height, x : x + width]
+            img2 = img2[y : y + height, x : x + width]
+            region = to_color_array(bounding_mask)
         color1 = to_color_array(img1)
         color2 = to_color_array(img2)
-        colors1 = np.array_split(color1, self.num_cpu, axis=0)
-        colors2 = np.array_split(color2, self.num_cpu, axis=0)
-        px_colors = [[colors1[i], colors2[i]] for i in range(self.num_cpu)]
-        return px_colors
+        return color1, color2, region
 
-    def pick_color(self, input1, input2):
+    def pick_color(self, input1, input2, mask=None):
         """Pick up color of pixels above threshold in each image.
 
         Parameters
@@ -82,22 +251,35 @@ class Pickcell(ImageCore):
             Input image 1 or its path.
         input2 : numpy.ndarray or str
             Input image 2 or its path.
+        mask : numpy.ndarray, optional
+            Binary image or contour of object (leaf) in image 1. If given, only
+            pixels in its bounding rectangle are processed, and the mask is used
+            instead of threshold for color 1.
 
         Returns
         -------
-        pick_color1 : [[int, int, int], ...]
-            Array of colors 1 picked up.
-        pick_color2 : [[int, int, int], ...]
-            Array of colors 2 picked up.
+        pick_color1 : numpy.ndarray
+            Array of colors 1 picked up, (N, 3).
+        pick_color2 : numpy.ndarray
+            Array of colors 2 picked up, (N, 3).
         """
-        px_colors = self.get_color_array(input1, input2)
-        with Pool(self.num_cpu) as p:
-            pick_colors = p.map(self.pool_func_pickup_color, px_colors)
-        pick_color1 = [color for row in pick_colors for color in row[0]]
-        pick_color2 = [color for row in pick_colors for color in row[1]]
+        if self.transport == "mmap":
+            pick_color1, pick_color2, _, _ = self.__pick_mmap(input1, input2, mask)
+            return pick_color1, pick_color2
+        px_colors = self.get_color_array(input1, input2, mask)
+        pick_colors = self.__map(_pool_func_pickup, px_colors)
+        pick_color1 = np.concatenate([row[0] for row in pick_colors])
+        pick_color2 = np.concatenate([row[1] for row in pick_colors])
         return pick_color1, pick_color2
 
-    def pick_fvfm(self, leaf_img, fvfm_img, fvfm_color_list=None, fvfm_value_list=None):
+    def pick_fvfm(
+        self,
+        leaf_img,
+        fvfm_img,
+        fvfm_color_list=None,
+        fvfm_value_list=None,
+        mask=None,
+    ):
         """Pick up color of pixels above threshold in each image and its Fv/Fm value.
 
         Parameters
@@ -110,63 +292,402 @@ class Pickcell(ImageCore):
             List of Fv/Fm scale color.
         fvfm_value_list : [int, ...]
             List of Fv/Fm scale value.
+        mask : numpy.ndarray, optional
+            Binary image or contour of leaf. If given, only pixels in its
+            bounding rectangle are processed, and the mask is used instead of
+            threshold for leaf color.
 
         Returns
         -------
-        leaf_color : [[int, int, int], ...]
-            Array of leaf color picked up.
-        fvfm_color : [[int, int, int], ...]
-            Array of Fv/Fm scale color picked up.
-        fvfm_value : [int, ...]
-            Array of Fv/Fm scale value picked up.
+        leaf_color : numpy.ndarray
+            Array of leaf color picked up, (N, 3).
+        fvfm_color : numpy.ndarray
+            Array of Fv/Fm scale color picked up, (N, 3).
+        fvfm_value : numpy.ndarray
+            Array of Fv/Fm scale value picked up, (N,).
         """
         if fvfm_color_list is not None:
             self.fvfm_color_list = fvfm_color_list
         if fvfm_value_list is not None:
             self.fvfm_value_list = fvfm_value_list
-        px_colors = self.get_color_array(leaf_img, fvfm_img)
-        with Pool(self.num_cpu) as p:
-            results = p.map(self.pool_func_pickup_fvfm, px_colors)
-        leaf_color = [color for row in results for color in row[0]]
-        fvfm_color = [color for row in results for color in row[1]]
-        fvfm_value = [value for row in results for value in row[2]]
-        return leaf_color, fvfm_color, fvfm_value
+        self.__check_lookup()
+        if self.color_table is not None:
+            # Lookup of whole pixels is a single indexing, so only pick up in pool.
+            leaf_color, fvfm_color = self.pick_color(leaf_img, fvfm_img, mask)
+            idx = get_color_table_index(fvfm_color, self.color_table)
+            palette = np.asarray(self.fvfm_color_list, dtype=np.int32)
+            dist = np.abs(fvfm_color - palette[idx]).sum(axis=1)
+            return self.__select_fvfm(leaf_color, fvfm_color, idx, dist)
+        if self.color_grid is None:
+            self.color_grid = build_color_grid(self.fvfm_color_list)
+            self.__lookup_palette = _get_palette(self.fvfm_color_list)
+        if self.transport == "mmap":
+            results = self.__pick_mmap(leaf_img, fvfm_img, mask, search=True)
+            return self.__select_fvfm(*results)
+        px_colors = self.get_color_array(leaf_img, fvfm_img, mask)
+        results = self.__map(_pool_func_pickup, px_colors, search=True)
+        leaf_color = np.concatenate([row[0] for row in results])
+        fvfm_color = np.concatenate([row[1] for row in results])
+        idx = np.concatenate([row[2] for row in results])
+        dist = np.concatenate([row[3] for row in results])
+        return self.__select_fvfm(leaf_color, fvfm_color, idx, dist)
 
     def pool_func_pickup_color(self, args):
         """Multiprocessing function. Pick up color of pixels above threshold in each image.
 
         Parameters
         ----------
-        args : [[[int,int, int], [int, int, int]], ...]
-            Array of color 1 and color 2.
+        args : [numpy.ndarray, ...]
+            Array of color 1 and color 2 (and mask of object in color 1).
 
         Returns
         -------
-        Color1 : [[int, int, int], ...]
+        color1 : numpy.ndarray
             Array of color 1 picked up.
+        color2 : numpy.ndarray
+            Array of color 2 picked up.
         """
-        color1, color2 = pickup_over_thresh(*args, self.thr1, self.thr2)
-        return color1, color2
+        return _pool_func_pickup((args, self.thr1, self.thr2, False, None))
 
     def pool_func_pickup_fvfm(self, args):
         """Multiprocessing function. Pick up color of pixels above threshold in each image and its Fv/Fm value.
 
         Parameters
         ----------
-        args : [[[int, int, int], [int, int, int]], ...]
-            Array of leaf color 1 and Fv/Fm color 2.
+        args : [numpy.ndarray, ...]
+            Array of leaf color 1 and Fv/Fm color 2 (and mask of leaf).
 
         Returns
         -------
-        leaf_color : [[int, int, int], ...]
+        leaf_color : numpy.ndarray
             Array of leaf color picked up.
-        fvfm_color : [[int, int, int], ...]
+        fvfm_color : numpy.ndarray
             Array of Fv/Fm color picked up.
-        fvfm_value : [int, ...]
+        fvfm_value : numpy.ndarray
             Array of Fv/Fm value picked up.
         """
-        leaf_color, fvfm_color = pickup_over_thresh(*args, self.thr1, self.thr2)
-        _, fvfm_value = search_closest_color(
-            fvfm_color, self.fvfm_color_list, self.fvfm_value_list
-        )
+        self.__check_lookup()
+        if self.color_grid is None:
+            self.color_grid = build_color_grid(self.fvfm_color_list)
+            self.__lookup_palette = _get_palette(self.fvfm_color_list)
+        palette = (self.fvfm_color_list, self.color_grid)
+        results = _pool_func_pickup((args, self.thr1, self.thr2, True, palette))
+        return self.__select_fvfm(*results)
+
+    def __check_lookup(self):
+        """Reset lookup table and grid made from other Fv/Fm scale color.
+
+        Fv/Fm scale color may be changed by set_param or attribute, so lookup
+        data is kept with the color it is made from. Table or grid given
+        from outside is regarded as made from current color.
+        """
+        palette = _get_palette(self.fvfm_color_list)
+        if (self.color_table is None) and (self.color_grid is None):
+            self.__lookup_palette = None
+        elif self.__lookup_palette is None:
+            self.__lookup_palette = palette
+        elif not np.array_equal(palette, self.__lookup_palette):
+            self.color_table = None
+            self.color_grid = None
+            self.__lookup_palette = None
+
+    def __map(self, func, payloads, search=False):
+        """Run function in worker pool.
+
+        Parameters
+        ----------
+        func : function
+            Multiprocessing function.
+        payloads : list
+            Arguments of each task.
+        search : bool, optional
+            Whether search closest Fv/Fm scale color.
+
+        Returns
+        -------
+        results : list
+            Results of each task.
+        """
+        if self.__executor is not None:
+            pool = self.__executor
+            is_warm = False
+        else:
+            if (self.__pool is not None) and (
+                (self.__pool_size != self.num_cpu)
+                or (search and (self.__pool_grid is not self.color_grid))
+            ):
+                self.close()
+            if self.__pool is None:
+                self.__pool = Pool(
+                    self.num_cpu,
+                    initializer=_init_worker,
+                    initargs=(self.fvfm_color_list, self.color_grid),
+                )
+                self.__pool_size = self.num_cpu
+                self.__pool_grid = self.color_grid
+            pool = self.__pool
+            is_warm = True
+        if search and not is_warm:
+            palette = (self.fvfm_color_list, self.color_grid)
+        else:
+            palette = None
+        tasks = [
+            (payload, self.thr1, self.thr2, search, palette) for payload in payloads
+        ]
+        results = list(pool.map(func, tasks))
+        return results
+
+    def __pick_mmap(self, input1, input2, mask=None, search=False):
+        """Pick up pixels through memory-mapped files.
+
+        Parameters
+        ----------
+        input1 : numpy.ndarray or str
+            Input image 1 or its path.
+        input2 : numpy.ndarray or str
+            Input image 2 or its path.
+        mask : numpy.ndarray, optional
+            Binary image or contour of object in image 1.
+        search : bool, optional
+            Whether search closest Fv/Fm scale color of color 2.
+
+        Returns
+        -------
+        color1 : numpy.ndarray
+            Array of color 1 picked up.
+        color2 : numpy.ndarray
+            Array of color 2 picked up.
+        idx : numpy.ndarray or None
+            Index of closest Fv/Fm scale color.
+        dist : numpy.ndarray or None
+            L1 distance to closest Fv/Fm scale color.
+
+        Raises
+        ------
+        ValueError
+            Size of images are different.
+        """
+        color1, color2, region = self.__get_region_array(input1, input2, mask)
+        shared_dir = SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) else None
+        with tempfile.TemporaryDirectory(dir=shared_dir) as tmp_dir:
+            paths = {
+                name: os.path.join(tmp_dir, f"{name}.npy")
+                for name in ["color1", "color2", "region", "keep", "idx", "dist"]
+            }
+            color1 = _to_mmap(paths["color1"], color1)
+            color2 = _to_mmap(paths["color2"], color2)
+            length = color1.shape[0]
+            if region is None:
+                del paths["region"]
+            else:
+                _to_mmap(paths["region"], region)
+            keep = _open_mmap(paths["keep"], (length,), bool)
+            if search:
+                idx = _open_mmap(paths["idx"], (length,), np.int64)
+                dist = _open_mmap(paths["dist"], (length,), np.int32)
+            bounds = np.linspace(0, length, self.num_cpu + 1).astype(np.int64)
+            payloads = [(paths, bounds[i], bounds[i + 1]) for i in range(self.num_cpu)]
+            self.__map(_pool_func_mmap, payloads, search)
+            # Fancy indexing copies results out of the files before removal.
+            pick_color1 = color1[keep]
+            pick_color2 = color2[keep]
+            if search:
+                pick_idx = idx[keep]
+                pick_dist = dist[keep]
+            else:
+                pick_idx = None
+                pick_dist = None
+            del color1, color2, keep
+            if search:
+                del idx, dist
+        return pick_color1, pick_color2, pick_idx, pick_dist
+
+    def __select_fvfm(self, leaf_color, fvfm_color, idx, dist):
+        """Reject pixels far from Fv/Fm scale color and get their Fv/Fm value.
+
+        Parameters
+        ----------
+        leaf_color : numpy.ndarray
+            Array of leaf color.
+        fvfm_color : numpy.ndarray
+            Array of Fv/Fm color.
+        idx : numpy.ndarray
+            Index of closest Fv/Fm scale color.
+        dist : numpy.ndarray
+            L1 distance to closest Fv/Fm scale color.
+
+        Returns
+        -------
+        leaf_color : numpy.ndarray
+            Array of leaf color not rejected.
+        fvfm_color : numpy.ndarray
+            Array of Fv/Fm color not rejected.
+        fvfm_value : numpy.ndarray
+            Array of Fv/Fm value not rejected.
+        """
+        if self.max_color_distance is not None:
+            keep = dist <= self.max_color_distance
+            leaf_color = leaf_color[keep]
+            fvfm_color = fvfm_color[keep]
+            idx = idx[keep]
+        fvfm_value = np.asarray(self.fvfm_value_list, dtype=np.float64)[idx]
         return leaf_color, fvfm_color, fvfm_value
+
+
+def _to_mmap(path, array):
+    """Copy array to memory-mapped file.
+
+    Parameters
+    ----------
+    path : str
+        Path of file (.npy).
+    array : numpy.ndarray
+        Input array.
+
+    Returns
+    -------
+    mmap_array : numpy.memmap
+        Memory-mapped array.
+    """
+    mmap_array = _open_mmap(path, array.shape, array.dtype)
+    mmap_array[...] = array
+    return mmap_array
+
+
+def _open_mmap(path, shape, dtype):
+    """Create memory-mapped file.
+
+    Parameters
+    ----------
+    path : str
+        Path of file (.npy).
+    shape : tuple
+        Shape of array.
+    dtype : numpy.dtype
+        Data type of array.
+
+    Returns
+    -------
+    mmap_array : numpy.memmap
+        Memory-mapped array.
+    """
+    mmap_array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    return mmap_array
+
+
+def _get_palette(color_list):
+    """Copy Fv/Fm scale color to compare with later.
+
+    Parameters
+    ----------
+    color_list : [[int, int, int], ...] or None
+        List of Fv/Fm scale color.
+
+    Returns
+    -------
+    palette : numpy.ndarray
+        Array of Fv/Fm scale color, (N, 3).
+    """
+    palette = np.array(color_list, dtype=np.int32).reshape(-1, 3)
+    return palette
+
+
+_worker_state = {"color_list": None, "grid": None}
+
+
+def _init_worker(color_list, grid):
+    """Load Fv/Fm scale color in worker process of own pool.
+
+    Parameters
+    ----------
+    color_list : [[int, int, int], ...] or None
+        List of Fv/Fm scale color.
+    grid : numpy.ndarray or None
+        Grid of Fv/Fm scale color.
+    """
+    _worker_state["color_list"] = color_list
+    _worker_state["grid"] = grid
+
+
+def _search_in_worker(fvfm_color, palette=None):
+    """Search closest Fv/Fm scale color loaded in worker process.
+
+    Parameters
+    ----------
+    fvfm_color : numpy.ndarray
+        Array of Fv/Fm color.
+    palette : (list, numpy.ndarray), optional
+        Fv/Fm scale color and its grid sent with task. If None, those loaded
+        by _init_worker are used. Executor from outside may run tasks in
+        threads of parent process, so it must not share the global state.
+
+    Returns
+    -------
+    idx : numpy.ndarray
+        Index of closest Fv/Fm scale color.
+    dist : numpy.ndarray
+        L1 distance to closest Fv/Fm scale color.
+    """
+    if palette is None:
+        color_list, grid = _worker_state["color_list"], _worker_state["grid"]
+    else:
+        color_list, grid = palette
+    idx, dist = query_color_grid(fvfm_color, grid, color_list)
+    return idx, dist
+
+
+def _pool_func_pickup(args):
+    """Multiprocessing function. Pick up color of pixels above threshold in each image.
+
+    Parameters
+    ----------
+    args : ([numpy.ndarray, ...], int, int, bool, tuple or None)
+        Array of color 1 and color 2 (and mask of object in color 1),
+        threshold for color 1 and color 2,
+        whether search closest Fv/Fm scale color, and Fv/Fm scale color and
+        its grid if worker is not loaded with them.
+
+    Returns
+    -------
+    color1 : numpy.ndarray
+        Array of color 1 picked up.
+    color2 : numpy.ndarray
+        Array of color 2 picked up.
+    idx : numpy.ndarray, optional
+        Index of closest Fv/Fm scale color.
+    dist : numpy.ndarray, optional
+        L1 distance to closest Fv/Fm scale color.
+    """
+    colors, thr1, thr2, search, palette = args
+    color1, color2 = colors[:2]
+    region = colors[2] if len(colors) > 2 else None
+    color1, color2 = pickup_over_thresh(color1, color2, thr1, thr2, region)
+    if not search:
+        return color1, color2
+    idx, dist = _search_in_worker(color2, palette)
+    return color1, color2, idx, dist
+
+
+def _pool_func_mmap(args):
+    """Multiprocessing function. Pick up pixels in memory-mapped files in place.
+
+    Parameters
+    ----------
+    args : ((dict, int, int), int, int, bool, tuple or None)
+        Paths of files and start and stop of pixels, threshold for color 1 and
+        color 2, whether search closest Fv/Fm scale color, and Fv/Fm scale
+        color and its grid if worker is not loaded with them.
+    """
+    (paths, start, stop), thr1, thr2, search, palette = args
+    color1 = np.load(paths["color1"], mmap_mode="r")[start:stop]
+    color2 = np.load(paths["color2"], mmap_mode="r")[start:stop]
+    if "region" in paths:
+        region = np.load(paths["region"], mmap_mode="r")[start:stop]
+    else:
+        region = None
+    keep = get_over_thresh_mask(color1, color2, thr1, thr2, region)
+    np.load(paths["keep"], mmap_mode="r+")[start:stop] = keep
+    if search:
+        idx, dist = _search_in_worker(color2[keep], palette)
+        np.load(paths["idx"], mmap_mode="r+")[start:stop][keep] = idx
+        np.load(paths["dist"], mmap_mode="r+")[start:stop][keep] = dist
@@ -1 +1,8 @@
-from .add import add_hue
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".add": ("add_hue",),
+    },
+)
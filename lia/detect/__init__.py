@@ -1,2 +1,32 @@
-from .detect_fvfm import calculate_scale, get_bar_area, get_fvfm_list, read_fvfm_value
-from .detect_leaf import extract_leaf_by_color, extract_leaf_by_thresh
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".calib_fvfm": (
+            "FvFmCalibCache",
+            "get_bar_fingerprint",
+        ),
+        ".detect_fvfm": (
+            "calculate_scale",
+            "calibrate_fvfm",
+            "clear_ocr_reader",
+            "get_bar_area",
+            "get_fvfm_list",
+            "get_ocr_area",
+            "get_ocr_reader",
+            "get_template_reader",
+            "init_ocr_reader",
+            "read_bar_value",
+            "read_fvfm_value",
+        ),
+        ".detect_leaf": (
+            "extract_leaf_by_color",
+            "extract_leaf_by_thresh",
+        ),
+        ".template_ocr": (
+            "TemplateReader",
+            "load_template_reader",
+        ),
+    },
+)
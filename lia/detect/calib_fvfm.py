@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+MAX_CALIB_ENTRIES = 16
+CALIB_FORMAT_VERSION = 1
+
+
+class FvFmCalibCache:
+    """Cache of calibration of Fv/Fm scale bar.
+
+    Images exported by the same camera have the same scale bar, so its
+    calibration is reused. Image matches calibration if its scale bar and
+    labels at the same position have the same pixels. It is meant for a few
+    setups, and the least recently used one is removed over max_entries.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of json file. If it exists, calibration is loaded from it.
+    max_entries : int, optional
+        Max number of calibrations.
+
+    Attributes
+    ----------
+    path : str or None
+        Path of json file to be saved.
+    max_entries : int
+        Max number of calibrations.
+    entries : [dict, ...]
+        Calibrations made by calibrate_fvfm with "fingerprint", from least
+        recently used.
+    """
+
+    def __init__(self, path=None, max_entries=MAX_CALIB_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = []
+        if (path is not None) and os.path.isfile(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, img):
+        """Find calibration of scale bar of image.
+
+        Parameters
+        ----------
+        img : numpy.ndarray
+            Input image.
+
+        Returns
+        -------
+        calib : dict or None
+            Calibration. None if not found.
+        """
+        for i, calib in enumerate(self.entries):
+            if not list(img.shape[:2]) == calib["shape"]:
+                continue
+            if get_bar_fingerprint(img, calib["ocr_area"]) == calib["fingerprint"]:
+                self.entries.append(self.entries.pop(i))
+                return calib
+        return None
+
+    def add(self, img, calib):
+        """Add calibration of image.
+
+        Parameters
+        ----------
+        img : numpy.ndarray
+            Input image used for calibration.
+        calib : dict
+            Calibration made by calibrate_fvfm.
+        """
+        calib = dict(calib)
+        calib["fingerprint"] = get_bar_fingerprint(img, calib["ocr_area"])
+        self.entries.append(calib)
+        del self.entries[: -self.max_entries]
+
+    def clear(self):
+        """Remove all calibrations."""
+        self.entries = []
+
+    def load(self, path):
+        """Load calibrations.
+
+        Parameters
+        ----------
+        path : str
+            Path of json file.
+
+        Raises
+        ------
+        ValueError
+            If file is not calibration of this version, or its entry lacks
+            "shape", "ocr_area" or "fingerprint".
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if not (isinstance(data, dict) and "entries" in data):
+            raise ValueError(f"Invalid calibration file: {path}")
+        version = data.get("version")
+        if not version == CALIB_FORMAT_VERSION:
+            raise ValueError(
+                f"Invalid calibration version: {version} in {path}\n"
+                f"Please calibrate again with version {CALIB_FORMAT_VERSION}."
+            )
+        for i, calib in enumerate(data["entries"]):
+            if not _is_valid_entry(calib):
+                raise ValueError(f"Invalid calibration entry: {i} in {path}")
+        self.entries = data["entries"][-self.max_entries :]
+
+    def save(self, path=None):
+        """Save calibrations.
+
+        Parameters
+        ----------
+        path : str, optional
+            Path of json file. If None, path given at creation.
+
+        Raises
+        ------
+        ValueError
+            If no path.
+        """
+        if path is None:
+            path = self.path
+        if path is None:
+            raise ValueError("No path to save calibration.")
+        data = {"version": CALIB_FORMAT_VERSION, "entries": self.entries}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+
+def _is_valid_entry(calib):
+    """Check keys used to match image to calibration.
+
+    Parameters
+    ----------
+    calib : dict
+        Calibration loaded from file.
+
+    Returns
+    -------
+    is_valid : bool
+        Whether it has "shape", "ocr_area" and "fingerprint" of right form.
+    """
+    if not isinstance(calib, dict):
+        return False
+    shape = calib.get("shape")
+    ocr_area = calib.get("ocr_area")
+    return (
+        isinstance(shape, list)
+        and (len(shape) == 2)
+        and isinstance(ocr_area, list)
+        and (len(ocr_area) == 4)
+        and all(isinstance(x, int) for x in shape + ocr_area)
+        and isinstance(calib.get("fingerprint"), str)
+    )
+
+
+def get_bar_fingerprint(img, ocr_area):
+    """Get hash of scale bar and its labels.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image.
+    ocr_area : [int, int, int, int]
+        Area of scale bar and labels, (left, top, right, bottom).
+
+    Returns
+    -------
+    fingerprint : str
+        Hash of pixels of the area.
+    """
+    left, top, right, bottom = ocr_area
+    crop = np.ascontiguousarray(img[top:bottom, left:right])
+    digest = hashlib.blake2b(crop.tobytes(), digest_size=16)
+    digest.update(str(crop.shape).encode())
+    return digest.hexdigest()
@@ -1,6 +1,7 @@
 import itertools
 import re
 import statistics
+import threading
 
 import cv2
 import numpy as np
@@ -8,17 +9,117 @@ import numpy as np
 from lia.basic.get._consts import WHITE_INV_THRESH
 from lia.basic.get.cnts import get_cnts
 from lia.basic.get.image import get_white_bg_binary_img
+from lia.detect.template_ocr import load_template_reader
 
 BAR_AREA_RATIO = 100
+BAR_MARGIN = 50
+# Labels of scale bar are usually "0.00" about twice as wide as bar. If they
+# are wider and not found, whole image is read.
+OCR_MARGIN = 3
+OCR_LANG = "en"
+OCR_GPU = False
+OCR_NUM_THREAD = 0
+OCR_BACKEND = "easyocr"
 
+# OCR readers shared in process for each settings.
+_readers = {}
+_reader_lock = threading.Lock()
 
-def read_fvfm_value(img):
+
+def get_ocr_reader(lang=OCR_LANG, gpu=OCR_GPU, num_thread=OCR_NUM_THREAD):
+    """Get OCR reader shared in process.
+
+    Reader is made on first call for each settings and reused, because
+    loading its models takes several seconds.
+
+    Parameters
+    ----------
+    lang : str, optional
+        Languages of text, separated by comma.
+    gpu : bool, optional
+        If False, use only CPU.
+    num_thread : int, optional
+        Number of threads of torch. If 0, torch default.
+
+    Returns
+    -------
+    reader : easyocr.Reader
+        OCR reader.
+    """
+    key = (lang, gpu, num_thread)
+    with _reader_lock:
+        if key not in _readers:
+            import easyocr
+
+            if num_thread > 0:
+                import torch
+
+                torch.set_num_threads(num_thread)
+            _readers[key] = easyocr.Reader(lang.split(","), gpu=gpu, verbose=False)
+        return _readers[key]
+
+
+def get_template_reader(path):
+    """Get reader by templates shared in process.
+
+    Parameters
+    ----------
+    path : str
+        Path of templates saved by TemplateReader.save.
+
+    Returns
+    -------
+    reader : TemplateReader
+        Reader with the templates.
+    """
+    key = ("template", path)
+    with _reader_lock:
+        if key not in _readers:
+            _readers[key] = load_template_reader(path)
+        return _readers[key]
+
+
+def init_ocr_reader(lang=OCR_LANG, gpu=OCR_GPU, num_thread=OCR_NUM_THREAD):
+    """Make OCR reader in advance, e.g. as initializer of pool workers.
+
+    Parameters
+    ----------
+    lang : str, optional
+        Languages of text, separated by comma.
+    gpu : bool, optional
+        If False, use only CPU.
+    num_thread : int, optional
+        Number of threads of torch. If 0, torch default.
+    """
+    get_ocr_reader(lang, gpu, num_thread)
+
+
+def clear_ocr_reader(template_path=None):
+    """Release OCR readers shared in process.
+
+    Parameters
+    ----------
+    template_path : str, optional
+        If given, release only reader by the templates, e.g. after they are
+        saved again.
+    """
+    with _reader_lock:
+        if template_path is None:
+            _readers.clear()
+        else:
+            _readers.pop(("template", template_path), None)
+
+
+def read_fvfm_value(img, reader=None):
     """Read Fv/Fm value from image.
 
     Parameters
     ----------
     img : numpy.ndarray
         Input image.
+    reader : easyocr.Reader or TemplateReader or function, optional
+        OCR reader, or function returning it. If None, reader shared in
+        process with default settings.
 
     Returns
     -------
@@ -30,9 +131,10 @@ def read_fvfm_value(img):
     ValueError
         If less than 2 value.
     """
-    import easyocr
-
-    reader = easyocr.Reader(["en"])
+    if reader is None:
+        reader = get_ocr_reader()
+    elif not hasattr(reader, "readtext"):
+        reader = reader()
     text = reader.readtext(img)
     fvfm_value_list = []
     for word in text:
@@ -78,7 +180,12 @@ def calculate_scale(fvfm_value_list):
         raise ValueError("Cannot calculate scale. Not enough value.")
 
 
-def get_bar_area(img, white_inv_thresh=WHITE_INV_THRESH, bar_area_ratio=BAR_AREA_RATIO):
+def get_bar_area(
+    img,
+    white_inv_thresh=WHITE_INV_THRESH,
+    bar_area_ratio=BAR_AREA_RATIO,
+    bar_margin=BAR_MARGIN,
+):
     """Get Fv/Fm scale bar.
 
     Parameters
@@ -89,6 +196,9 @@ def get_bar_area(img, white_inv_thresh=WHITE_INV_THRESH, bar_area_ratio=BAR_AREA
         Threshold of white background.
     bar_area_ratio : int, optional
         Ratio of minimum bar size.
+    bar_margin : int, optional
+        Percentage of width searched from right and left edges. Bar should be
+        inside it. If 50 or more, whole image is searched.
 
     Returns
     -------
@@ -100,20 +210,104 @@ def get_bar_area(img, white_inv_thresh=WHITE_INV_THRESH, bar_area_ratio=BAR_AREA
     ValueError
         Cannot find scale bar.
     """
-    binary_img = get_white_bg_binary_img(img, white_inv_thresh)
-    cnts = get_cnts(binary_img, bar_area_ratio)
-    img_height = img.shape[0]
-    for cnt in cnts:
-        x, y, width, height = cv2.boundingRect(cnt)
-        ratio = height / width
-        occupancy = height / img_height
-        if (ratio > 0.7) and (occupancy > 0.8):
-            return [x, y, width, height]
+    img_height, img_width = img.shape[:2]
+    margin = max(int(img_width * bar_margin / 100), 1)
+    if margin * 2 >= img_width:
+        strips = [(0, img_width)]
+    else:
+        strips = [(img_width - margin, img_width), (0, margin)]
+    for left, right in strips:
+        binary_img = get_white_bg_binary_img(img[:, left:right], white_inv_thresh)
+        # Minimum area is the same as in whole image.
+        cnts = get_cnts(binary_img, bar_area_ratio * (right - left) / img_width)
+        for cnt in cnts:
+            x, y, width, height = cv2.boundingRect(cnt)
+            ratio = height / width
+            occupancy = height / img_height
+            if (ratio > 0.7) and (occupancy > 0.8):
+                return [x + left, y, width, height]
     raise ValueError("Cannot find scalebar.")
 
 
+def get_ocr_area(img_shape, bar_area, ocr_margin=OCR_MARGIN):
+    """Get area of labels around scale bar.
+
+    Parameters
+    ----------
+    img_shape : (int, int)
+        Shape of image, (height, width).
+    bar_area : [int, int, int, int]
+        Bar area rectangle.
+    ocr_margin : float, optional
+        Margin around bar including labels, in multiples of bar width.
+        Labels at both ends of bar stick out vertically.
+
+    Returns
+    -------
+    ocr_area : [int, int, int, int]
+        Left, top, right and bottom (not included) of area.
+    """
+    img_height, img_width = img_shape[:2]
+    x, y, width, height = bar_area
+    margin = ocr_margin * width
+    left = max(int(x - margin), 0)
+    top = max(int(y - margin), 0)
+    right = min(int(np.ceil(x + width + margin)), img_width)
+    bottom = min(int(np.ceil(y + height + margin)), img_height)
+    return [left, top, right, bottom]
+
+
+def read_bar_value(img, bar_area, ocr_margin=OCR_MARGIN, reader=None):
+    """Read Fv/Fm value of labels around scale bar.
+
+    Only area of labels is read. If labels are not found in it, e.g. they
+    are wider than margin, whole image is read.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image.
+    bar_area : [int, int, int, int]
+        Bar area rectangle.
+    ocr_margin : float, optional
+        Margin around bar including labels, in multiples of bar width.
+    reader : easyocr.Reader or TemplateReader or function, optional
+        OCR reader, or function returning it which is called only if OCR is
+        needed. If None, reader shared in process with default settings.
+
+    Returns
+    -------
+    fvfm_value_list : [[float, int], ...]
+        List of position height in image and Fv/Fm value.
+    ocr_area : [int, int, int, int]
+        Left, top, right and bottom of area read.
+
+    Raises
+    ------
+    ValueError
+        If less than 2 value.
+    """
+    left, top, right, bottom = get_ocr_area(img.shape, bar_area, ocr_margin)
+    try:
+        fvfm_value_list = read_fvfm_value(img[top:bottom, left:right], reader)
+    except ValueError:
+        img_height, img_width = img.shape[:2]
+        if [left, top, right, bottom] == [0, 0, img_width, img_height]:
+            raise
+        fvfm_value_list = read_fvfm_value(img, reader)
+        return fvfm_value_list, [0, 0, img_width, img_height]
+    fvfm_value_list = [[pos + top, value] for pos, value in fvfm_value_list]
+    return fvfm_value_list, [left, top, right, bottom]
+
+
 def get_fvfm_list(
-    img, white_inv_thresh=WHITE_INV_THRESH, bar_area_ratio=BAR_AREA_RATIO
+    img,
+    white_inv_thresh=WHITE_INV_THRESH,
+    bar_area_ratio=BAR_AREA_RATIO,
+    bar_margin=BAR_MARGIN,
+    ocr_margin=OCR_MARGIN,
+    reader=None,
+    cache=None,
 ):
     """Get list of color and Fv/Fm value.
 
@@ -121,6 +315,20 @@ def get_fvfm_list(
     ----------
     img : numpy.ndarray
         Input image.
+    white_inv_thresh : int, optional
+        Threshold of white background.
+    bar_area_ratio : int, optional
+        Ratio of minimum bar size.
+    bar_margin : int, optional
+        Percentage of width searched for bar from right and left edges.
+    ocr_margin : float, optional
+        Margin around bar read by OCR, in multiples of bar width.
+    reader : easyocr.Reader or TemplateReader or function, optional
+        OCR reader, or function returning it which is called only if OCR is
+        needed. If None, reader shared in process with default settings.
+    cache : FvFmCalibCache, optional
+        Cache of calibration. If scale bar of image is in it, detection of bar
+        and OCR are skipped. Otherwise new calibration is added.
 
     Returns
     -------
@@ -134,11 +342,63 @@ def get_fvfm_list(
     ValueError
         Cannot get Fv/Fm value.
     """
-    bar_area = get_bar_area(img, white_inv_thresh, bar_area_ratio)
+    calib = None
+    if cache is not None:
+        calib = cache.lookup(img)
+    if calib is None:
+        calib = calibrate_fvfm(
+            img, white_inv_thresh, bar_area_ratio, bar_margin, ocr_margin, reader
+        )
+        if cache is not None:
+            cache.add(img, calib)
+    return calib["fvfm_color_list"], calib["fvfm_value_list"]
+
+
+def calibrate_fvfm(
+    img,
+    white_inv_thresh=WHITE_INV_THRESH,
+    bar_area_ratio=BAR_AREA_RATIO,
+    bar_margin=BAR_MARGIN,
+    ocr_margin=OCR_MARGIN,
+    reader=None,
+):
+    """Detect scale bar and read its values.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image.
+    white_inv_thresh : int, optional
+        Threshold of white background.
+    bar_area_ratio : int, optional
+        Ratio of minimum bar size.
+    bar_margin : int, optional
+        Percentage of width searched for bar from right and left edges.
+    ocr_margin : float, optional
+        Margin around bar read by OCR, in multiples of bar width.
+    reader : easyocr.Reader or TemplateReader or function, optional
+        OCR reader, or function returning it which is called only if OCR is
+        needed. If None, reader shared in process with default settings.
+
+    Returns
+    -------
+    calib : dict
+        "shape" of image (height, width), "bar_area" rectangle, "ocr_area"
+        read by OCR (left, top, right, bottom), which is whole image if
+        labels are not found around bar, "value_positions" read by
+        OCR, "scale", and "fvfm_color_list" and "fvfm_value_list" as
+        get_fvfm_list.
+
+    Raises
+    ------
+    ValueError
+        Cannot get Fv/Fm value.
+    """
+    bar_area = get_bar_area(img, white_inv_thresh, bar_area_ratio, bar_margin)
     top = bar_area[1]
     bottom = bar_area[1] + bar_area[3]
     center_x = int(bar_area[0] + (bar_area[2] / 2))
-    fvfm_value_list = read_fvfm_value(img)
+    fvfm_value_list, ocr_area = read_bar_value(img, bar_area, ocr_margin, reader)
     std_fvfm_pos_y = fvfm_value_list[0][0]
     std_fvfm_val = int(fvfm_value_list[0][1] * 1000)
     scale_fvfm_list = [[x[0], int(x[1] * 1000)] for x in fvfm_value_list]
@@ -158,8 +418,15 @@ def get_fvfm_list(
         fvfm_list.append([color, fvfm_value / 1000])
     if len(fvfm_list) > 0:
         fvfm_list.sort(key=lambda x: x[1], reverse=True)
-        fvfm_color_list = [x[0] for x in fvfm_list]
-        fvfm_value_list = [x[1] for x in fvfm_list]
-        return fvfm_color_list, fvfm_value_list
+        calib = {
+            "shape": list(img.shape[:2]),
+            "bar_area": bar_area,
+            "ocr_area": ocr_area,
+            "value_positions": fvfm_value_list,
+            "scale": scale,
+            "fvfm_color_list": [x[0] for x in fvfm_list],
+            "fvfm_value_list": [x[1] for x in fvfm_list],
+        }
+        return calib
     else:
         raise ValueError("Cannot get Fv/Fm value.")
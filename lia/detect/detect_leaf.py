@@ -1,5 +1,9 @@
 """Extract leaf from an image."""
 
+from functools import partial
+
+import cv2
+
 from lia.basic.evaluate import background
 from lia.basic.evaluate._consts import CANNY_THRESH1, CANNY_THRESH2, NOISE_THRESH
 from lia.basic.get._consts import (
@@ -11,6 +15,7 @@ from lia.basic.get._consts import (
     LEAF_COLOR_UPPER,
     MIN_CNTS_RATIO,
     NOISE_RATIO_THRESH,
+    REDUCTION,
     THRESH,
     WHITE_BG_THRESH,
 )
@@ -18,6 +23,7 @@ from lia.basic.get.cnts import get_cnts, get_cnts_from_hsv, get_cnts_white_backg
 from lia.basic.get.difference import get_diff_ellipse
 from lia.basic.get.image import get_in_color_range
 from lia.basic.get.object import get_center_object
+from lia.basic.transform.reduce import reduce_img, refine_cnt
 
 
 def extract_leaf_by_thresh(
@@ -32,6 +38,7 @@ def extract_leaf_by_thresh(
     diff_ellipse_size=DIFF_ELLIPSE_SIZE,
     beyond_error_ellipse=BEYOND_ERROR_ELLIPSE,
     white_bg_thresh=WHITE_BG_THRESH,
+    reduction=REDUCTION,
 ):
     """Extract contours of leaf from an image by using threshold.
 
@@ -55,6 +62,9 @@ def extract_leaf_by_thresh(
         Threshold for contours of noise.
     white_bg_threshold : int
         Threshold of binarization for white background.
+    reduction : int, optional
+        Leaf is detected in image reduced by this factor, e.g. 2, 4 or 8, and
+        its contour is refined in full resolution.
 
     Returns
     -------
@@ -68,8 +78,11 @@ def extract_leaf_by_thresh(
     ValueError
         If leaf shape contours could not be detected.
     """
+    full_img = img
+    img = reduce_img(full_img, reduction)
     # Check background color.
-    if background.is_background_black(img):
+    is_black = background.is_background_black(img)
+    if is_black:
         # Sort H, S, and V in order of clarity of leaf outline, and find contours from each
         cnts_list = get_cnts_from_hsv(
             img,
@@ -107,6 +120,16 @@ def extract_leaf_by_thresh(
             leaf_candidates.append(cnt)
     if len(leaf_candidates) == 0:
         raise ValueError("Leaf shape contours could not be detected.")
+    if reduction > 1:
+        binarize = partial(
+            _get_thresh_binary_imgs,
+            is_black=is_black,
+            thresh=thresh,
+            white_bg_thresh=white_bg_thresh,
+        )
+        leaf_candidates = [
+            refine_cnt(full_img, cnt, reduction, binarize) for cnt in leaf_candidates
+        ]
     return leaf_candidates
 
 
@@ -116,6 +139,7 @@ def extract_leaf_by_color(
     upper=LEAF_COLOR_UPPER,
     color_format=LEAF_COLOR_FORMAT,
     min_cnts_ratio=MIN_CNTS_RATIO,
+    reduction=REDUCTION,
 ):
     """Extract leaf from image by color range.
 
@@ -129,6 +153,9 @@ def extract_leaf_by_color(
         Upper of color.
     color_format : str, optional
         Color format, HSV or RGB.
+    reduction : int, optional
+        Leaf is detected in image reduced by this factor, e.g. 2, 4 or 8, and
+        its contour is refined in full resolution.
 
     Returns
     -------
@@ -140,7 +167,69 @@ def extract_leaf_by_color(
     ValueError
         If invalid color format.
     """
-    mask = get_in_color_range(img, lower=lower, upper=upper, color_format=color_format)
+    reduced_img = reduce_img(img, reduction)
+    mask = get_in_color_range(
+        reduced_img, lower=lower, upper=upper, color_format=color_format
+    )
     cnts = get_cnts(mask, min_cnts_ratio=min_cnts_ratio)
-    center = get_center_object(img, cnts)
+    center = get_center_object(reduced_img, cnts)
+    if reduction > 1:
+        binarize = partial(
+            _get_color_binary_imgs, lower=lower, upper=upper, color_format=color_format
+        )
+        center = refine_cnt(img, center, reduction, binarize)
     return center
+
+
+def _get_thresh_binary_imgs(img, is_black, thresh, white_bg_thresh):
+    """Binarize image in the same way as extract_leaf_by_thresh.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image.
+    is_black : bool
+        Whether background is black.
+    thresh : int
+        Threshold of H, S and V for black background.
+    white_bg_thresh : int
+        Threshold of binarization for white background.
+
+    Returns
+    -------
+    binary_imgs : [numpy.ndarray, ...]
+        Binary images of H, S and V for black background, or one for white.
+    """
+    if is_black:
+        img_hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+        return [
+            cv2.threshold(image, thresh, 255, cv2.THRESH_BINARY)[1]
+            for image in cv2.split(img_hsv)
+        ]
+    img_gray_inv = cv2.bitwise_not(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+    _, binary_img = cv2.threshold(img_gray_inv, white_bg_thresh, 255, cv2.THRESH_BINARY)
+    return [binary_img]
+
+
+def _get_color_binary_imgs(img, lower, upper, color_format):
+    """Binarize image in the same way as extract_leaf_by_color.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image.
+    lower : (int, int, int)
+        Lower of color.
+    upper : (int, int, int)
+        Upper of color.
+    color_format : str
+        Color format, HSV or RGB.
+
+    Returns
+    -------
+    binary_imgs : [numpy.ndarray]
+        Mask in color range.
+    """
+    return [
+        get_in_color_range(img, lower=lower, upper=upper, color_format=color_format)
+    ]
@@ -0,0 +1,309 @@
+import os
+
+import cv2
+import numpy as np
+
+TEXT_THRESH = 128
+TEXT_SAT_THRESH = 64
+GLYPH_SIZE = 16
+MAX_GLYPH_RATIO = 2
+MIN_GLYPH_AREA = 2
+POINT_RATIO = 0.4
+WORD_GAP_RATIO = 0.5
+
+
+class TemplateReader:
+    """Reader of labels by matching glyphs with templates.
+
+    Templates are learned from labels of one image by fit, so torch and
+    easyocr are not needed. Characters not in the labels cannot be read.
+    readtext returns the same format as easyocr.
+
+    Parameters
+    ----------
+    templates : dict, optional
+        Template image of each character, (GLYPH_SIZE, GLYPH_SIZE).
+    text_thresh : int, optional
+        Pixels darker than this are regarded as text.
+    text_sat_thresh : int, optional
+        Pixels more saturated than this are not text, e.g. color bar.
+
+    Attributes
+    ----------
+    templates : dict
+        Template image of each character.
+    """
+
+    def __init__(
+        self, templates=None, text_thresh=TEXT_THRESH, text_sat_thresh=TEXT_SAT_THRESH
+    ):
+        self.templates = {} if templates is None else dict(templates)
+        self.text_thresh = text_thresh
+        self.text_sat_thresh = text_sat_thresh
+
+    def fit(self, img, fvfm_value_list):
+        """Learn templates from labels of image.
+
+        Parameters
+        ----------
+        img : numpy.ndarray
+            Input image of labels.
+        fvfm_value_list : [[float, float], ...]
+            List of position height and Fv/Fm value, as read_fvfm_value.
+
+        Raises
+        ------
+        ValueError
+            If no label is found.
+        """
+        words = self.__get_words(img)
+        glyphs = {}
+        for pos, value in fvfm_value_list:
+            text = f"{value:.2f}"
+            candidates = [word for word in words if len(word) == len(text)]
+            if len(candidates) == 0:
+                continue
+            word = min(candidates, key=lambda x: abs(_get_center(x) - pos))
+            for char, glyph in zip(text, word):
+                if char == ".":
+                    continue
+                glyphs.setdefault(char, []).append(glyph["img"])
+        if len(glyphs) == 0:
+            raise ValueError("Cannot find label.")
+        for char, imgs in glyphs.items():
+            self.templates[char] = np.mean(imgs, axis=0).astype(np.float32)
+
+    def readtext(self, img):
+        """Read words of image.
+
+        Parameters
+        ----------
+        img : numpy.ndarray
+            Input image.
+
+        Returns
+        -------
+        text : [([[int, int], ...], str, float), ...]
+            Box of four corners, text and confidence of each word.
+        """
+        text = []
+        for word in self.__get_words(img):
+            left = int(min(glyph["rect"][0] for glyph in word))
+            top = int(min(glyph["rect"][1] for glyph in word))
+            right = int(max(glyph["rect"][0] + glyph["rect"][2] for glyph in word))
+            bottom = int(max(glyph["rect"][1] + glyph["rect"][3] for glyph in word))
+            word_height = bottom - top
+            chars = []
+            scores = []
+            for glyph in word:
+                if glyph["rect"][3] < word_height * POINT_RATIO:
+                    chars.append(".")
+                    continue
+                char, score = self.__match(glyph["img"])
+                chars.append(char)
+                scores.append(score)
+            box = [[left, top], [right, top], [right, bottom], [left, bottom]]
+            confidence = float(min(scores)) if len(scores) > 0 else 0.0
+            text.append((box, "".join(chars), confidence))
+        return text
+
+    def save(self, path):
+        """Save templates and thresholds.
+
+        Parameters
+        ----------
+        path : str
+            Output path. ".npz" is added if it does not end with it.
+
+        Returns
+        -------
+        path : str
+            Path of saved file.
+        """
+        path = os.fspath(path)
+        if not path.endswith(".npz"):
+            path += ".npz"
+        # Names of thresholds are longer than a character of templates.
+        np.savez(
+            path,
+            text_thresh=self.text_thresh,
+            text_sat_thresh=self.text_sat_thresh,
+            **self.templates,
+        )
+        return path
+
+    def __match(self, glyph_img):
+        """Find character of the most similar template.
+
+        Parameters
+        ----------
+        glyph_img : numpy.ndarray
+            Normalized glyph image.
+
+        Returns
+        -------
+        char : str
+            Character. Empty if no template.
+        score : float
+            Correlation with template.
+        """
+        best_char, best_score = "", -1.0
+        for char, template in self.templates.items():
+            score = cv2.matchTemplate(glyph_img, template, cv2.TM_CCOEFF_NORMED)
+            score = float(score[0][0])
+            if score > best_score:
+                best_char, best_score = char, score
+        return best_char, best_score
+
+    def __get_words(self, img):
+        """Segment glyphs and group them into words.
+
+        Parameters
+        ----------
+        img : numpy.ndarray
+            Input image.
+
+        Returns
+        -------
+        words : [[dict, ...], ...]
+            Glyphs of each word from left, with "rect" (x, y, width, height)
+            and normalized "img".
+        """
+        binary_img = _get_text_binary_img(img, self.text_thresh, self.text_sat_thresh)
+        num, _, stats, _ = cv2.connectedComponentsWithStats(binary_img, connectivity=8)
+        stats = stats[1:num]
+        stats = stats[stats[:, cv2.CC_STAT_AREA] >= MIN_GLYPH_AREA]
+        if len(stats) == 0:
+            return []
+        # Most of components are digits. Taller ones are not glyph, e.g. part
+        # of color bar.
+        glyph_height = np.median(stats[:, cv2.CC_STAT_HEIGHT])
+        glyphs = []
+        for x, y, width, height, _ in stats:
+            if height > glyph_height * MAX_GLYPH_RATIO:
+                continue
+            glyph_img = binary_img[y : y + height, x : x + width]
+            glyphs.append(
+                {"rect": (x, y, width, height), "img": _normalize_glyph(glyph_img)}
+            )
+        # Glyphs overlapping vertically are in the same line.
+        glyphs.sort(key=lambda x: x["rect"][1])
+        lines = []
+        bottom = -1
+        for glyph in glyphs:
+            x, y, width, height = glyph["rect"]
+            if y >= bottom:
+                lines.append([])
+            lines[-1].append(glyph)
+            bottom = max(bottom, y + height)
+        # Wide gap separates words, e.g. label and part of color bar.
+        words = []
+        for line in lines:
+            line.sort(key=lambda x: x["rect"][0])
+            max_gap = glyph_height * WORD_GAP_RATIO
+            right = None
+            for glyph in line:
+                x, y, width, height = glyph["rect"]
+                if (right is None) or (x - right > max_gap):
+                    words.append([])
+                words[-1].append(glyph)
+                right = x + width if right is None else max(right, x + width)
+        return words
+
+
+def load_template_reader(path):
+    """Load reader from templates saved by TemplateReader.save.
+
+    Parameters
+    ----------
+    path : str
+        Path of templates (.npz).
+
+    Returns
+    -------
+    reader : TemplateReader
+        Reader with the templates and thresholds.
+    """
+    with np.load(path) as data:
+        templates = {char: data[char] for char in data.files if len(char) == 1}
+        # Files saved without thresholds use default ones.
+        text_thresh = int(data.get("text_thresh", TEXT_THRESH))
+        text_sat_thresh = int(data.get("text_sat_thresh", TEXT_SAT_THRESH))
+    return TemplateReader(templates, text_thresh, text_sat_thresh)
+
+
+def _get_text_binary_img(img, text_thresh, text_sat_thresh):
+    """Get binary image of dark and gray text.
+
+    Parameters
+    ----------
+    img : numpy.ndarray
+        Input image.
+    text_thresh : int
+        Pixels darker than this are regarded as text.
+    text_sat_thresh : int
+        Pixels more saturated than this are not text.
+
+    Returns
+    -------
+    binary_img : numpy.ndarray
+        Binary image of text.
+    """
+    if img.ndim == 2:
+        gray_img = img
+        gray_mask = np.full(img.shape, True)
+    else:
+        gray_img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        sat_img = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)[:, :, 1]
+        gray_mask = sat_img <= text_sat_thresh
+    binary_img = ((gray_img < text_thresh) & gray_mask).astype(np.uint8) * 255
+    return binary_img
+
+
+def _normalize_glyph(glyph_img):
+    """Pad glyph to square keeping aspect ratio and resize it.
+
+    Parameters
+    ----------
+    glyph_img : numpy.ndarray
+        Binary image of a glyph.
+
+    Returns
+    -------
+    norm_img : numpy.ndarray
+        Glyph image, (GLYPH_SIZE, GLYPH_SIZE) in float32.
+    """
+    height, width = glyph_img.shape[:2]
+    size = max(height, width)
+    top = (size - height) // 2
+    left = (size - width) // 2
+    square_img = cv2.copyMakeBorder(
+        glyph_img,
+        top,
+        size - height - top,
+        left,
+        size - width - left,
+        cv2.BORDER_CONSTANT,
+    )
+    norm_img = cv2.resize(
+        square_img, (GLYPH_SIZE, GLYPH_SIZE), interpolation=cv2.INTER_AREA
+    )
+    return norm_img.astype(np.float32)
+
+
+def _get_center(word):
+    """Get vertical center of word.
+
+    Parameters
+    ----------
+    word : [dict, ...]
+        Glyphs of word.
+
+    Returns
+    -------
+    center : float
+        Center of word.
+    """
+    top = min(glyph["rect"][1] for glyph in word)
+    bottom = max(glyph["rect"][1] + glyph["rect"][3] for glyph in word)
+    return (top + bottom) / 2
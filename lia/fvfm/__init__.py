@@ -1,3 +1,14 @@
-from .for_graph import draw_graph, input_data_for_graph, multi_graph
-from .to_dataframe import to_bgr_and_fvfm_dataframe
-from .unique_px import get_unique_px
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".for_graph": (
+            "draw_graph",
+            "input_data_for_graph",
+            "multi_graph",
+        ),
+        ".to_dataframe": ("to_bgr_and_fvfm_dataframe",),
+        ".unique_px": ("get_unique_px",),
+    },
+)
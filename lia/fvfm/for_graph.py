@@ -12,9 +12,9 @@ def input_data_for_graph(px, fvfm_value):
 
     Parameters
     ----------
-    px : [[int, int, int], ...]
-        List of BGR values per pixel.
-    fvfm_value : [int, ...]
+    px : numpy.ndarray or [[int, int, int], ...]
+        BGR values per pixel, (N, 3).
+    fvfm_value : numpy.ndarray or [int, ...]
         Fv/Fm value corresponding to each pixel.
 
     Returns
@@ -6,9 +6,9 @@ def to_bgr_and_fvfm_dataframe(px, fvfm_value):
 
     Parameters
     ----------
-    px : [[int, int, int], ...]
-        Array of color.
-    fvfm_value : [int, ...]
+    px : numpy.ndarray or [[int, int, int], ...]
+        Array of color, (N, 3).
+    fvfm_value : numpy.ndarray or [int, ...]
         Array of Fv/Fm value.
 
     Returns
@@ -1,2 +1,12 @@
-from .color import to_graph_rgb
-from .make_graph import make_2dscatter, make_3dscatter
+from lia._lazy import lazy_import
+
+__getattr__, __dir__, __all__ = lazy_import(
+    __name__,
+    {
+        ".color": ("to_graph_rgb",),
+        ".make_graph": (
+            "make_2dscatter",
+            "make_3dscatter",
+        ),
+    },
+)
@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ("cv2", "easyocr", "pandas", "plotly", "torch")
+# Time depends on machine and disk cache, so it is only reported by default.
+MAX_IMPORT_TIME = None
+REPEAT = 5
+
+_MEASURE_CODE = """
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(m for m in {heavy_modules!r} if m in sys.modules))
+"""
+
+
+def measure_import_time(module="lia", repeat=REPEAT):
+    """Measure time to import module in new interpreters.
+
+    Parameters
+    ----------
+    module : str, optional
+        Name of module.
+    repeat : int, optional
+        Number of measurement. The shortest time is used.
+
+    Returns
+    -------
+    import_time : float
+        Time to import module (seconds).
+    loaded_modules : [str, ...]
+        Heavy modules loaded by import.
+    """
+    code = _MEASURE_CODE.format(module=module, heavy_modules=HEAVY_MODULES)
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+        import_time, loaded = result.stdout.split("\n")[:2]
+        times.append(float(import_time))
+    loaded_modules = loaded.split(",") if loaded else []
+    return min(times), loaded_modules
+
+
+def check_import_time(
+    module="lia", max_time=MAX_IMPORT_TIME, allowed_modules=(), repeat=REPEAT
+):
+    """Check that module is imported without heavy modules.
+
+    Parameters
+    ----------
+    module : str, optional
+        Name of module.
+    max_time : float, optional
+        Max time to import module (seconds). If None, time is not checked.
+    allowed_modules : [str, ...], optional
+        Heavy modules allowed to be loaded.
+    repeat : int, optional
+        Number of measurement.
+
+    Returns
+    -------
+    import_time : float
+        Time to import module (seconds).
+
+    Raises
+    ------
+    RuntimeError
+        If import loads heavy modules or is slower than max_time.
+    """
+    import_time, loaded_modules = measure_import_time(module, repeat)
+    loaded_modules = [m for m in loaded_modules if m not in allowed_modules]
+    if len(loaded_modules) > 0:
+        raise RuntimeError(f"'import {module}' loads {', '.join(loaded_modules)}.")
+    if (max_time is not None) and (import_time > max_time):
+        raise RuntimeError(
+            f"'import {module}' takes {import_time:.3f} s (max {max_time} s)."
+        )
+    return import_time
+
+
+if __name__ == "__main__":
+    # python -m lia.importtime [module ...]
+    for module in sys.argv[1:] or ["lia"]:
+        import_time = check_import_time(module)
+        print(f"{module}: {import_time * 1000:.1f} ms")
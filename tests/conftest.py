@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def leaf_pair():
+    """Binary images of two leaves of different size and position."""
+    std_img = np.zeros((120, 200), dtype=np.uint8)
+    var_img = np.zeros((120, 200), dtype=np.uint8)
+    cv2.ellipse(std_img, (90, 60), (70, 40), 10, 0, 360, 255, -1)
+    cv2.ellipse(var_img, (115, 62), (62, 42), -5, 0, 360, 255, -1)
+    return std_img, var_img
+
+
+def _draw_leaf(shape, center, axes, angle):
+    img = np.full(shape + (3,), 255, dtype=np.uint8)
+    mask = np.zeros(shape, dtype=np.uint8)
+    cv2.ellipse(mask, center, axes, angle, 0, 360, 255, -1)
+    img[mask > 0] = (40, 160, 60)
+    cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+    return img, max(cnts, key=cv2.contourArea)
+
+
+@pytest.fixture
+def leaf_images():
+    """Color images of two leaves of different size and angle, and contours."""
+    std_img, std_cnt = _draw_leaf((300, 400), (200, 150), (110, 55), 25)
+    var_img, var_cnt = _draw_leaf((310, 390), (190, 160), (100, 52), -15)
+    return std_img, var_img, std_cnt, var_cnt
+
+
+@pytest.fixture
+def make_fvfm_img():
+    """Function to draw leaf and Fv/Fm scale bar labeled with values."""
+
+    def make_fvfm_img(values, height=600, width=800, bar_x=700, bar_width=20):
+        img = np.full((height, width, 3), 255, dtype=np.uint8)
+        cv2.circle(img, (300, height // 2), 150, (40, 160, 60), -1)
+        for y in range(20, height - 20):
+            v = int(255 * (y - 20) / (height - 40))
+            img[y, bar_x : bar_x + bar_width] = (v, 255 - v, 128)
+        fvfm_value_list = []
+        for i, value in enumerate(values):
+            y = int(20 + (height - 40) * i / (len(values) - 1))
+            cv2.putText(
+                img,
+                f"{value:.2f}",
+                (bar_x + bar_width + 5, y + 5),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                (0, 0, 0),
+                1,
+                cv2.LINE_AA,
+            )
+            fvfm_value_list.append([float(y), value])
+        return img, fvfm_value_list
+
+    return make_fvfm_img
+
+
+class _LabelReader:
+    """Reader giving values to dark labels from top, in easyocr format."""
+
+    def __init__(self, values):
+        self.values = values
+
+    def readtext(self, img):
+        dark = img.max(axis=2) < 100
+        rows = np.flatnonzero(dark.any(axis=1))
+        text = []
+        if len(rows) == 0:
+            return text
+        label_rows = np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1)
+        for label_row, value in zip(label_rows, self.values):
+            cols = np.flatnonzero(dark[label_row].any(axis=0))
+            top, bottom = int(label_row[0]), int(label_row[-1]) + 1
+            left, right = int(cols[0]), int(cols[-1]) + 1
+            box = [[left, top], [right, top], [right, bottom], [left, bottom]]
+            text.append((box, f"{value:.2f}", 1.0))
+        return text
+
+
+@pytest.fixture
+def label_reader():
+    """Function to make reader of labels drawn by make_fvfm_img with values."""
+    return _LabelReader
+
+
+@pytest.fixture
+def template_reader(make_fvfm_img):
+    """Reader by templates learned from labels drawn by make_fvfm_img."""
+    from lia.detect.template_ocr import TemplateReader
+
+    values = [0.90, 0.81, 0.72, 0.63, 0.54, 0.45, 0.36, 0.27, 0.18, 0.09]
+    img, fvfm_value_list = make_fvfm_img(values)
+    reader = TemplateReader(text_thresh=140, text_sat_thresh=50)
+    reader.fit(img[:, 600:], fvfm_value_list)
+    return reader
@@ -0,0 +1,95 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from lia.core.base import ImageCore
+from lia.core.cache import ImageCache
+
+SHAPE = (20, 30, 3)
+NBYTES = 20 * 30 * 3
+
+
+@pytest.fixture
+def img_paths(tmp_path):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"img{i}.png")
+        cv2.imwrite(path, rng.integers(0, 256, SHAPE, dtype=np.uint8))
+        paths.append(path)
+    return paths
+
+
+def test_disabled_cache(img_paths):
+    cache = ImageCache()
+    img = cache.read(img_paths[0])
+    np.testing.assert_array_equal(img, cv2.imread(img_paths[0]))
+    assert img.flags.writeable
+    assert len(cache) == 0
+    assert cache.info()["misses"] == 0
+
+
+def test_hits_and_misses(img_paths):
+    cache = ImageCache(NBYTES * 3)
+    img = cache.read(img_paths[0])
+    np.testing.assert_array_equal(img, cv2.imread(img_paths[0]))
+    assert not img.flags.writeable
+    assert cache.read(img_paths[0]) is img
+    gray_img = cache.read(img_paths[0], cv2.IMREAD_GRAYSCALE)
+    np.testing.assert_array_equal(
+        gray_img, cv2.imread(img_paths[0], cv2.IMREAD_GRAYSCALE)
+    )
+    assert cache.info() == {
+        "hits": 1,
+        "misses": 2,
+        "images": 2,
+        "nbytes": NBYTES + NBYTES // 3,
+        "max_bytes": NBYTES * 3,
+    }
+    cache.clear()
+    assert cache.info()["images"] == cache.info()["hits"] == cache.nbytes == 0
+
+
+def test_least_recently_used_is_evicted(img_paths):
+    cache = ImageCache(NBYTES * 2)
+    first_img = cache.read(img_paths[0])
+    cache.read(img_paths[1])
+    assert cache.read(img_paths[0]) is first_img
+    cache.read(img_paths[2])
+    assert len(cache) == 2
+    assert cache.nbytes == NBYTES * 2
+    assert cache.read(img_paths[0]) is first_img
+    assert cache.info()["misses"] == 3
+    cache.read(img_paths[1])
+    assert cache.info()["misses"] == 4
+    cache.max_bytes = NBYTES
+    assert len(cache) == 1
+    assert cache.nbytes == NBYTES
+    # Image larger than cache is not cached.
+    cache.max_bytes = NBYTES - 1
+    assert len(cache) == 0
+    cache.read(img_paths[0])
+    assert len(cache) == 0
+
+
+def test_modified_file_is_read_again(img_paths):
+    cache = ImageCache(NBYTES * 3)
+    old_img = cache.read(img_paths[0])
+    new_img = np.zeros(SHAPE, dtype=np.uint8)
+    cv2.imwrite(img_paths[0], new_img)
+    stat = os.stat(img_paths[0])
+    os.utime(img_paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    img = cache.read(img_paths[0])
+    assert img is not old_img
+    np.testing.assert_array_equal(img, new_img)
+    assert len(cache) == 1
+    assert cache.nbytes == NBYTES
+
+
+def test_input_img_shares_cache(monkeypatch, img_paths):
+    monkeypatch.setattr(ImageCore, "image_cache", ImageCache(NBYTES * 3))
+    img = ImageCore().input_img(img_paths[0])
+    assert ImageCore().input_img(img_paths[0]) is img
+    assert ImageCore.image_cache.info()["hits"] == 1
@@ -0,0 +1,114 @@
+import json
+
+import numpy as np
+import pytest
+
+from lia.core.extract import ExtractFvFm
+from lia.detect.calib_fvfm import FvFmCalibCache
+from lia.detect.detect_fvfm import get_fvfm_list
+
+READ_VALUES = [0.85, 0.80, 0.75, 0.70, 0.65, 0.60, 0.55, 0.50]
+
+
+def _make_entry(value):
+    img = np.full((20, 30, 3), value, dtype=np.uint8)
+    calib = {"shape": [20, 30], "ocr_area": [0, 0, 10, 10], "value": value}
+    return img, calib
+
+
+def _no_ocr():
+    raise AssertionError("OCR should be skipped.")
+
+
+def test_cache_skips_ocr(make_fvfm_img, label_reader):
+    img, _ = make_fvfm_img(READ_VALUES, bar_x=690)
+    reader = label_reader(READ_VALUES)
+    expected = get_fvfm_list(img, reader=reader)
+    cache = FvFmCalibCache()
+    assert get_fvfm_list(img, reader=reader, cache=cache) == expected
+    assert len(cache) == 1
+    assert get_fvfm_list(img.copy(), reader=_no_ocr, cache=cache) == expected
+    # Other scale bar is not found in cache.
+    other_img, _ = make_fvfm_img(READ_VALUES[1:], bar_x=690)
+    with pytest.raises(AssertionError):
+        get_fvfm_list(other_img, reader=_no_ocr, cache=cache)
+
+
+def test_lookup_matches_shape_and_pixels():
+    cache = FvFmCalibCache()
+    img, calib = _make_entry(10)
+    cache.add(img, calib)
+    assert cache.lookup(img)["value"] == 10
+    changed_img = img.copy()
+    changed_img[9, 9] = 0
+    assert cache.lookup(changed_img) is None
+    # Out of area is not compared.
+    changed_img = img.copy()
+    changed_img[10:] = 0
+    assert cache.lookup(changed_img)["value"] == 10
+    assert cache.lookup(np.full((21, 30, 3), 10, dtype=np.uint8)) is None
+
+
+def test_least_recently_used_is_removed():
+    cache = FvFmCalibCache(max_entries=2)
+    imgs = []
+    for value in [1, 2, 3]:
+        img, calib = _make_entry(value)
+        if value == 3:
+            # 1 is used after 2.
+            assert cache.lookup(imgs[0]) is not None
+        cache.add(img, calib)
+        imgs.append(img)
+    assert len(cache) == 2
+    assert [calib["value"] for calib in cache.entries] == [1, 3]
+    assert cache.lookup(imgs[1]) is None
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "calib.json")
+    cache = FvFmCalibCache(path)
+    for value in [1, 2, 3]:
+        cache.add(*_make_entry(value))
+    cache.save()
+    loaded = FvFmCalibCache(path)
+    assert loaded.entries == cache.entries
+    assert loaded.lookup(_make_entry(2)[0])["value"] == 2
+    truncated = FvFmCalibCache(path, max_entries=2)
+    assert [calib["value"] for calib in truncated.entries] == [2, 3]
+    with pytest.raises(ValueError):
+        FvFmCalibCache().save()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [],
+        {"entries": []},
+        {"version": 0, "entries": []},
+        {"version": 1, "entries": [{"shape": [20, 30], "ocr_area": [0, 0, 10]}]},
+        {"version": 1, "entries": [{"ocr_area": [0, 0, 10, 10], "fingerprint": ""}]},
+    ],
+)
+def test_load_invalid_file(tmp_path, data):
+    path = str(tmp_path / "calib.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    with pytest.raises(ValueError):
+        FvFmCalibCache(path)
+
+
+def test_extract_uses_cache(tmp_path, make_fvfm_img, label_reader):
+    img, _ = make_fvfm_img(READ_VALUES, bar_x=690)
+    reader = label_reader(READ_VALUES)
+    extract = ExtractFvFm()
+    extract.warm_up = lambda: reader
+    expected = extract.get_list(img)
+    assert expected == get_fvfm_list(img, reader=reader)
+    extract.warm_up = _no_ocr
+    assert extract.get_list(img) == expected
+    calib_path = str(tmp_path / "calib.json")
+    extract.save_calib(calib_path)
+    other_extract = ExtractFvFm()
+    other_extract.load_calib(calib_path)
+    other_extract.warm_up = _no_ocr
+    assert other_extract.get_list(img) == expected
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from lia.color.grid import build_color_grid, query_color_grid, search_color_grid
+from lia.color.search import search_closest_color
+from lia.core.pickcell import Pickcell
+
+
+@pytest.fixture(scope="module")
+def palette():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (80, 3))
+
+
+@pytest.fixture(scope="module")
+def queries():
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 256, (5000, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("bits", [1, 3, 4, 5])
+def test_color_grid_equals_search_closest_color(palette, queries, bits):
+    grid = build_color_grid(palette, bits)
+    idx, dist = query_color_grid(queries, grid, palette)
+    expected_color = np.array(search_closest_color(queries, palette))
+    np.testing.assert_array_equal(palette[idx], expected_color)
+    expected_dist = np.abs(expected_color - queries.astype(np.int64)).sum(axis=1)
+    np.testing.assert_array_equal(dist, expected_dist)
+
+
+def test_color_grid_keeps_first_of_ties():
+    palette = np.array([[10, 10, 10], [30, 10, 10], [10, 10, 10]])
+    grid = build_color_grid(palette)
+    idx, _ = query_color_grid(np.array([[20, 10, 10], [10, 10, 10]]), grid, palette)
+    np.testing.assert_array_equal(idx, [0, 0])
+
+
+def test_color_grid_rejects_far_color(palette, queries):
+    grid = build_color_grid(palette)
+    idx, dist = query_color_grid(queries, grid, palette, max_distance=40)
+    assert np.all(idx[dist > 40] == -1)
+    assert np.all(idx[dist <= 40] >= 0)
+    values = np.arange(len(palette))
+    keep, color, value = search_color_grid(queries, grid, palette, values, 40)
+    np.testing.assert_array_equal(keep, idx >= 0)
+    expected_color = np.array(search_closest_color(queries[keep], palette))
+    np.testing.assert_array_equal(color, expected_color)
+    np.testing.assert_array_equal(value, idx[keep])
+
+
+@pytest.mark.parametrize("use_table", [False, True])
+def test_pick_fvfm_rejects_far_color(use_table):
+    color_list = [[0, 0, 255], [0, 255, 0], [255, 0, 0]]
+    value_list = [0.8, 0.5, 0.2]
+    leaf_img = np.full((4, 5, 3), 100, dtype=np.uint8)
+    fvfm_img = np.array((color_list * 7)[:20], dtype=np.uint8).reshape(4, 5, 3)
+    # Off-scale colors, e.g. glare and edge of leaf.
+    fvfm_img[1, 2] = (255, 255, 255)
+    fvfm_img[2, 4] = (40, 40, 40)
+    # Near enough to scale color.
+    fvfm_img[3, 0] = (2, 3, 250)
+    pickcell = Pickcell()
+    pickcell.num_cpu = 2
+    pickcell.max_color_distance = 10
+    pickcell.fvfm_color_list = color_list
+    pickcell.fvfm_value_list = value_list
+    if use_table:
+        pickcell.compile_color_table(8)
+    leaf_color, fvfm_color, fvfm_value = pickcell.pick_fvfm(leaf_img, fvfm_img)
+    assert (pickcell.color_grid is None) == use_table
+    keep = np.ones(20, dtype=bool)
+    keep[[1 * 5 + 2, 2 * 5 + 4]] = False
+    expected_color = fvfm_img.reshape(-1, 3)[keep]
+    np.testing.assert_array_equal(fvfm_color, expected_color)
+    np.testing.assert_array_equal(leaf_color, leaf_img.reshape(-1, 3)[keep])
+    _, expected_value = search_closest_color(expected_color, color_list, value_list)
+    np.testing.assert_array_equal(fvfm_value, expected_value)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from lia.color.search import search_closest_color
+from lia.color.table import (
+    build_color_table,
+    get_color_table_index,
+    load_color_table,
+    save_color_table,
+    search_color_table,
+)
+from lia.core.pickcell import Pickcell
+
+
+@pytest.fixture(scope="module")
+def palette():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (60, 3))
+
+
+@pytest.fixture(scope="module")
+def queries():
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 256, (3000, 3), dtype=np.uint8)
+
+
+def test_color_table_equals_search_closest_color(palette, queries):
+    table = build_color_table(palette, 8)
+    values = np.linspace(0, 1, len(palette))
+    color, value = search_color_table(queries, table, palette, values)
+    expected_color, expected_value = search_closest_color(queries, palette, values)
+    np.testing.assert_array_equal(color, np.array(expected_color))
+    np.testing.assert_array_equal(value, np.array(expected_value))
+
+
+@pytest.mark.parametrize("bits", [4, 6])
+def test_reduced_color_table_is_closest_to_step_center(palette, queries, bits):
+    table = build_color_table(palette, bits)
+    shift = 8 - bits
+    centers = ((queries.astype(np.int64) >> shift) << shift) + ((1 << shift) >> 1)
+    idx = get_color_table_index(queries, table)
+    expected_color = search_closest_color(centers, palette)
+    np.testing.assert_array_equal(palette[idx], np.array(expected_color))
+
+
+def test_color_table_accepts_image(palette):
+    table = build_color_table(palette)
+    img = np.random.default_rng(2).integers(0, 256, (8, 9, 3), dtype=np.uint8)
+    idx = get_color_table_index(img, table)
+    assert idx.shape == (8, 9)
+    np.testing.assert_array_equal(
+        idx.reshape(-1), get_color_table_index(img.reshape(-1, 3), table)
+    )
+
+
+def test_save_and_load_color_table(tmp_path, palette):
+    table = build_color_table(palette, 5)
+    path = str(tmp_path / "table.npz")
+    save_color_table(path, table, palette.tolist(), [0.1] * len(palette))
+    loaded_table, color_list, value_list = load_color_table(path)
+    np.testing.assert_array_equal(loaded_table, table)
+    assert color_list == palette.tolist()
+    assert value_list == [0.1] * len(palette)
+
+
+@pytest.mark.parametrize("bits", [0, 9])
+def test_color_table_invalid_bits(palette, bits):
+    with pytest.raises(ValueError):
+        build_color_table(palette, bits)
+
+
+def test_compile_color_table_with_file(tmp_path, palette):
+    color_list = palette.tolist()
+    value_list = np.linspace(0.8, 0.1, len(palette)).tolist()
+    path = str(tmp_path / "table.npz")
+    pickcell = Pickcell()
+    pickcell.fvfm_color_list = color_list
+    pickcell.fvfm_value_list = value_list
+    table = pickcell.compile_color_table(path=path)
+    # Scale color is loaded from file if it is not set.
+    other_pickcell = Pickcell()
+    np.testing.assert_array_equal(other_pickcell.compile_color_table(path=path), table)
+    assert other_pickcell.fvfm_color_list == color_list
+    assert other_pickcell.fvfm_value_list == value_list
+    # Table of other scale color is rebuilt instead of overwriting scale color.
+    new_color_list = color_list[::-1]
+    pickcell.fvfm_color_list = new_color_list
+    new_table = pickcell.compile_color_table(path=path)
+    assert pickcell.fvfm_color_list == new_color_list
+    np.testing.assert_array_equal(new_table, build_color_table(new_color_list))
+    assert load_color_table(path)[1] == new_color_list
+    # Table of other bit depth is rebuilt.
+    assert pickcell.compile_color_table(4, path).shape == (16, 16, 16)
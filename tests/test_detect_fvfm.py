@@ -0,0 +1,140 @@
+import sys
+import types
+
+import pytest
+
+from lia.detect import detect_fvfm
+from lia.detect.detect_fvfm import (
+    calibrate_fvfm,
+    clear_ocr_reader,
+    get_bar_area,
+    get_ocr_area,
+    get_ocr_reader,
+    read_bar_value,
+    read_fvfm_value,
+)
+
+TEXT = [
+    ([[0, 40], [30, 40], [30, 50], [0, 50]], "0,80", 0.9),
+    ([[0, 10], [30, 10], [30, 20], [0, 20]], "0.85", 0.9),
+    ([[0, 70], [30, 70], [30, 80], [0, 80]], "Fv/Fm", 0.9),
+]
+
+
+class FakeReader:
+    """Reader returning fixed text, counting images read."""
+
+    def __init__(self, lang_list=None, gpu=False, verbose=True):
+        self.lang_list = lang_list
+        self.imgs = []
+
+    def readtext(self, img):
+        self.imgs.append(img)
+        return TEXT
+
+
+@pytest.fixture
+def fake_easyocr(monkeypatch):
+    easyocr = types.ModuleType("easyocr")
+    easyocr.Reader = FakeReader
+    monkeypatch.setitem(sys.modules, "easyocr", easyocr)
+    clear_ocr_reader()
+    yield easyocr
+    clear_ocr_reader()
+
+
+def test_ocr_reader_is_shared(fake_easyocr):
+    reader = get_ocr_reader()
+    assert isinstance(reader, FakeReader)
+    assert get_ocr_reader() is reader
+    assert get_ocr_reader("en,ja") is not reader
+    assert get_ocr_reader("en,ja").lang_list == ["en", "ja"]
+    clear_ocr_reader()
+    assert get_ocr_reader() is not reader
+
+
+def test_read_fvfm_value_with_shared_reader(fake_easyocr):
+    assert read_fvfm_value(None) == [[15.0, 0.85], [45.0, 0.8]]
+    assert len(get_ocr_reader().imgs) == 1
+
+
+def test_reader_factory_is_called():
+    reader = FakeReader()
+    assert read_fvfm_value(None, lambda: reader) == [[15.0, 0.85], [45.0, 0.8]]
+    assert len(reader.imgs) == 1
+
+
+def test_less_than_two_values():
+    reader = FakeReader()
+    reader.readtext = lambda img: TEXT[:1]
+    with pytest.raises(ValueError):
+        read_fvfm_value(None, reader)
+
+
+class RecordingReader:
+    """Reader recording shape of images read."""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.shapes = []
+
+    def readtext(self, img):
+        self.shapes.append(img.shape)
+        return self.reader.readtext(img)
+
+
+READ_VALUES = [0.85, 0.80, 0.75, 0.70, 0.65, 0.60, 0.55, 0.50]
+
+
+def test_ocr_area():
+    assert get_ocr_area((600, 800), [700, 20, 20, 560], 3) == [640, 0, 780, 600]
+    assert get_ocr_area((600, 800), [300, 100, 10, 300], 0.5) == [295, 95, 315, 405]
+
+
+def test_read_bar_value_in_ocr_area(make_fvfm_img, label_reader):
+    img, _ = make_fvfm_img(READ_VALUES, bar_x=690)
+    bar_area = get_bar_area(img)
+    reader = RecordingReader(label_reader(READ_VALUES))
+    fvfm_value_list, ocr_area = read_bar_value(img, bar_area, reader=reader)
+    left, top, right, bottom = ocr_area
+    assert reader.shapes == [(bottom - top, right - left, 3)]
+    assert right - left < 800
+    # Positions are in whole image.
+    assert fvfm_value_list == read_fvfm_value(img, reader.reader)
+
+
+def test_read_bar_value_falls_back_to_whole_image(make_fvfm_img, label_reader):
+    img, _ = make_fvfm_img(READ_VALUES, bar_x=690)
+    reader = RecordingReader(label_reader(READ_VALUES))
+    fvfm_value_list, ocr_area = read_bar_value(img, get_bar_area(img), 0.2, reader)
+    assert ocr_area == [0, 0, 800, 600]
+    assert reader.shapes[-1] == img.shape
+    assert fvfm_value_list == read_fvfm_value(img, reader.reader)
+
+
+def test_calibrate_in_ocr_area_equals_whole_image(make_fvfm_img, label_reader):
+    img, _ = make_fvfm_img(READ_VALUES, bar_x=690)
+    reader = label_reader(READ_VALUES)
+    calib = calibrate_fvfm(img, reader=reader)
+    whole_calib = calibrate_fvfm(img, ocr_margin=100, reader=reader)
+    assert whole_calib["ocr_area"] == [0, 0, 800, 600]
+    for key in ["value_positions", "fvfm_color_list", "fvfm_value_list"]:
+        assert calib[key] == whole_calib[key]
+    # Area read after fall back is kept, not area around bar.
+    fallback_calib = calibrate_fvfm(img, ocr_margin=0.2, reader=reader)
+    assert fallback_calib["ocr_area"] == [0, 0, 800, 600]
+
+
+def test_template_reader_is_shared(tmp_path, monkeypatch):
+    loaded = []
+    monkeypatch.setattr(
+        detect_fvfm,
+        "load_template_reader",
+        lambda path: loaded.append(path) or object(),
+    )
+    path = str(tmp_path / "templates.npz")
+    reader = detect_fvfm.get_template_reader(path)
+    assert detect_fvfm.get_template_reader(path) is reader
+    clear_ocr_reader(path)
+    assert detect_fvfm.get_template_reader(path) is not reader
+    assert loaded == [path, path]
@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+import pytest
+
+from lia.basic.transform.reduce import reduce_img, scale_cnt
+from lia.detect.detect_leaf import extract_leaf_by_color, extract_leaf_by_thresh
+
+
+@pytest.fixture
+def leaf_img():
+    """Noisy leaf on white background and its mask."""
+    rng = np.random.default_rng(0)
+    img = np.full((600, 800, 3), 255, dtype=np.uint8)
+    mask = np.zeros((600, 800), dtype=np.uint8)
+    cv2.ellipse(mask, (400, 300), (220, 110), 25, 0, 360, 255, -1)
+    cv2.ellipse(mask, (510, 300), (73, 55), 35, 0, 360, 255, -1)
+    noise = rng.integers(0, 30, (600, 800, 3), dtype=np.uint8)
+    img[mask > 0] = (40, 160, 60) - noise[mask > 0]
+    return img, mask
+
+
+def _fill(cnt, shape):
+    mask = np.zeros(shape, dtype=np.uint8)
+    cv2.drawContours(mask, [cnt], -1, 255, -1)
+    return mask
+
+
+@pytest.mark.parametrize("reduction", [2, 4, 8])
+def test_thresh_with_reduction_equals_full_size(leaf_img, reduction):
+    img, mask = leaf_img
+    full_cnts = extract_leaf_by_thresh(img, reduction=1)
+    np.testing.assert_array_equal(_fill(full_cnts[0], mask.shape), mask)
+    cnts = extract_leaf_by_thresh(img, reduction=reduction)
+    assert len(cnts) == len(full_cnts)
+    for cnt, full_cnt in zip(cnts, full_cnts):
+        np.testing.assert_array_equal(
+            _fill(cnt, mask.shape), _fill(full_cnt, mask.shape)
+        )
+
+
+def test_thresh_on_black_background(leaf_img):
+    img, mask = leaf_img
+    img = img.copy()
+    img[mask == 0] = 10
+    for cnt in extract_leaf_by_thresh(img, reduction=4):
+        np.testing.assert_array_equal(_fill(cnt, mask.shape), mask)
+
+
+@pytest.mark.parametrize("reduction", [2, 4, 8])
+def test_color_with_reduction_equals_full_size(leaf_img, reduction):
+    img, mask = leaf_img
+    full_cnt = extract_leaf_by_color(img, reduction=1)
+    cnt = extract_leaf_by_color(img, reduction=reduction)
+    np.testing.assert_array_equal(_fill(cnt, mask.shape), _fill(full_cnt, mask.shape))
+
+
+def test_reduce_and_scale():
+    img = np.zeros((601, 803, 3), dtype=np.uint8)
+    assert reduce_img(img, 1) is img
+    assert reduce_img(img, 4).shape == (150, 200, 3)
+    cnt = np.array([[[0, 0]], [[10, 3]]], dtype=np.int32)
+    np.testing.assert_array_equal(scale_cnt(cnt, 4), [[[2, 2]], [[42, 14]]])
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lia.align.get_func import get_align_hori_param
+from lia.align.moment import get_hori_moment_param
+from lia.basic.transform.slide import slide_horizontal
+from lia.core.align import AlignLeaf
+
+
+@pytest.mark.parametrize("pyramid_level", [1, 2])
+def test_pyramid_search_finds_full_search_result(leaf_pair, pyramid_level):
+    best = get_align_hori_param(*leaf_pair, 20, 10)
+    pyramid_best = get_align_hori_param(*leaf_pair, 20, 10, pyramid_level=pyramid_level)
+    assert pyramid_best == best
+
+
+@pytest.mark.parametrize("num_cpu, pool", [(3, "thread"), (2, "process")])
+def test_parallel_search_equals_serial(leaf_pair, num_cpu, pool):
+    best = get_align_hori_param(*leaf_pair, 20, 10, pyramid_level=0)
+    parallel_best = get_align_hori_param(
+        *leaf_pair, 20, 10, pyramid_level=0, num_cpu=num_cpu, pool=pool
+    )
+    assert parallel_best == best
+
+
+def test_align_leaf_searches_serially_by_default():
+    assert AlignLeaf().num_cpu == 1
+
+
+def test_search_on_given_executor(leaf_pair):
+    best = get_align_hori_param(*leaf_pair, 20, 10)
+    with ThreadPoolExecutor(2) as executor:
+        parallel_best = get_align_hori_param(
+            *leaf_pair, 20, 10, num_cpu=2, pool=executor
+        )
+    assert parallel_best == best
+
+
+def test_moment_mode_falls_back_to_search(leaf_pair):
+    best = get_align_hori_param(*leaf_pair, 20, 10)
+    moment_best = get_align_hori_param(
+        *leaf_pair, 20, 10, mode="moment", iou_thresh=1.1
+    )
+    assert moment_best == best
+
+
+def test_moment_mode_estimates_shift(leaf_pair):
+    std_img = leaf_pair[0]
+    var_img = slide_horizontal(std_img, 12)
+    fx_scale, slide = get_hori_moment_param(std_img, var_img)
+    assert fx_scale == pytest.approx(0)
+    assert slide == -12
+    best = get_align_hori_param(std_img, var_img, 20, 10, mode="moment")
+    assert best["mode"] == "moment"
+    assert best["slide"] == -12
+    assert best["iou"] == 1.0
+    assert best["not_overlay"] == 0
+
+
+def test_invalid_mode(leaf_pair):
+    with pytest.raises(ValueError, match='"register"'):
+        get_align_hori_param(*leaf_pair, 20, 10, mode="optical")
@@ -0,0 +1,81 @@
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.pool import ThreadPool
+
+import cv2
+import numpy as np
+import pytest
+
+from lia.align.overlap import _imap_window
+from lia.core.base import ImageCore
+from lia.core.header import read_image_size
+
+
+def _make_img(height=37, width=53):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def _add_exif_orientation(jpeg, orientation, order):
+    """Insert APP1 segment with EXIF orientation after SOI marker."""
+    fmt = "<" if order == b"II" else ">"
+    tiff = order + struct.pack(fmt + "HI", 42, 8)
+    tiff += struct.pack(fmt + "H", 1)
+    tiff += struct.pack(fmt + "HHIHH", 0x0112, 3, 1, orientation, 0)
+    tiff += struct.pack(fmt + "I", 0)
+    app1 = b"Exif\x00\x00" + tiff
+    return jpeg[:2] + b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + jpeg[2:]
+
+
+@pytest.mark.parametrize("ext", [".png", ".jpg"])
+def test_header_size_equals_imread(tmp_path, ext):
+    path = str(tmp_path / f"img{ext}")
+    cv2.imwrite(path, _make_img())
+    assert read_image_size(path) == cv2.imread(path).shape[:2]
+    assert ImageCore().input_shape(tmp_path / f"img{ext}") == (37, 53)
+
+
+@pytest.mark.parametrize("orientation", [1, 3, 6, 8])
+@pytest.mark.parametrize("order", [b"II", b"MM"])
+def test_header_size_of_exif_orientation(tmp_path, orientation, order):
+    _, jpeg = cv2.imencode(".jpg", _make_img())
+    path = str(tmp_path / "img.jpg")
+    with open(path, "wb") as f:
+        f.write(_add_exif_orientation(jpeg.tobytes(), orientation, order))
+    assert read_image_size(path) == cv2.imread(path).shape[:2]
+
+
+def test_unsupported_format_falls_back_to_decoding(tmp_path):
+    path = str(tmp_path / "img.bmp")
+    cv2.imwrite(path, _make_img())
+    assert read_image_size(path) is None
+    assert ImageCore().input_shape(path) == (37, 53)
+    assert ImageCore().input_shape(_make_img()) == (37, 53)
+
+
+def test_broken_header(tmp_path):
+    path = str(tmp_path / "img.png")
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+    assert read_image_size(path) is None
+    with pytest.raises(TypeError):
+        ImageCore().input_shape(path)
+
+
+@pytest.mark.parametrize("pool_type", [ThreadPool, ThreadPoolExecutor])
+def test_imap_window_reads_tasks_lazily(pool_type):
+    read = []
+
+    def tasks():
+        for i in range(20):
+            read.append(i)
+            yield i
+
+    window = 3
+    with pool_type(2) as pool:
+        results = _imap_window(pool, abs, (-i for i in tasks()), window)
+        for i, result in enumerate(results):
+            assert result == i
+            # Tasks waiting for results and the next one at most.
+            assert len(read) <= i + window + 1
+    assert read == list(range(20))
@@ -0,0 +1,135 @@
+import gzip
+import io
+import mmap
+import pathlib
+
+import cv2
+import numpy as np
+import pytest
+
+from lia.core.base import ImageCore
+
+
+class SubArray(np.ndarray):
+    pass
+
+
+@pytest.fixture
+def img_path(tmp_path):
+    rng = np.random.default_rng(0)
+    path = str(tmp_path / "img.png")
+    cv2.imwrite(path, rng.integers(0, 256, (20, 30, 3), dtype=np.uint8))
+    return path
+
+
+@pytest.fixture
+def encoded(img_path):
+    with open(img_path, "rb") as f:
+        return f.read()
+
+
+def test_path(img_path):
+    expected = cv2.imread(img_path)
+    np.testing.assert_array_equal(ImageCore().input_img(img_path), expected)
+    np.testing.assert_array_equal(
+        ImageCore().input_img(pathlib.Path(img_path)), expected
+    )
+
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+def test_bytes_like(img_path, encoded, buffer_type):
+    img = ImageCore().input_img(buffer_type(encoded))
+    np.testing.assert_array_equal(img, cv2.imread(img_path))
+
+
+def test_mmap(img_path):
+    with open(img_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as file_map:
+            img = ImageCore().input_img(file_map)
+    np.testing.assert_array_equal(img, cv2.imread(img_path))
+
+
+def test_bytes_io(img_path, encoded):
+    file = io.BytesIO(b"head" + encoded)
+    file.seek(4)
+    img = ImageCore().input_img(file)
+    np.testing.assert_array_equal(img, cv2.imread(img_path))
+    # Buffer of BytesIO is released.
+    file.write(b"tail")
+
+
+def test_file_object(img_path, encoded, tmp_path):
+    with open(img_path, "rb") as f:
+        img = ImageCore().input_img(f)
+    np.testing.assert_array_equal(img, cv2.imread(img_path))
+    # Image from current position.
+    path = str(tmp_path / "data.bin")
+    with open(path, "wb") as f:
+        f.write(b"head" + encoded)
+    with open(path, "rb") as f:
+        f.seek(4)
+        img = ImageCore().input_img(f)
+    np.testing.assert_array_equal(img, cv2.imread(img_path))
+
+
+def test_file_object_without_fileno(img_path, encoded):
+    file = io.BufferedReader(io.BytesIO(encoded))
+    img = ImageCore().input_img(file)
+    np.testing.assert_array_equal(img, cv2.imread(img_path))
+
+
+def test_gzip_file(img_path, encoded, tmp_path):
+    path = str(tmp_path / "img.png.gz")
+    with gzip.open(path, "wb") as f:
+        f.write(encoded)
+    # fileno of GzipFile is of compressed file, so it is not mapped.
+    with gzip.open(path, "rb") as f:
+        img = ImageCore().input_img(f)
+    np.testing.assert_array_equal(img, cv2.imread(img_path))
+
+
+@pytest.mark.parametrize("file_type", ["bytes_io", "buffered", "raw", "gzip"])
+def test_position_after_decode(encoded, tmp_path, file_type):
+    path = str(tmp_path / "data.bin")
+    with open(path, "wb") as f:
+        f.write(b"head" + encoded)
+    if file_type == "bytes_io":
+        file = io.BytesIO(b"head" + encoded)
+    elif file_type == "buffered":
+        file = open(path, "rb")
+    elif file_type == "raw":
+        file = open(path, "rb", buffering=0)
+    else:
+        with gzip.open(path + ".gz", "wb") as f:
+            f.write(b"head" + encoded)
+        file = gzip.open(path + ".gz", "rb")
+    with file:
+        file.seek(4)
+        ImageCore().input_img(file)
+        assert file.tell() == len(encoded) + 4
+        assert file.read() == b""
+
+
+def test_ndarray(img_path):
+    expected = cv2.imread(img_path)
+    assert ImageCore().input_img(expected) is expected
+    img = ImageCore().input_img(expected.view(SubArray))
+    assert type(img) is np.ndarray
+    assert np.shares_memory(img, expected)
+
+
+@pytest.mark.parametrize("input", [b"", b"not image", bytearray(10)])
+def test_invalid_buffer(input):
+    with pytest.raises(TypeError):
+        ImageCore().input_img(input)
+
+
+def test_invalid_input(tmp_path):
+    with pytest.raises(TypeError):
+        ImageCore().input_img(1)
+    with pytest.raises(ValueError):
+        ImageCore().input_img(str(tmp_path / "no_such_file.png"))
+    path = tmp_path / "text.png"
+    path.write_text("not image")
+    with pytest.raises(TypeError):
+        ImageCore().input_img(path)
@@ -0,0 +1,45 @@
+import importlib
+
+import pytest
+
+from lia.importtime import check_import_time, measure_import_time
+
+PACKAGES = [
+    "lia",
+    "lia.align",
+    "lia.basic",
+    "lia.basic.evaluate",
+    "lia.basic.get",
+    "lia.basic.transform",
+    "lia.color",
+    "lia.dataframe",
+    "lia.detect",
+    "lia.fvfm",
+    "lia.graph",
+]
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_exports_are_imported(package):
+    module = importlib.import_module(package)
+    assert module.__all__ == sorted(set(module.__all__))
+    for name in module.__all__:
+        value = getattr(module, name)
+        assert vars(module)[name] is value
+        assert name in dir(module)
+    with pytest.raises(AttributeError):
+        getattr(module, "no_such_attribute")
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_import_loads_no_heavy_module(package):
+    _, loaded_modules = measure_import_time(package, repeat=1)
+    assert loaded_modules == []
+
+
+def test_check_import_time():
+    assert check_import_time(repeat=1) > 0
+    with pytest.raises(RuntimeError):
+        check_import_time("lia.core.base", repeat=1)
+    with pytest.raises(RuntimeError):
+        check_import_time(max_time=0, repeat=1)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from lia.align.score import get_slide_scores
+from lia.basic.get.area import get_overlap_area
+from lia.basic.transform.pack import PackedMask
+from lia.basic.transform.slide import slide_horizontal
+
+SLIDES = [-200, -37, -1, 0, 1, 64, 199, 200]
+
+
+def _random_mask(shape, seed):
+    rng = np.random.default_rng(seed)
+    return (rng.random(shape) > 0.6).astype(np.uint8) * 255
+
+
+@pytest.mark.parametrize("shape", [(1, 13), (63, 17), (64, 40), (70, 33)])
+def test_pack_unpack(shape):
+    img = _random_mask(shape, 0)
+    mask = PackedMask(img)
+    np.testing.assert_array_equal(mask.unpack(), img)
+    assert mask.count() == np.count_nonzero(img)
+    assert mask.count(5, 12) == np.count_nonzero(img[:, 5:12])
+
+
+@pytest.mark.parametrize("slide", SLIDES)
+def test_counts_equal_numpy(leaf_pair, slide):
+    std_img, var_img = leaf_pair
+    std_mask = PackedMask(std_img)
+    var_mask = PackedMask(var_img)
+    std_bin = std_img > 0
+    slided_bin = slide_horizontal(var_img, slide) > 0
+    and_count = np.count_nonzero(std_bin & slided_bin)
+    union = np.count_nonzero(std_bin | slided_bin)
+    assert std_mask.xor_count(var_mask, slide) == np.count_nonzero(std_bin ^ slided_bin)
+    assert std_mask.and_count(var_mask, slide) == and_count
+    assert std_mask.iou(var_mask, slide) == pytest.approx(and_count / union)
+
+
+@pytest.mark.parametrize("slide", [-50, 0, 13, 80])
+def test_counts_of_different_width(slide):
+    base_img = _random_mask((70, 90), 1)
+    over_img = _random_mask((70, 50), 2)
+    slided = np.zeros_like(base_img)
+    start, stop = max(0, slide), min(90, 50 + slide)
+    if start < stop:
+        slided[:, start:stop] = over_img[:, start - slide : stop - slide]
+    expected = np.count_nonzero((base_img > 0) ^ (slided > 0))
+    assert PackedMask(base_img).xor_count(PackedMask(over_img), slide) == expected
+
+
+def test_iou_of_empty_masks():
+    empty = PackedMask(np.zeros((10, 10), dtype=np.uint8))
+    assert empty.iou(empty) == 0.0
+
+
+def test_different_height():
+    with pytest.raises(ValueError):
+        PackedMask(np.zeros((10, 10))).xor_count(PackedMask(np.zeros((11, 10))))
+
+
+def test_overlap_area(leaf_pair):
+    std_img, var_img = leaf_pair
+    expected = get_overlap_area(std_img, var_img) // 255
+    assert get_overlap_area(PackedMask(std_img), PackedMask(var_img)) == expected
+
+
+@pytest.mark.parametrize("start, stop", [(-40, 40), (-200, 200), (5, 5)])
+def test_packed_scores_equal_loop(leaf_pair, start, stop):
+    std_img, var_img = leaf_pair
+    expected = get_slide_scores(std_img, var_img, start, stop, "loop") // 255
+    scores = get_slide_scores(std_img, var_img, start, stop, "packed")
+    np.testing.assert_array_equal(scores, expected)
+    scores = get_slide_scores(
+        PackedMask(std_img), PackedMask(var_img), start, stop, "packed"
+    )
+    np.testing.assert_array_equal(scores, expected)
@@ -0,0 +1,136 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+from lia.color.search import search_closest_color
+from lia.core.pickcell import Pickcell
+
+
+@pytest.fixture(scope="module")
+def images():
+    rng = np.random.default_rng(0)
+    leaf_img = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    fvfm_img = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    leaf_img[:10] = 0
+    fvfm_img[:, :7] = 0
+    return leaf_img, fvfm_img
+
+
+@pytest.fixture(scope="module")
+def palette():
+    rng = np.random.default_rng(1)
+    color_list = rng.integers(0, 256, (40, 3)).tolist()
+    value_list = np.linspace(0.8, 0.1, 40).tolist()
+    return color_list, value_list
+
+
+def _expected(leaf_img, fvfm_img, color_list, value_list):
+    leaf_color = leaf_img.reshape(-1, 3)
+    fvfm_color = fvfm_img.reshape(-1, 3)
+    keep = (leaf_color.sum(axis=1) > 0) & (fvfm_color.sum(axis=1) > 0)
+    _, value = search_closest_color(fvfm_color[keep], np.array(color_list), value_list)
+    return leaf_color[keep], fvfm_color[keep], np.array(value)
+
+
+@pytest.mark.parametrize("transport", ["pickle", "mmap"])
+def test_pick_fvfm_equals_search_closest_color(images, palette, transport):
+    expected = _expected(*images, *palette)
+    with Pickcell() as pickcell:
+        pickcell.num_cpu = 2
+        pickcell.transport = transport
+        leaf_color, fvfm_color = pickcell.pick_color(*images)
+        np.testing.assert_array_equal(leaf_color, expected[0])
+        np.testing.assert_array_equal(fvfm_color, expected[1])
+        result = pickcell.pick_fvfm(*images, *palette)
+        for array, expected_array in zip(result, expected):
+            np.testing.assert_array_equal(array, expected_array)
+        pickcell.compile_color_table(8)
+        np.testing.assert_array_equal(pickcell.pick_fvfm(*images)[2], expected[2])
+
+
+@pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_pick_fvfm_with_executor(images, palette, executor_type):
+    expected = _expected(*images, *palette)
+    with executor_type(2) as executor:
+        pickcell = Pickcell(executor=executor)
+        pickcell.num_cpu = 2
+        for transport in ["pickle", "mmap"]:
+            pickcell.transport = transport
+            result = pickcell.pick_fvfm(*images, *palette)
+            np.testing.assert_array_equal(result[2], expected[2])
+
+
+@pytest.mark.parametrize("use_table", [False, True])
+def test_pick_fvfm_after_palette_change(images, palette, use_table):
+    color_list, value_list = palette
+    new_color_list = color_list[::-1][:20]
+    new_value_list = value_list[:20]
+    expected = _expected(*images, new_color_list, new_value_list)
+    with Pickcell() as pickcell:
+        pickcell.num_cpu = 2
+        pickcell.pick_fvfm(*images, color_list, value_list)
+        if use_table:
+            pickcell.compile_color_table(8)
+        pickcell.fvfm_color_list = new_color_list
+        np.testing.assert_array_equal(pickcell.pick_fvfm(*images)[2], expected[2])
+
+
+def test_pool_func_pickup(images, palette):
+    expected = _expected(*images, *palette)
+    leaf_img, fvfm_img = images
+    args = [leaf_img.reshape(-1, 3), fvfm_img.reshape(-1, 3)]
+    pickcell = Pickcell()
+    pickcell.fvfm_color_list, pickcell.fvfm_value_list = palette
+    leaf_color, fvfm_color = pickcell.pool_func_pickup_color(args)
+    np.testing.assert_array_equal(leaf_color, expected[0])
+    np.testing.assert_array_equal(fvfm_color, expected[1])
+    result = pickcell.pool_func_pickup_fvfm(args)
+    for array, expected_array in zip(result, expected):
+        np.testing.assert_array_equal(array, expected_array)
+
+
+def test_pickcells_share_thread_executor(images, palette):
+    color_list, value_list = palette
+    other_color_list = color_list[::-1][:20]
+    other_value_list = value_list[:20]
+    expected = _expected(*images, color_list, value_list)[2]
+    other_expected = _expected(*images, other_color_list, other_value_list)[2]
+    with ThreadPoolExecutor(4) as executor:
+
+        def pick(color_list, value_list):
+            pickcell = Pickcell(executor=executor)
+            pickcell.num_cpu = 4
+            return [
+                pickcell.pick_fvfm(*images, color_list, value_list)[2] for _ in range(5)
+            ]
+
+        with ThreadPoolExecutor(2) as callers:
+            future = callers.submit(pick, color_list, value_list)
+            other_future = callers.submit(pick, other_color_list, other_value_list)
+            results = future.result()
+            other_results = other_future.result()
+    for result in results:
+        np.testing.assert_array_equal(result, expected)
+    for result in other_results:
+        np.testing.assert_array_equal(result, other_expected)
+
+
+@pytest.mark.parametrize("transport", ["pickle", "mmap"])
+def test_pick_color_in_mask(images, transport):
+    leaf_img, fvfm_img = images
+    cnt = np.array([[[10, 15]], [[60, 12]], [[70, 50]], [[20, 45]]], dtype=np.int32)
+    mask = np.zeros(leaf_img.shape[:2], dtype=np.uint8)
+    cv2.drawContours(mask, [cnt], 0, 255, -1)
+    keep = (mask.reshape(-1) > 0) & (fvfm_img.reshape(-1, 3).sum(axis=1) > 0)
+    with Pickcell() as pickcell:
+        pickcell.num_cpu = 2
+        pickcell.transport = transport
+        for region in [cnt, mask]:
+            leaf_color, fvfm_color = pickcell.pick_color(*images, mask=region)
+            np.testing.assert_array_equal(leaf_color, leaf_img.reshape(-1, 3)[keep])
+            np.testing.assert_array_equal(fvfm_color, fvfm_img.reshape(-1, 3)[keep])
+        empty = np.zeros(leaf_img.shape[:2], dtype=np.uint8)
+        leaf_color, _ = pickcell.pick_color(*images, mask=empty)
+        assert leaf_color.shape == (0, 3)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from lia.color.pickup import pickup_over_thresh
+
+
+def _pickup_loop(color1, color2, thresh1, thresh2):
+    result1 = []
+    result2 = []
+    for i in range(color1.shape[0]):
+        if (color1[i].sum() > thresh1) and (color2[i].sum() > thresh2):
+            result1.append(color1[i])
+            result2.append(color2[i])
+    return np.array(result1).reshape(-1, 3), np.array(result2).reshape(-1, 3)
+
+
+@pytest.mark.parametrize("thresh1, thresh2", [(0, 0), (100, 300), (765, 0)])
+def test_pickup_over_thresh_equals_loop(thresh1, thresh2):
+    rng = np.random.default_rng(0)
+    color1 = rng.integers(0, 256, (2000, 3), dtype=np.uint8)
+    color2 = rng.integers(0, 256, (2000, 3), dtype=np.uint8)
+    color1[::7] = 0
+    color2[::5] = 0
+    result1, result2 = pickup_over_thresh(color1, color2, thresh1, thresh2)
+    expected1, expected2 = _pickup_loop(color1, color2, thresh1, thresh2)
+    np.testing.assert_array_equal(result1, expected1)
+    np.testing.assert_array_equal(result2, expected2)
+    assert result1.dtype == np.uint8
+
+
+def test_pickup_over_thresh_mask_replaces_thresh1():
+    color1 = np.zeros((4, 3), dtype=np.uint8)
+    color2 = np.full((4, 3), 10, dtype=np.uint8)
+    color2[3] = 0
+    mask = np.array([True, False, True, True])
+    result1, result2 = pickup_over_thresh(color1, color2, 0, 0, mask)
+    assert len(result1) == 2
+    assert len(result2) == 2
+
+
+def test_pickup_over_thresh_different_size():
+    with pytest.raises(ValueError):
+        pickup_over_thresh(np.zeros((3, 3)), np.zeros((4, 3)))
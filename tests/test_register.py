@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+import pytest
+
+from lia.align.get_func import get_align_hori_param
+from lia.align.overlap import get_align_transform
+from lia.align.register import get_register_matrix
+from lia.align.transform import load_align_transform, save_align_transform
+
+
+def test_register_translation(leaf_pair):
+    std_img = leaf_pair[0]
+    var_img = cv2.warpAffine(std_img, np.float32([[1, 0, 9], [0, 1, -6]]), (200, 120))
+    trans = get_register_matrix(std_img, var_img)
+    np.testing.assert_allclose(trans[:, :2], np.eye(2), atol=0.01)
+    np.testing.assert_allclose(trans[:, 2], (-9, 6), atol=0.5)
+
+
+def test_register_rotation(leaf_pair):
+    std_img = leaf_pair[0]
+    rotation = cv2.getRotationMatrix2D((100, 60), 5, 1)
+    var_img = cv2.warpAffine(std_img, rotation, (200, 120))
+    trans = get_register_matrix(std_img, var_img)
+    angle = np.degrees(np.arctan2(trans[1][0], trans[0][0]))
+    assert angle == pytest.approx(5, abs=0.5)
+
+
+def test_register_mode(leaf_pair):
+    best = get_align_hori_param(*leaf_pair, 20, 10, mode="register")
+    assert best["mode"] == "register"
+    assert np.array(best["refine"]).shape == (2, 3)
+    std_img, var_img = leaf_pair
+    register_img = cv2.warpAffine(var_img, np.array(best["refine"]), (200, 120))
+    and_count = np.count_nonzero((std_img > 127) & (register_img > 127))
+    or_count = np.count_nonzero((std_img > 127) | (register_img > 127))
+    assert best["iou"] == pytest.approx(and_count / or_count)
+
+
+@pytest.mark.parametrize("ext", ["json", "npz"])
+def test_refine_round_trip(tmp_path, leaf_images, ext):
+    var_img = leaf_images[1]
+    transform = get_align_transform(*leaf_images, mode="register")
+    assert transform.refine is not None
+    path = str(tmp_path / f"transform.{ext}")
+    save_align_transform(path, transform)
+    loaded = load_align_transform(path)
+    assert loaded == transform
+    for warp in ["fused", "chain"]:
+        np.testing.assert_array_equal(
+            loaded.apply(var_img, warp=warp), transform.apply(var_img, warp=warp)
+        )
+
+
+@pytest.mark.parametrize("interpolation", [cv2.INTER_LINEAR, cv2.INTER_NEAREST])
+def test_fused_warp_with_refine_close_to_chain(leaf_images, interpolation):
+    var_img = leaf_images[1]
+    transform = get_align_transform(*leaf_images, mode="register")
+    fused_img = transform.apply(var_img, interpolation, "fused")
+    chain_img = transform.apply(var_img, interpolation, "chain")
+    assert fused_img.shape == chain_img.shape
+    assert np.abs(fused_img.astype(int) - chain_img).mean() < 2
+    fused_mask = cv2.inRange(fused_img, (0, 100, 0), (100, 255, 100)) > 0
+    chain_mask = cv2.inRange(chain_img, (0, 100, 0), (100, 255, 100)) > 0
+    iou = np.count_nonzero(fused_mask & chain_mask) / np.count_nonzero(
+        fused_mask | chain_mask
+    )
+    assert iou > 0.98
+    if interpolation == cv2.INTER_NEAREST:
+        # Outside of crop moved by registration is black in both.
+        fused_black = (fused_img == 0).all(axis=2)
+        chain_black = (chain_img == 0).all(axis=2)
+        assert np.count_nonzero(chain_black) > 0
+        np.testing.assert_array_equal(fused_black, chain_black)
@@ -0,0 +1,22 @@
+import cv2
+import numpy as np
+import pytest
+
+from lia.basic.transform.rotation import get_rotated_roi, rotate, rotate_cnt_mask
+
+
+@pytest.mark.parametrize("angle", [0, 17.5, -42, 90, 133])
+def test_cnt_mask_equals_rotated_mask(leaf_images, angle):
+    var_img, var_cnt = leaf_images[1], leaf_images[3]
+    shape = var_img.shape[:2]
+    bin_img = np.zeros(shape, dtype=np.uint8)
+    cv2.drawContours(bin_img, [var_cnt], 0, 255, -1)
+    center = (190, 160)
+    roi = get_rotated_roi(shape, angle, center, var_cnt)
+    expected = rotate(bin_img, angle, center, roi=roi)
+    rotated_img = rotate_cnt_mask(shape, angle, center, var_cnt, roi)
+    assert rotated_img.shape == expected.shape
+    # Only rounding of interpolation on edge of object differs.
+    diff = np.abs(rotated_img.astype(int) - expected.astype(int))
+    assert diff.max() <= 1
+    np.testing.assert_array_equal(rotated_img > 127, expected > 127)
@@ -0,0 +1,38 @@
+import cv2
+import numpy as np
+import pytest
+
+from lia.align.score import get_slide_scores
+from lia.basic.transform.slide import slide_horizontal
+
+
+def _get_scores(base_img, over_img, start, stop):
+    scores = []
+    for slide_distance in range(start, stop):
+        slided_img = slide_horizontal(over_img, slide_distance)
+        scores.append(np.sum(cv2.bitwise_xor(base_img, slided_img), dtype=np.uint64))
+    return np.array(scores, dtype=np.uint64)
+
+
+@pytest.mark.parametrize("start, stop", [(-40, 40), (0, 1), (-200, 200), (5, 5)])
+def test_fft_scores_equal_loop(leaf_pair, start, stop):
+    std_img, var_img = leaf_pair
+    expected = _get_scores(std_img, var_img, start, stop)
+    for engine in ["loop", "fft"]:
+        scores = get_slide_scores(std_img, var_img, start, stop, engine)
+        np.testing.assert_array_equal(scores, expected)
+
+
+def test_fft_scores_equal_loop_for_gray_image():
+    rng = np.random.default_rng(0)
+    std_img = rng.integers(0, 256, (40, 70), dtype=np.uint8)
+    var_img = rng.integers(0, 256, (40, 70), dtype=np.uint8)
+    expected = _get_scores(std_img, var_img, -30, 30)
+    scores = get_slide_scores(std_img, var_img, -30, 30, "fft")
+    np.testing.assert_array_equal(scores, expected)
+
+
+def test_invalid_engine(leaf_pair):
+    std_img, var_img = leaf_pair
+    with pytest.raises(ValueError):
+        get_slide_scores(std_img, var_img, 0, 10, "gpu")
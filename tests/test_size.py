@@ -0,0 +1,37 @@
+import cv2
+import numpy as np
+import pytest
+
+from lia.basic.get.size import get_cnt_max_size, get_max_size
+
+
+def _get_mask_and_cnt(draw):
+    mask = np.zeros((200, 240), dtype=np.uint8)
+    draw(mask)
+    cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+    return mask, cnts
+
+
+SHAPES = [
+    lambda img: cv2.rectangle(img, (20, 30), (150, 90), 255, -1),
+    lambda img: cv2.rectangle(img, (100, 10), (100, 180), 255, -1),
+    lambda img: cv2.ellipse(img, (120, 100), (90, 41), 0, 0, 360, 255, -1),
+    lambda img: cv2.ellipse(img, (120, 100), (30, 77), 0, 0, 360, 255, -1),
+    lambda img: cv2.circle(img, (80, 90), 50, 255, -1),
+]
+
+
+@pytest.mark.parametrize("draw", SHAPES)
+def test_cnt_max_size_equals_mask_size(draw):
+    mask, cnts = _get_mask_and_cnt(draw)
+    max_size = get_cnt_max_size(cnts)
+    assert max_size == tuple(int(v) for v in get_max_size(mask))
+    assert all(type(v) is int for v in max_size)
+
+
+@pytest.mark.parametrize("draw", SHAPES)
+def test_cnt_max_size_rotated_by_right_angle(draw):
+    mask, cnts = _get_mask_and_cnt(draw)
+    max_height, max_width = get_max_size(mask)
+    assert get_cnt_max_size(cnts, 90) == (max_width, max_height)
+    assert get_cnt_max_size(cnts, -180) == (max_height, max_width)
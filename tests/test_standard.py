@@ -0,0 +1,58 @@
+import pickle
+
+import cv2
+import numpy as np
+import pytest
+
+from lia.align.get_func import get_align_hori_param
+from lia.align.overlap import iter_adjust_shape_horizontal, prepare_align_std
+from lia.align.score import get_slide_scores
+
+
+@pytest.fixture
+def std(leaf_images):
+    std_img, _, std_cnt, _ = leaf_images
+    return prepare_align_std(std_img, std_cnt)
+
+
+@pytest.mark.parametrize("engine", ["fft", "packed"])
+@pytest.mark.parametrize("pad", [0, 7, 40])
+def test_slide_scores_with_cached_standard(std, engine, pad):
+    height, width = std.bin_crop_img.shape
+    base_img = cv2.copyMakeBorder(std.bin_crop_img, 0, 0, 0, pad, cv2.BORDER_CONSTANT)
+    over_img = np.roll(base_img, 5, axis=0)
+    over_img[:, : width // 3] = 0
+    expected = get_slide_scores(base_img, over_img, -30, 30, engine)
+    # Twice for cached ones.
+    for _ in range(2):
+        scores = get_slide_scores(base_img, over_img, -30, 30, engine, std)
+        np.testing.assert_array_equal(scores, expected)
+
+
+@pytest.mark.parametrize("engine", ["loop", "fft", "packed"])
+def test_search_with_standard_equals_image(leaf_pair, std, engine):
+    var_img = cv2.resize(leaf_pair[1], std.bin_crop_img.shape[::-1])
+    best = get_align_hori_param(std.bin_crop_img, var_img, 10, 10, engine=engine)
+    std_best = get_align_hori_param(std, var_img, 10, 10, engine=engine)
+    assert std_best == best
+
+
+def test_standard_cache_is_not_pickled(std):
+    length, spectrum = std.get_spectrum(1024)
+    assert length == 1024
+    assert std.get_spectrum(512)[1] is spectrum
+    mask = std.get_packed_mask(std.bin_crop_img.shape[1] + 3)
+    assert mask.shape == (std.bin_crop_img.shape[0], std.bin_crop_img.shape[1] + 3)
+    loaded = pickle.loads(pickle.dumps(std))
+    np.testing.assert_array_equal(loaded.bin_crop_img, std.bin_crop_img)
+    assert loaded.get_spectrum(512)[0] == 512
+
+
+def test_iter_adjust_shape_length_mismatch(leaf_images):
+    std_img, var_img, std_cnt, var_cnt = leaf_images
+    results = iter_adjust_shape_horizontal(
+        std_img, [var_img, var_img], std_cnt, [var_cnt]
+    )
+    next(results)
+    with pytest.raises(ValueError):
+        next(results)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from lia.core.extract import ExtractFvFm
+from lia.detect.detect_fvfm import get_template_reader, read_fvfm_value
+from lia.detect.template_ocr import TemplateReader, load_template_reader
+
+LEARN_VALUES = [0.90, 0.81, 0.72, 0.63, 0.54, 0.45, 0.36, 0.27, 0.18, 0.09]
+READ_VALUES = [0.85, 0.80, 0.75, 0.70, 0.65, 0.60, 0.55, 0.50]
+
+
+def test_read_labels(make_fvfm_img, template_reader):
+    img, fvfm_value_list = make_fvfm_img(READ_VALUES, bar_x=690)
+    read_list = read_fvfm_value(img[:, 600:], template_reader)
+    assert [value for _, value in read_list] == READ_VALUES
+    for (pos, _), (expected_pos, _) in zip(read_list, fvfm_value_list):
+        assert pos == pytest.approx(expected_pos, abs=2)
+
+
+@pytest.mark.parametrize("name", ["templates", "templates.npz"])
+def test_save_load_round_trip(tmp_path, template_reader, name):
+    path = template_reader.save(str(tmp_path / name))
+    assert path == str(tmp_path / "templates.npz")
+    loaded = load_template_reader(path)
+    assert (loaded.text_thresh, loaded.text_sat_thresh) == (140, 50)
+    assert sorted(loaded.templates) == sorted(template_reader.templates)
+    for char, template in template_reader.templates.items():
+        np.testing.assert_array_equal(loaded.templates[char], template)
+
+
+def test_load_without_thresholds(tmp_path, template_reader):
+    path = str(tmp_path / "templates.npz")
+    np.savez(path, **template_reader.templates)
+    loaded = load_template_reader(path)
+    default = TemplateReader()
+    assert (loaded.text_thresh, loaded.text_sat_thresh) == (
+        default.text_thresh,
+        default.text_sat_thresh,
+    )
+
+
+def test_learn_template(tmp_path, make_fvfm_img):
+    img, fvfm_value_list = make_fvfm_img(LEARN_VALUES)
+    path = str(tmp_path / "templates")
+    extract = ExtractFvFm()
+    extract.learn_template(img, path, fvfm_value_list)
+    assert extract.ocr_backend == "template"
+    assert extract.ocr_template_path == path + ".npz"
+    old_reader = get_template_reader(path + ".npz")
+    extract.learn_template(img, path, fvfm_value_list[:5])
+    # Reader of old templates is released.
+    new_reader = get_template_reader(path + ".npz")
+    assert new_reader is not old_reader
+    for char, template in load_template_reader(path + ".npz").templates.items():
+        np.testing.assert_array_equal(new_reader.templates[char], template)
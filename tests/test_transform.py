@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+import pytest
+
+from lia.align.overlap import adjust_shape_horizontal, get_align_transform
+from lia.align.transform import (
+    AlignTransform,
+    load_align_transform,
+    save_align_transform,
+)
+
+
+@pytest.fixture
+def align_transform(leaf_images):
+    return get_align_transform(*leaf_images)
+
+
+def test_transform_equals_adjust_shape(leaf_images, align_transform):
+    std_img, var_img, std_cnt, var_cnt = leaf_images
+    std_align, var_align = adjust_shape_horizontal(*leaf_images)
+    np.testing.assert_array_equal(align_transform.apply_std(std_img), std_align)
+    np.testing.assert_array_equal(align_transform.apply(var_img), var_align)
+
+
+@pytest.mark.parametrize("ext", ["json", "npz", "NPZ"])
+def test_save_load_round_trip(tmp_path, leaf_images, align_transform, ext):
+    var_img = leaf_images[1]
+    path = str(tmp_path / f"transform.{ext}")
+    save_align_transform(path, align_transform)
+    loaded = load_align_transform(path)
+    assert isinstance(loaded, AlignTransform)
+    assert loaded == align_transform
+    assert loaded.to_dict() == align_transform.to_dict()
+    np.testing.assert_array_equal(loaded(var_img), align_transform(var_img))
+
+
+def test_invalid_extension(tmp_path, align_transform):
+    with pytest.raises(ValueError):
+        save_align_transform(str(tmp_path / "transform.txt"), align_transform)
+    with pytest.raises(ValueError):
+        load_align_transform(str(tmp_path / "transform.txt"))
+
+
+def _get_leaf_mask(img):
+    return cv2.inRange(img, (0, 100, 0), (100, 255, 100)) > 0
+
+
+@pytest.mark.parametrize("interpolation", [cv2.INTER_LINEAR, cv2.INTER_NEAREST])
+def test_fused_warp_equals_chain(leaf_images, align_transform, interpolation):
+    std_img, var_img = leaf_images[:2]
+    std_fused = align_transform.apply_std(std_img, interpolation, "fused")
+    std_chain = align_transform.apply_std(std_img, interpolation, "chain")
+    assert np.abs(std_fused.astype(int) - std_chain).max() <= 1
+    var_fused = align_transform.apply(var_img, interpolation, "fused")
+    var_chain = align_transform.apply(var_img, interpolation, "chain")
+    assert var_fused.shape == var_chain.shape
+    # Resampling once differs from chain only around edge of leaf.
+    assert np.abs(var_fused.astype(int) - var_chain).mean() < 2
+    fused_mask = _get_leaf_mask(var_fused)
+    chain_mask = _get_leaf_mask(var_chain)
+    iou = np.count_nonzero(fused_mask & chain_mask) / np.count_nonzero(
+        fused_mask | chain_mask
+    )
+    assert iou > 0.98
+
+
+def test_invalid_warp(leaf_images, align_transform):
+    with pytest.raises(ValueError):
+        align_transform.apply(leaf_images[1], warp="remap")
+
+
+@pytest.mark.parametrize("sizing", ["mask", "contour"])
+def test_roi_rotation_equals_frame(leaf_images, sizing):
+    frame_transform = get_align_transform(*leaf_images, rotation="frame", sizing=sizing)
+    roi_transform = get_align_transform(*leaf_images, rotation="roi", sizing=sizing)
+    assert roi_transform == frame_transform
+    frame_imgs = adjust_shape_horizontal(*leaf_images, rotation="frame")
+    roi_imgs = adjust_shape_horizontal(*leaf_images, rotation="roi")
+    for roi_img, frame_img in zip(roi_imgs, frame_imgs):
+        np.testing.assert_array_equal(roi_img, frame_img)
+
+
+def test_invalid_rotation(leaf_images):
+    with pytest.raises(ValueError):
+        get_align_transform(*leaf_images, rotation="full")
+
+
+def test_default_warp_is_chain(leaf_images, align_transform):
+    var_img = leaf_images[1]
+    np.testing.assert_array_equal(
+        align_transform.apply(var_img), align_transform.apply(var_img, warp="chain")
+    )
+
+
+def test_default_rotation_is_frame(leaf_images, align_transform):
+    frame_transform = get_align_transform(*leaf_images, rotation="frame")
+    assert align_transform == frame_transform